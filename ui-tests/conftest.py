@@ -4,75 +4,370 @@ This file contains fixtures and hooks for the test suite.
 """
 
 import os
+import shutil
+import tempfile
+import warnings
 import pytest
-from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from dotenv import load_dotenv
+from pages.base_page import BasePage
+from pages.login_page import LoginPage
+from pages.pos_page import POSPage
+from pages.sales_history_page import SalesHistoryPage
+from utils.browser import BrowserSession, create_browser
+from utils.browser_pool import BrowserPoolError, create_pooled_browser
+from utils.matrix import BrowserMatrix, parse_browsers, without_browser_id
+from utils.mock_server import NardPOSServer
+from utils.parallel import (
+    DurationScheduling, artifact_path, is_xdist_worker, load_durations,
+    save_durations, worker_id, worker_index,
+)
+from utils.profiler import CommandProfiler, CommandSummary, check_budget
+from utils.results_store import ResultsStore, RunCollector, format_regressions
+from utils.scale import generate_products, generate_sales
+from utils.screenshots import ScreenshotWriter, take_png
+from utils.ui_metrics import UIMetrics, summary_table_html, supports_cdp
+from utils.visual import VisualComparator, mask_regions
+from utils import tracing
 
 # Load environment variables
 load_dotenv()
 
 # Configuration
-BASE_URL = os.getenv('BASE_URL', 'file:///home/hesham/Documents/GitHub/qa-automation/mock-ui/index.html')
+# App and API URLs; when unset, both are served by the in-process mock server
+BASE_URL = os.getenv('BASE_URL')
+API_BASE_URL = os.getenv('API_BASE_URL')
 BROWSER = os.getenv('BROWSER', 'chrome').lower()
+# Cross-browser matrix: every UI test runs once per listed browser (e.g.
+# BROWSERS=chrome,firefox); run with -n to execute the browsers concurrently
+BROWSERS = parse_browsers(os.getenv('BROWSERS'), BROWSER)
+MATRIX_SLOWDOWN = float(os.getenv('MATRIX_SLOWDOWN', 1.5))
 HEADLESS = os.getenv('HEADLESS', 'false').lower() == 'true'
-IMPLICIT_WAIT = int(os.getenv('IMPLICIT_WAIT', 10))
+# Page objects use explicit waits only; keep the implicit wait at 0 so the
+# two never stack (a non-zero value delays every negative lookup)
+IMPLICIT_WAIT = int(os.getenv('IMPLICIT_WAIT', 0))
+EXPLICIT_WAIT = float(os.getenv('EXPLICIT_WAIT', 15))
+WAIT_POLL_INTERVAL = float(os.getenv('WAIT_POLL_INTERVAL', 0.1))
+WAIT_SETTLE_MS = int(os.getenv('WAIT_SETTLE_MS', 50))
+REUSE_BROWSER = os.getenv('REUSE_BROWSER', 'true').lower() == 'true'
+# First driver port; xdist workers use DRIVER_PORT_BASE + worker index (0 = auto)
+DRIVER_PORT_BASE = int(os.getenv('DRIVER_PORT_BASE', 0))
+# Lean Chrome preset and image loading for locally launched browsers
+LEAN_BROWSER = os.getenv('LEAN_BROWSER', 'false').lower() == 'true'
+DISABLE_IMAGES = os.getenv('DISABLE_IMAGES', 'false').lower() == 'true'
+# Warm browser pool (python -m utils.browser_pool); Chrome only
+BROWSER_POOL_URL = os.getenv('BROWSER_POOL_URL')
 SCREENSHOT_DIR = os.path.join(os.path.dirname(__file__), 'screenshots')
 REPORT_DIR = os.path.join(os.path.dirname(__file__), 'reports')
+SCREENSHOT_SCALE = float(os.getenv('SCREENSHOT_SCALE', 1.0))
+SCREENSHOT_FORMAT = os.getenv('SCREENSHOT_FORMAT', 'png').lower()
+SCREENSHOT_QUALITY = int(os.getenv('SCREENSHOT_QUALITY', 85))
+SCREENSHOT_DEDUPE = os.getenv('SCREENSHOT_DEDUPE', 'true').lower() == 'true'
+# On by default in a matrix run, so steps can be compared across browsers
+TRACE_STEPS = os.getenv('TRACE_STEPS', 'true' if len(BROWSERS) > 1 else 'false').lower() == 'true'
+TRACE_DIR = os.path.join(REPORT_DIR, 'traces')
+PROFILE_COMMANDS = os.getenv('PROFILE_COMMANDS', 'false').lower() == 'true'
+CACHE_ELEMENTS = os.getenv('CACHE_ELEMENTS', 'false').lower() == 'true'
+# Store-volume data for the scale tests
+SCALE_MODE = os.getenv('SCALE_MODE', 'false').lower() == 'true'
+SCALE_PRODUCTS = int(os.getenv('SCALE_PRODUCTS', 5000))
+SCALE_SALES = int(os.getenv('SCALE_SALES', 20000))
+# Local results history and slowdown detection against the previous runs (opt-in)
+RESULTS_STORE = os.getenv('RESULTS_STORE', 'false').lower() == 'true'
+RESULTS_DB = os.getenv('RESULTS_DB') or os.path.join(REPORT_DIR, 'results.sqlite')
+RESULTS_BASELINE_RUNS = int(os.getenv('RESULTS_BASELINE_RUNS', 10))
+RESULTS_Z_THRESHOLD = float(os.getenv('RESULTS_Z_THRESHOLD', 3.0))
+# Visual regression: screenshot() captures are compared against stored baselines
+VISUAL_REGRESSION = os.getenv('VISUAL_REGRESSION', 'false').lower() == 'true'
+UPDATE_VISUAL_BASELINES = os.getenv('UPDATE_VISUAL_BASELINES', 'false').lower() == 'true'
+VISUAL_BASELINE_DIR = os.getenv('VISUAL_BASELINE_DIR') or \
+    os.path.join(os.path.dirname(__file__), 'visual-baselines')
+VISUAL_DIFF_DIR = os.path.join(REPORT_DIR, 'visual')
+VISUAL_TOLERANCE = int(os.getenv('VISUAL_TOLERANCE', 16))
+VISUAL_MAX_CHANGED_BLOCKS = int(os.getenv('VISUAL_MAX_CHANGED_BLOCKS', 0))
+
+# Durations of this run, keyed by nodeid (collected in the controller)
+TEST_DURATIONS = {}
+# WebDriver command counts across the run (collected in the controller)
+COMMAND_SUMMARY = CommandSummary()
+# Outcomes and timings of this run for the results store (collected in the controller)
+RUN_RESULTS = RunCollector()
+# Slowdowns of this run against the stored baseline, reported in the terminal summary
+REGRESSIONS = []
+# Per-browser test and step timings of a matrix run (collected in the controller)
+BROWSER_MATRIX = BrowserMatrix(slowdown=MATRIX_SLOWDOWN)
 
 # Ensure directories exist
 os.makedirs(SCREENSHOT_DIR, exist_ok=True)
 os.makedirs(REPORT_DIR, exist_ok=True)
 
+# Shared by the screenshot fixture and the failure hook; flushed at session end
+SCREENSHOTS = ScreenshotWriter(
+    SCREENSHOT_DIR,
+    scale=SCREENSHOT_SCALE,
+    image_format=SCREENSHOT_FORMAT,
+    quality=SCREENSHOT_QUALITY,
+    dedupe=SCREENSHOT_DEDUPE,
+)
+
+# Baselines are kept per browser, since fonts and anti-aliasing differ
+VISUAL = {
+    browser: VisualComparator(
+        os.path.join(VISUAL_BASELINE_DIR, browser),
+        os.path.join(VISUAL_DIFF_DIR, browser),
+        update=UPDATE_VISUAL_BASELINES,
+        tolerance=VISUAL_TOLERANCE,
+        max_changed_blocks=VISUAL_MAX_CHANGED_BLOCKS,
+    )
+    for browser in BROWSERS
+}
+# Dynamic regions of every page, masked in every comparison
+VISUAL_MASKS = LoginPage.VISUAL_MASKS + POSPage.VISUAL_MASKS + SalesHistoryPage.VISUAL_MASKS
+
 
 def pytest_configure(config):
     """Configure pytest with custom markers."""
+    BasePage.configure_waits(EXPLICIT_WAIT, WAIT_POLL_INTERVAL, WAIT_SETTLE_MS)
     config.addinivalue_line("markers", "smoke: mark test as smoke test")
     config.addinivalue_line("markers", "regression: mark test as regression test")
     config.addinivalue_line("markers", "e2e: mark test as end-to-end test")
+    config.addinivalue_line("markers", "fresh_browser: run test in a newly launched browser")
+    config.addinivalue_line("markers", "api: mark test as API test (no browser)")
+    config.addinivalue_line("markers", "load: mark test as API load/latency test")
+    config.addinivalue_line("markers", "perf: mark test as front-end performance test")
+    config.addinivalue_line("markers", "scale: mark test as store-volume test (needs SCALE_MODE=true)")
+    config.addinivalue_line("markers", "soak: mark test as long-running memory test (needs SOAK_MODE=true)")
+    config.addinivalue_line("markers", "unit: mark test as unit test (no browser, no server)")
+    config.addinivalue_line(
+        "markers",
+        "command_budget(max_commands=None, max_ms=None): fail the test if its body (not its "
+        "fixtures) sends more WebDriver commands or spends more time in them than allowed",
+    )
+    config.addinivalue_line(
+        "markers",
+        "ui_budget(interaction=None, max_ms=None, pct=95, max_long_tasks=None, max_layout_ms=None, "
+        "max_script_ms=None): fail the test if the ui_metrics fixture measured slower rendering",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    """Run every browser test once per browser in BROWSERS (ids like test_x[firefox])."""
+    if len(BROWSERS) > 1 and 'browser_name' in metafunc.fixturenames:
+        metafunc.parametrize('browser_name', BROWSERS, indirect=True, scope='session')
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Balance `-n` runs across workers using durations from earlier runs."""
+    if config.getoption('dist') == 'load':
+        return DurationScheduling(config, log)
+    return None
+
+
+def pytest_runtest_logreport(report):
+    """Accumulate setup + call + teardown time per test for scheduling and the results store."""
+    TEST_DURATIONS[report.nodeid] = TEST_DURATIONS.get(report.nodeid, 0.0) + report.duration
+    RUN_RESULTS.add_report(report)
+    BROWSER_MATRIX.add_report(report)
+    if report.when == "call":
+        for name, value in report.user_properties:
+            if name == 'webdriver_commands':
+                COMMAND_SUMMARY.add(value)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Print the hottest WebDriver commands and call sites when profiling."""
+    if COMMAND_SUMMARY.tests:
+        terminalreporter.section("WebDriver command profile")
+        terminalreporter.write_line(COMMAND_SUMMARY.format())
+    if REGRESSIONS:
+        terminalreporter.section("Performance regressions")
+        terminalreporter.write_line(format_regressions(REGRESSIONS))
+        terminalreporter.write_line("Trends: python -m utils.results_store trends --kind test|step|endpoint")
+    if len(BROWSER_MATRIX.browsers) > 1:
+        terminalreporter.section("Browser timing comparison")
+        terminalreporter.write_line(BROWSER_MATRIX.format())
+
+
+def pytest_html_results_summary(prefix, summary, postfix):
+    """Add the browser timing comparison to the HTML report summary."""
+    if len(BROWSER_MATRIX.browsers) > 1:
+        postfix.append(BROWSER_MATRIX.html())
+
+
+def pytest_sessionfinish(session):
+    """Flush pending screenshots and persist durations and results (controller only)."""
+    SCREENSHOTS.close()
+    config = session.config
+    if not is_xdist_worker(config):
+        save_durations(config, load_durations(config), TEST_DURATIONS)
+        if RESULTS_STORE and RUN_RESULTS.outcomes and not config.getoption('collectonly'):
+            store = ResultsStore(RESULTS_DB)
+            try:
+                run_id = store.ingest(RUN_RESULTS)
+                REGRESSIONS.extend(store.regressions(
+                    run_id, RESULTS_BASELINE_RUNS, z_threshold=RESULTS_Z_THRESHOLD))
+            finally:
+                store.close()
+
+
+@pytest.fixture(scope="session")
+def worker_temp_dir(request):
+    """Private temp directory for this worker's browser profiles."""
+    watch = getattr(request.config, 'nardpos_watch', None)
+    if watch is not None:
+        # Watch mode (utils.watch) keeps the browser, and so its profile, between runs
+        yield watch.temp_dir
+        return
+    path = tempfile.mkdtemp(prefix=f'nardpos-{worker_id()}-')
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _browser_factory(temp_dir, browser_name, driver_port=0):
+    """Build a zero-argument launcher; leases from the warm pool when configured."""
+    def _launch():
+        return create_browser(browser_name, HEADLESS, IMPLICIT_WAIT,
+                              temp_dir=temp_dir, driver_port=driver_port,
+                              lean=LEAN_BROWSER, disable_images=DISABLE_IMAGES)
+
+    if not BROWSER_POOL_URL or browser_name != 'chrome':
+        return _launch
+
+    def _create():
+        try:
+            return create_pooled_browser(BROWSER_POOL_URL, IMPLICIT_WAIT)
+        except BrowserPoolError as error:
+            warnings.warn(f"{error}; launching a local browser instead")
+            return _launch()
+
+    return _create
+
+
+@pytest.fixture(scope="session")
+def browser_name(request):
+    """
+    Browser the test runs in: BROWSER, or one of BROWSERS per parametrized
+    copy of the test in a matrix run.
+    """
+    return getattr(request, 'param', BROWSER)
+
+
+@pytest.fixture(scope="session")
+def browser_factory(worker_temp_dir, browser_name):
+    """
+    Return a callable that launches a browser isolated to this worker.
+    With BROWSER_POOL_URL set, Chrome browsers are leased from the warm pool.
+    """
+    driver_port = 0
+    if DRIVER_PORT_BASE:
+        # One port per worker and browser, since drivers of a matrix run side by side
+        driver_port = DRIVER_PORT_BASE + worker_index() * len(BROWSERS) + BROWSERS.index(browser_name)
+    return _browser_factory(worker_temp_dir, browser_name, driver_port)
+
+
+@pytest.fixture(scope="session")
+def cashier_factory(worker_temp_dir, browser_name):
+    """
+    Return a launcher for extra browsers running alongside the test's own,
+    e.g. one per simulated cashier. Driver ports are always picked freely so
+    concurrent launches never collide.
+    """
+    return _browser_factory(worker_temp_dir, browser_name)
+
+
+@pytest.fixture(scope="session")
+def browser_sessions(request):
+    """
+    Reusable browsers of this worker keyed by browser name, so a matrix run
+    keeps a separate pool per browser. Held outside the parametrized fixtures
+    so switching between browsers never closes one.
+    Under utils.watch the browsers outlive the session and are reused by the next run.
+    """
+    watch = getattr(request.config, 'nardpos_watch', None)
+    if watch is not None:
+        yield watch.sessions
+        return
+    sessions = {}
+    yield sessions
+    for session in sessions.values():
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def browser_session(browser_sessions, browser_factory, browser_name):
+    """
+    Keep one browser alive for the whole session (one per xdist worker and browser).
+    Set REUSE_BROWSER=false to launch a fresh browser for every test.
+    """
+    if browser_name not in browser_sessions:
+        browser_sessions[browser_name] = BrowserSession(browser_factory)
+    return browser_sessions[browser_name]
 
 
 @pytest.fixture(scope="function")
-def driver():
+def driver(browser_session, browser_factory, request):
     """
     Create and configure WebDriver instance.
     Yields the driver and handles cleanup after test.
+
+    With REUSE_BROWSER enabled the worker's browser is reused and reset to a
+    blank page afterwards, so every test still starts from a fresh app load.
+    Tests marked with @pytest.mark.fresh_browser always get a new browser.
+    PROFILE_COMMANDS=true (or a command_budget marker) counts wire commands.
     """
-    if BROWSER == 'firefox':
-        options = FirefoxOptions()
-        if HEADLESS:
-            options.add_argument('--headless')
-        options.add_argument('--width=1920')
-        options.add_argument('--height=1080')
-        browser = webdriver.Firefox(options=options)
-    else:
-        # Default to Chrome - use system chromedriver
-        options = ChromeOptions()
-        if HEADLESS:
-            options.add_argument('--headless=new')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('--disable-gpu')
-        # Let Selenium find chromedriver automatically
-        browser = webdriver.Chrome(options=options)
-
-    browser.implicitly_wait(IMPLICIT_WAIT)
-    browser.maximize_window()
-    
+    profile = PROFILE_COMMANDS or request.node.get_closest_marker('command_budget') is not None
+
+    if not REUSE_BROWSER or request.node.get_closest_marker('fresh_browser'):
+        browser = browser_factory()
+        _start_profiling(browser, request, profile)
+        yield browser
+        browser.quit()
+        return
+
+    browser = browser_session.acquire()
+    _start_profiling(browser, request, profile)
     yield browser
-    
-    browser.quit()
+    browser_session.reset()
+
+
+def _start_profiling(browser, request, profile):
+    """
+    Attach the browser's command profiler to this test. It only counts
+    during the call phase (see pytest_runtest_call), so commands sent by
+    fixtures such as authenticated_pos don't count against command_budget.
+    """
+    if not profile:
+        return
+    profiler = CommandProfiler.install(browser)
+    profiler.enabled = False
+    request.node.command_profiler = profiler
+
+
+@pytest.fixture(scope="session")
+def nardpos_server():
+    """
+    Start the in-process NardPOS mock (API + mock-ui) for this worker.
+    The socket is bound before the fixture returns, so no startup wait is needed.
+    """
+    server = NardPOSServer().start()
+    yield server
+    server.stop()
 
 
 @pytest.fixture(scope="function")
-def base_url():
+def base_url(request):
     """Return the base URL for tests."""
-    return BASE_URL
+    if BASE_URL:
+        return BASE_URL
+    return f"{request.getfixturevalue('nardpos_server').url}/index.html"
+
+
+@pytest.fixture(scope="session")
+def api_base_url(request):
+    """Return the API base URL (API_BASE_URL or the in-process mock server)."""
+    if API_BASE_URL:
+        return API_BASE_URL
+    return request.getfixturevalue('nardpos_server').url
 
 
 @pytest.fixture(scope="function")
@@ -84,6 +379,76 @@ def test_credentials():
     }
 
 
+@pytest.fixture(scope="function")
+def authenticated_pos(driver, base_url, test_credentials):
+    """
+    Return a POSPage already logged in to the dashboard.
+    Skips the UI login flow: one navigation plus one in-page login call.
+    """
+    driver.get(base_url)
+    logged_in = LoginPage(driver).login_in_page(
+        test_credentials['username'], test_credentials['password']
+    )
+    if not logged_in:
+        pytest.fail("In-page login did not reach the dashboard")
+    return POSPage(driver, cache_elements=CACHE_ELEMENTS)
+
+
+@pytest.fixture(scope="function")
+def seed_sales(authenticated_pos):
+    """
+    Factory fixture that pre-fills the sales history without checkouts.
+    Usage: receipts = seed_sales(500, payment_method='card')
+    See POSPage.seed_sales for every option.
+    """
+    def _seed(count=None, **options):
+        return authenticated_pos.seed_sales(count, **options)
+    
+    return _seed
+
+
+@pytest.fixture(scope="session")
+def scale_data():
+    """
+    Generated catalog and history at store volume (SCALE_PRODUCTS, SCALE_SALES).
+    Scale tests are skipped unless SCALE_MODE=true.
+    """
+    if not SCALE_MODE:
+        pytest.skip("Scale tests run with SCALE_MODE=true")
+    products = generate_products(SCALE_PRODUCTS)
+    return {'products': products, 'sales': generate_sales(SCALE_SALES, products)}
+
+
+@pytest.fixture(scope="function", autouse=True)
+def step_tracer(request):
+    """
+    Time every page-object call when TRACE_STEPS=true.
+    Writes a Chrome trace per test to reports/traces/ (open in chrome://tracing
+    or https://ui.perfetto.dev) and adds a step table to the HTML report.
+    """
+    if not TRACE_STEPS:
+        yield None
+        return
+    tracer = tracing.start(request.node.nodeid)
+    request.node.step_tracer = tracer
+    yield tracer
+    tracing.stop()
+    trace_path = tracer.write(artifact_path(TRACE_DIR, request.node.name, 'json'))
+    print(f"\n⏱️ Trace: {trace_path}")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Count WebDriver commands for the test body only, after every fixture ran."""
+    profiler = getattr(item, 'command_profiler', None)
+    if profiler is not None:
+        profiler.reset()
+        profiler.enabled = True
+    yield
+    if profiler is not None:
+        profiler.enabled = False
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """
@@ -93,13 +458,73 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
     
+    browser_name = item.funcargs.get('browser_name')
+    if report.when == "call" and browser_name is not None:
+        report.user_properties.append(('browser', browser_name))
+    
+    profiler = getattr(item, 'command_profiler', None)
+    if report.when == "call" and profiler is not None:
+        snapshot = profiler.snapshot()
+        report.user_properties.append(('webdriver_commands', snapshot))
+        budget = item.get_closest_marker('command_budget')
+        if budget is not None and report.passed:
+            failure = check_budget(snapshot, **budget.kwargs)
+            if failure:
+                report.outcome = "failed"
+                report.longrepr = failure
+    
+    tracer = getattr(item, 'step_tracer', None)
+    if report.when == "call" and tracer is not None:
+        summary = tracer.step_summary()
+        report.user_properties.append(
+            ('step_timings', {row['step']: round(row['total_ms'], 2) for row in summary})
+        )
+        pytest_html = item.config.pluginmanager.getplugin('html')
+        if pytest_html is not None and summary:
+            extras = getattr(report, 'extras', [])
+            extras.append(pytest_html.extras.html(tracer.step_table_html()))
+            report.extras = extras
+    
+    metrics = getattr(item, 'ui_metrics', None)
+    if report.when == "call" and metrics is not None:
+        summary = metrics.collect()
+        report.user_properties.append(('ui_metrics', summary))
+        budget = item.get_closest_marker('ui_budget')
+        if budget is not None and report.passed:
+            violations = metrics.check_budget(**budget.kwargs)
+            if violations:
+                report.outcome = "failed"
+                report.longrepr = "UI performance budget exceeded:\n" + '\n'.join(violations)
+        pytest_html = item.config.pluginmanager.getplugin('html')
+        if pytest_html is not None:
+            extras = getattr(report, 'extras', [])
+            extras.append(pytest_html.extras.html(summary_table_html(summary)))
+            report.extras = extras
+    
+    visual = getattr(item, 'visual_results', None)
+    if report.when == "call" and visual:
+        report.user_properties.append(('visual', [result._asdict() for result in visual]))
+        mismatches = [result for result in visual if result.status == 'mismatch']
+        if mismatches and report.passed:
+            report.outcome = "failed"
+            report.longrepr = "Visual regression:\n" + '\n'.join(
+                f"{result.name}: {result.message}" + (f" (diff: {result.diff_path})" if result.diff_path else '')
+                for result in mismatches
+            )
+        pytest_html = item.config.pluginmanager.getplugin('html')
+        html_path = item.config.getoption('htmlpath', None)
+        if pytest_html is not None and html_path:
+            extras = getattr(report, 'extras', [])
+            for result in mismatches:
+                if result.diff_path:
+                    relative = os.path.relpath(result.diff_path, os.path.dirname(os.path.abspath(html_path)))
+                    extras.append(pytest_html.extras.image(relative, name=f"Visual diff: {result.name}"))
+            report.extras = extras
+    
     if report.when == "call" and report.failed:
         driver = item.funcargs.get('driver')
         if driver:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            test_name = item.name.replace(' ', '_')
-            screenshot_path = os.path.join(SCREENSHOT_DIR, f'{test_name}_{timestamp}.png')
-            driver.save_screenshot(screenshot_path)
+            screenshot_path = SCREENSHOTS.capture(driver, item.name, item.nodeid)
             print(f"\n📸 Screenshot saved: {screenshot_path}")
 
 
@@ -109,17 +534,47 @@ def pytest_html_report_title(report):
 
 
 @pytest.fixture(scope="function")
-def screenshot(driver, request):
+def ui_metrics(driver, request):
+    """
+    Measure click-to-render latency, long tasks and layout/script time (Chrome only).
+    Request it before anything that loads the app so the page is instrumented
+    from its first script, e.g. `def test_x(self, ui_metrics, authenticated_pos)`.
+    Results are added to the report; call ui_metrics.assert_budget(...) or use
+    @pytest.mark.ui_budget(...) to fail on slow rendering.
+    """
+    if not supports_cdp(driver):
+        pytest.skip("ui_metrics needs a Chromium browser (DevTools protocol)")
+    metrics = UIMetrics(driver).start()
+    request.node.ui_metrics = metrics
+    yield metrics
+    metrics.stop()
+
+
+@pytest.fixture(scope="function")
+def screenshot(driver, browser_name, request):
     """
     Fixture to take screenshots during tests.
     Usage: screenshot('step_name') in test
+           screenshot('cart', element=POSPage.CART_ITEMS) for a single element
+    
+    Files are written in the background; the returned path exists once the
+    session ends (or after SCREENSHOTS.flush()).
+    
+    With VISUAL_REGRESSION=true each capture is also compared against its
+    baseline, masking the pages' VISUAL_MASKS plus any extra `mask` locators;
+    mismatches fail the test and their diff images go into the report.
     """
-    def _screenshot(name):
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{request.node.name}_{name}_{timestamp}.png"
-        filepath = os.path.join(SCREENSHOT_DIR, filename)
-        driver.save_screenshot(filepath)
+    def _screenshot(name, element=None, mask=()):
+        artifact = f"{request.node.name}_{name}"
+        png = take_png(driver, element)
+        filepath = SCREENSHOTS.submit(png, artifact, request.node.nodeid)
         print(f"\n📸 Screenshot: {filepath}")
+        if VISUAL_REGRESSION:
+            regions = mask_regions(driver, VISUAL_MASKS + tuple(mask), element)
+            # Baselines are per browser already; keep their names free of the matrix id
+            baseline = f"{without_browser_id(request.node.name, browser_name)}_{name}"
+            result = VISUAL[browser_name].compare(baseline, png, regions)
+            request.node.visual_results = getattr(request.node, 'visual_results', []) + [result]
         return filepath
     
     return _screenshot
@@ -3,28 +3,237 @@ NardPOS UI Automation - Base Page Object
 Contains common methods used across all page objects.
 """
 
+from contextlib import contextmanager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, StaleElementReferenceException
+)
+from utils.tracing import instrument_class
+
+
+# Installs one MutationObserver per selector and returns the current
+# per-selector mutation versions. Safe to run repeatedly on the same page.
+OBSERVE_MUTATIONS_SCRIPT = """
+var selectors = arguments[0];
+var state = window.__nardposMutations;
+if (!state) {
+    state = window.__nardposMutations = {
+        token: Math.random().toString(36).slice(2),
+        versions: {},
+        observers: {},
+        listeners: []
+    };
+}
+selectors.forEach(function (selector) {
+    var element = document.querySelector(selector);
+    var current = state.observers[selector];
+    if (!element || (current && current.element === element)) {
+        return;
+    }
+    if (current) {
+        current.observer.disconnect();
+    }
+    var observer = new MutationObserver(function () {
+        state.versions[selector] = (state.versions[selector] || 0) + 1;
+        state.listeners.slice().forEach(function (listener) { listener(); });
+    });
+    observer.observe(element, {
+        childList: true, subtree: true, characterData: true, attributes: true
+    });
+    state.observers[selector] = {element: element, observer: observer};
+    state.versions[selector] = state.versions[selector] || 0;
+});
+var versions = {};
+selectors.forEach(function (selector) {
+    versions[selector] = state.versions[selector] || 0;
+});
+return {token: state.token, versions: versions};
+"""
+
+# Resolves as soon as any observed selector moves past the given versions,
+# or with false once the timeout (ms) expires.
+WAIT_FOR_MUTATION_SCRIPT = """
+var snapshot = arguments[0];
+var timeout = arguments[1];
+var done = arguments[arguments.length - 1];
+var state = window.__nardposMutations;
+function changed() {
+    return Object.keys(snapshot.versions).some(function (selector) {
+        return (state.versions[selector] || 0) !== snapshot.versions[selector];
+    });
+}
+if (!state || state.token !== snapshot.token || changed()) {
+    // A navigation replaced the document, or the change already happened
+    done(true);
+    return;
+}
+var timer = null;
+function listener() {
+    if (changed()) {
+        finish(true);
+    }
+}
+function finish(result) {
+    clearTimeout(timer);
+    var index = state.listeners.indexOf(listener);
+    if (index !== -1) {
+        state.listeners.splice(index, 1);
+    }
+    done(result);
+}
+state.listeners.push(listener);
+timer = setTimeout(function () { finish(false); }, timeout);
+"""
+
+
+# Waits until the document has had no mutations for `quiet` ms (or
+# `timeout` ms passed), then reports [present, visible] for the selector.
+# Lets negative checks answer as soon as the page has settled instead of
+# waiting out a timeout.
+SETTLED_STATE_SCRIPT = """
+var selector = arguments[0];
+var quiet = arguments[1];
+var timeout = arguments[2];
+var done = arguments[arguments.length - 1];
+var started = performance.now();
+var lastChange = started;
+var observer = new MutationObserver(function () { lastChange = performance.now(); });
+observer.observe(document.documentElement, {
+    childList: true, subtree: true, attributes: true, characterData: true
+});
+function state() {
+    var element = selector ? document.querySelector(selector) : null;
+    if (!element) {
+        return [false, false];
+    }
+    var style = window.getComputedStyle(element);
+    var visible = element.getClientRects().length > 0 &&
+        style.visibility !== 'hidden' && style.opacity !== '0';
+    return [true, visible];
+}
+(function poll() {
+    var now = performance.now();
+    if (now - lastChange >= quiet || now - started >= timeout) {
+        observer.disconnect();
+        done(state());
+    } else {
+        setTimeout(poll, Math.min(quiet, 10));
+    }
+})();
+"""
+
+# Wait conditions by name: how to wait for a locator, and how to re-check an
+# element handle that is already cached
+LOCATOR_CONDITIONS = {
+    'present': EC.presence_of_element_located,
+    'visible': EC.visibility_of_element_located,
+    'clickable': EC.element_to_be_clickable,
+}
+ELEMENT_CONDITIONS = {
+    'visible': EC.visibility_of,
+    'clickable': EC.element_to_be_clickable,
+}
+
+
+def locator_to_css(locator):
+    """Convert a (By, value) locator into an equivalent CSS selector."""
+    by, value = locator
+    if by == By.ID:
+        return f"#{value}"
+    if by == By.CLASS_NAME:
+        return f".{value}"
+    if by == By.CSS_SELECTOR:
+        return value
+    if by == By.TAG_NAME:
+        return value
+    raise ValueError(f"Cannot observe mutations for locator {locator!r}")
 
 
 class BasePage:
     """Base class for all page objects."""
     
-    def __init__(self, driver):
-        """Initialize base page with WebDriver instance."""
+    def __init_subclass__(cls, **kwargs):
+        """Record a timed span for every public page-object method."""
+        super().__init_subclass__(**kwargs)
+        instrument_class(cls)
+    
+    # Locators whose elements are replaced on purpose (e.g. rows rebuilt
+    # through innerHTML); never served from the element cache
+    NON_CACHEABLE = frozenset()
+    
+    # Locators of regions that differ on every run (receipt numbers, dates);
+    # masked out of visual comparisons (see utils.visual)
+    VISUAL_MASKS = ()
+    
+    # Wait engine settings shared by every page (see configure_waits)
+    WAIT_TIMEOUT = 15
+    POLL_INTERVAL = 0.1
+    SETTLE_MS = 50
+    
+    @classmethod
+    def configure_waits(cls, timeout=None, poll_interval=None, settle_ms=None):
+        """
+        Set the default explicit-wait timeout, polling interval and the
+        quiet period negative checks wait for, for all page objects.
+        """
+        if timeout is not None:
+            cls.WAIT_TIMEOUT = timeout
+        if poll_interval is not None:
+            cls.POLL_INTERVAL = poll_interval
+        if settle_ms is not None:
+            cls.SETTLE_MS = settle_ms
+    
+    def __init__(self, driver, cache_elements=False):
+        """
+        Initialize base page with WebDriver instance.
+        
+        Args:
+            driver: WebDriver instance
+            cache_elements: Reuse element handles per locator for the life of
+                this page object, re-resolving them when they go stale
+        """
         self.driver = driver
-        self.wait = WebDriverWait(driver, 15)
+        self._waits = {}
+        self.wait = self.waiter()
+        self.cache_elements = cache_elements
+        self._elements = {}
+    
+    def waiter(self, timeout=None):
+        """
+        Return a reusable explicit wait for `timeout` seconds.
+        
+        Waits are created once per timeout and page object and poll every
+        POLL_INTERVAL seconds. There is no implicit wait underneath, so a
+        wait never takes longer than its own timeout.
+        """
+        timeout = self.WAIT_TIMEOUT if timeout is None else timeout
+        wait = self._waits.get(timeout)
+        if wait is None:
+            wait = self._waits[timeout] = WebDriverWait(
+                self.driver, timeout, poll_frequency=self.POLL_INTERVAL
+            )
+        return wait
     
     def open(self, url):
         """Navigate to a URL."""
+        self.clear_element_cache()
         self.driver.get(url)
         return self
     
+    def clear_element_cache(self):
+        """Forget every cached element handle."""
+        self._elements.clear()
+        return self
+    
     def find_element(self, locator):
-        """Find a single element."""
-        return self.driver.find_element(*locator)
+        """Find a single element (from the element cache when enabled)."""
+        element = self._cached_element(locator)
+        if element is None:
+            element = self.driver.find_element(*locator)
+            self._cache_element(locator, element)
+        return element
     
     def find_elements(self, locator):
         """Find multiple elements."""
@@ -32,49 +241,89 @@ class BasePage:
     
     def click(self, locator):
         """Wait for element and click."""
-        element = self.wait.until(EC.element_to_be_clickable(locator))
-        element.click()
+        self._with_element(locator, lambda element: element.click(), 'clickable')
         return self
     
     def type_text(self, locator, text):
         """Wait for element and type text."""
-        element = self.wait.until(EC.presence_of_element_located(locator))
-        element.clear()
-        element.send_keys(text)
+        def type_into(element):
+            element.clear()
+            element.send_keys(text)
+        self._with_element(locator, type_into)
         return self
     
     def get_text(self, locator):
         """Get text from an element."""
-        element = self.wait.until(EC.presence_of_element_located(locator))
-        return element.text
+        return self._with_element(locator, lambda element: element.text)
     
     def is_displayed(self, locator, timeout=5):
-        """Check if element is displayed."""
+        """
+        Check if element is displayed, waiting up to `timeout` for it.
+        
+        Checks that expect the element to be missing should use is_hidden()
+        or settled_state() instead, which answer without the timeout.
+        """
         try:
-            wait = WebDriverWait(self.driver, timeout)
-            element = wait.until(EC.visibility_of_element_located(locator))
-            return element.is_displayed()
+            return self._with_element(
+                locator, lambda element: element.is_displayed(), 'visible', timeout
+            )
         except TimeoutException:
             return False
     
     def is_element_present(self, locator, timeout=5):
-        """Check if element is present in DOM."""
+        """Check if element is present in DOM, waiting up to `timeout` for it."""
         try:
-            wait = WebDriverWait(self.driver, timeout)
-            wait.until(EC.presence_of_element_located(locator))
+            self.waiter(timeout).until(EC.presence_of_element_located(locator))
             return True
         except TimeoutException:
             return False
     
-    def wait_for_element(self, locator, timeout=15):
+    def settled_state(self, locator):
+        """
+        Wait until the DOM has been quiet for SETTLE_MS, then look once.
+        
+        Returns:
+            (present, visible) for the first element matching the locator
+        """
+        try:
+            selector = locator_to_css(locator)
+        except ValueError:
+            selector = None
+        present, visible = self.driver.execute_async_script(
+            SETTLED_STATE_SCRIPT, selector, self.SETTLE_MS, int(self.WAIT_TIMEOUT * 1000)
+        )
+        if selector is None:
+            # XPath and friends: the page has settled, so one lookup is final
+            elements = self.driver.find_elements(*locator)
+            present = bool(elements)
+            visible = present and elements[0].is_displayed()
+        return present, visible
+    
+    def is_absent(self, locator):
+        """True once the settled page has no element matching the locator."""
+        return not self.settled_state(locator)[0]
+    
+    def is_hidden(self, locator):
+        """True once the settled page has no visible element for the locator."""
+        return not self.settled_state(locator)[1]
+    
+    def assert_absent(self, locator, message=None):
+        """Fail fast unless the locator matches nothing on the settled page."""
+        assert self.is_absent(locator), message or f"Expected {locator!r} to be absent"
+        return self
+    
+    def assert_hidden(self, locator, message=None):
+        """Fail fast unless the locator's element is missing or hidden."""
+        assert self.is_hidden(locator), message or f"Expected {locator!r} to be hidden"
+        return self
+    
+    def wait_for_element(self, locator, timeout=None):
         """Wait for element to be visible."""
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.visibility_of_element_located(locator))
+        return self._with_element(locator, lambda element: element, 'visible', timeout)
     
-    def wait_for_element_clickable(self, locator, timeout=15):
+    def wait_for_element_clickable(self, locator, timeout=None):
         """Wait for element to be clickable."""
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.element_to_be_clickable(locator))
+        return self._with_element(locator, lambda element: element, 'clickable', timeout)
     
     def get_page_title(self):
         """Get the current page title."""
@@ -91,20 +340,98 @@ class BasePage:
     
     def scroll_to_element(self, locator):
         """Scroll to element."""
-        element = self.find_element(locator)
-        self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
+        self._with_element(locator, lambda element: self.driver.execute_script(
+            "arguments[0].scrollIntoView(true);", element
+        ))
         return self
     
     def get_element_attribute(self, locator, attribute):
         """Get an attribute value from an element."""
-        element = self.find_element(locator)
-        return element.get_attribute(attribute)
+        return self._with_element(locator, lambda element: element.get_attribute(attribute))
     
-    def wait_for_text_in_element(self, locator, text, timeout=15):
+    def _cached_element(self, locator):
+        if not self.cache_elements or locator in self.NON_CACHEABLE:
+            return None
+        return self._elements.get(locator)
+    
+    def _cache_element(self, locator, element):
+        if self.cache_elements and locator not in self.NON_CACHEABLE:
+            self._elements[locator] = element
+    
+    def _with_element(self, locator, action, condition='present', timeout=None):
+        """
+        Resolve `locator` and run `action(element)`.
+        
+        A cached handle is re-checked against `condition` and used directly;
+        if it has gone stale (the node was re-rendered) it is dropped and
+        the locator is resolved again, so callers never see the staleness.
+        
+        Args:
+            locator: Element locator tuple
+            action: Callable receiving the WebElement
+            condition: 'present', 'visible' or 'clickable'
+            timeout: Seconds to wait (defaults to WAIT_TIMEOUT)
+        """
+        wait = self.waiter(timeout)
+        element = self._cached_element(locator)
+        if element is not None:
+            try:
+                if condition in ELEMENT_CONDITIONS:
+                    element = wait.until(ELEMENT_CONDITIONS[condition](element))
+                return action(element)
+            except StaleElementReferenceException:
+                self._elements.pop(locator, None)
+        element = wait.until(LOCATOR_CONDITIONS[condition](locator))
+        self._cache_element(locator, element)
+        return action(element)
+    
+    def wait_for_text_in_element(self, locator, text, timeout=None):
         """Wait for specific text to appear in element."""
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.text_to_be_present_in_element(locator, text))
+        return self.waiter(timeout).until(EC.text_to_be_present_in_element(locator, text))
     
     def execute_script(self, script, *args):
         """Execute JavaScript."""
         return self.driver.execute_script(script, *args)
+    
+    def observe_dom(self, *locators):
+        """
+        Start observing elements for DOM changes.
+        
+        Returns:
+            Snapshot of the current mutation versions for wait_for_dom_change
+        """
+        selectors = [locator_to_css(locator) for locator in locators]
+        return self.driver.execute_script(OBSERVE_MUTATIONS_SCRIPT, selectors)
+    
+    def wait_for_dom_change(self, snapshot, timeout=None):
+        """
+        Block until any element observed in the snapshot changes.
+        
+        Returns immediately if the change already happened (or the page was
+        reloaded) since the snapshot was taken.
+        """
+        timeout = self.WAIT_TIMEOUT if timeout is None else timeout
+        changed = self.driver.execute_async_script(
+            WAIT_FOR_MUTATION_SCRIPT, snapshot, int(timeout * 1000)
+        )
+        if not changed:
+            raise TimeoutException(
+                f"No DOM change in {', '.join(snapshot['versions'])} after {timeout}s"
+            )
+        return self
+    
+    @contextmanager
+    def expect_dom_change(self, *locators, timeout=None):
+        """
+        Wait for the wrapped action to change any of the given elements.
+        
+        Usage:
+            with self.expect_dom_change(self.CART_ITEMS, self.TOTAL):
+                self.click(product_locator)
+        """
+        snapshot = self.observe_dom(*locators)
+        yield
+        self.wait_for_dom_change(snapshot, timeout)
+
+
+instrument_class(BasePage)
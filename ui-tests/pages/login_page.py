@@ -7,6 +7,21 @@ from selenium.webdriver.common.by import By
 from .base_page import BasePage
 
 
+# Fills the login form and submits it through the app's own handler in one
+# round-trip. Returns true when the dashboard became visible.
+SUBMIT_LOGIN_SCRIPT = """
+var form = document.getElementById('loginForm');
+document.getElementById('username').value = arguments[0];
+document.getElementById('password').value = arguments[1];
+if (form.requestSubmit) {
+    form.requestSubmit();
+} else {
+    form.dispatchEvent(new Event('submit', {cancelable: true}));
+}
+return window.getComputedStyle(document.getElementById('dashboard')).display !== 'none';
+"""
+
+
 class LoginPage(BasePage):
     """Page object for the Login page."""
     
@@ -18,9 +33,9 @@ class LoginPage(BasePage):
     LOGIN_CONTAINER = (By.ID, "loginPage")
     LOGO = (By.CLASS_NAME, "logo")
     
-    def __init__(self, driver):
+    def __init__(self, driver, cache_elements=False):
         """Initialize login page."""
-        super().__init__(driver)
+        super().__init__(driver, cache_elements=cache_elements)
     
     def is_login_page_displayed(self):
         """Check if login page is displayed."""
@@ -57,6 +72,19 @@ class LoginPage(BasePage):
         self.click_login_button()
         return self
     
+    def login_in_page(self, username, password):
+        """
+        Log in without driving the form field by field.
+        
+        Runs the app's own submit handler from a single script call, so the
+        resulting dashboard state matches a UI login. Use login() for tests
+        that exercise the login form itself.
+        
+        Returns:
+            True if the dashboard is displayed afterwards
+        """
+        return self.execute_script(SUBMIT_LOGIN_SCRIPT, username, password)
+    
     def get_error_message(self):
         """Get the error message text if displayed."""
         if self.is_error_displayed():
@@ -64,12 +92,8 @@ class LoginPage(BasePage):
         return None
     
     def is_error_displayed(self):
-        """Check if error message is displayed."""
-        try:
-            element = self.find_element(self.LOGIN_ERROR)
-            return element.is_displayed() and element.value_of_css_property('display') != 'none'
-        except:
-            return False
+        """Check if error message is displayed (answers once the page has settled)."""
+        return self.settled_state(self.LOGIN_ERROR)[1]
     
     def get_page_title(self):
         """Get the page title."""
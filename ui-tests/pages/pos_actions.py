@@ -0,0 +1,160 @@
+"""
+NardPOS UI Automation - Batched POS Actions
+Runs a sequence of POS page actions in a single script call.
+"""
+
+# Replays steps by clicking the same elements a user would (so the app's own
+# listeners and inline handlers run), checking each one is displayed and
+# enabled first. Stops at the first failing step and reports it.
+RUN_ACTIONS_SCRIPT = """
+var steps = arguments[0], results = [];
+function usable(element, what) {
+    if (!element) throw new Error(what + ' not found');
+    if (!element.getClientRects().length || getComputedStyle(element).visibility === 'hidden') {
+        throw new Error(what + ' is not displayed');
+    }
+    if (element.disabled) throw new Error(what + ' is disabled');
+    return element;
+}
+function cartLine(productId) {
+    return document.querySelector('#cartItems .cart-item[data-id="' + productId + '"]');
+}
+function quantity(productId) {
+    var line = cartLine(productId);
+    return line ? parseInt(line.querySelector('.item-qty span').textContent, 10) : 0;
+}
+function text(id) {
+    return document.getElementById(id).textContent.trim();
+}
+for (var index = 0; index < steps.length; index++) {
+    var step = steps[index], value = null;
+    try {
+        if (step[0] === 'add') {
+            usable(document.getElementById('product-' + step[1]), 'product ' + step[1]).click();
+            value = quantity(step[1]);
+        } else if (step[0] === 'quantity') {
+            for (var click = 0; click < Math.abs(step[2]); click++) {
+                // Lines are rebuilt on every change, so look the button up each time
+                var line = usable(cartLine(step[1]), 'cart line for product ' + step[1]);
+                usable(line.querySelectorAll('.qty-btn')[step[2] < 0 ? 0 : 1], 'quantity button').click();
+            }
+            value = quantity(step[1]);
+        } else if (step[0] === 'remove') {
+            usable(cartLine(step[1]), 'cart line for product ' + step[1]).querySelector('.remove-btn').click();
+            value = 0;
+        } else if (step[0] === 'payment') {
+            usable(document.getElementById(step[1] + 'Btn'), step[1] + ' payment button').click();
+        } else if (step[0] === 'checkout') {
+            usable(document.getElementById('checkoutBtn'), 'checkout button').click();
+        } else if (step[0] === 'receipt') {
+            usable(document.getElementById('successModal'), 'success modal');
+            value = [text('receiptNumber').replace('Receipt:', '').trim(),
+                     text('receiptTotal').replace('Total:', '').trim()];
+        } else if (step[0] === 'totals') {
+            value = [text('subtotal'), text('tax'), text('total')];
+        } else if (step[0] === 'close') {
+            usable(document.getElementById('closeModal'), 'close button').click();
+        } else {
+            throw new Error('unknown action ' + step[0]);
+        }
+    } catch (error) {
+        return {results: results, failed: index, error: error.message};
+    }
+    results.push(value);
+}
+return {results: results, failed: null, error: null};
+"""
+
+PAYMENT_METHODS = ('cash', 'card', 'mobile')
+
+
+class BatchStepError(Exception):
+    """A step of a batched action sequence failed in the page."""
+
+    def __init__(self, index, step, message, results):
+        self.index = index
+        self.step = step
+        self.results = results
+        super().__init__(f"Step {index + 1} ({' '.join(map(str, step))}) failed: {message}")
+
+
+class POSActions:
+    """
+    Builder for POS page actions that run in one round-trip.
+
+    Every step clicks the same element the matching POSPage method would,
+    after the same displayed/enabled check, so the app ends up in the same
+    state. Example:
+        receipt, total = (pos_page.actions()
+                          .add(1).add(3).quantity(3, 2)
+                          .payment('card').checkout()
+                          .receipt().close()
+                          .run()[-2])
+    """
+
+    def __init__(self, page):
+        """
+        Args:
+            page: POSPage the actions run on
+        """
+        self.page = page
+        self.steps = []
+
+    def add(self, *product_ids):
+        """Click each product card once; the step value is its cart quantity."""
+        self.steps.extend(['add', product_id] for product_id in product_ids)
+        return self
+
+    def quantity(self, product_id, change):
+        """Press + (change > 0) or - (change < 0) on a cart line |change| times."""
+        self.steps.append(['quantity', product_id, change])
+        return self
+
+    def remove(self, product_id):
+        """Remove a cart line."""
+        self.steps.append(['remove', product_id])
+        return self
+
+    def payment(self, method):
+        """Select 'cash', 'card' or 'mobile'."""
+        if method not in PAYMENT_METHODS:
+            raise ValueError(f"Unknown payment method: {method}")
+        self.steps.append(['payment', method])
+        return self
+
+    def checkout(self):
+        """Complete the sale."""
+        self.steps.append(['checkout'])
+        return self
+
+    def receipt(self):
+        """Read the success modal; the step value is [receipt number, '$total']."""
+        self.steps.append(['receipt'])
+        return self
+
+    def totals(self):
+        """Read the cart; the step value is [subtotal, tax, total] texts."""
+        self.steps.append(['totals'])
+        return self
+
+    def close(self):
+        """Close the success modal."""
+        self.steps.append(['close'])
+        return self
+
+    def run(self):
+        """
+        Execute all steps in one script call.
+
+        Returns:
+            One value per step (None for steps that only click)
+
+        Raises:
+            BatchStepError: A step failed; earlier steps have run and their
+                values are on the exception
+        """
+        outcome = self.page.execute_script(RUN_ACTIONS_SCRIPT, self.steps)
+        if outcome['failed'] is not None:
+            index = outcome['failed']
+            raise BatchStepError(index, self.steps[index], outcome['error'], outcome['results'])
+        return outcome['results']
@@ -3,9 +3,79 @@ NardPOS UI Automation - POS Page Object
 Handles Point of Sale page interactions.
 """
 
+from datetime import datetime, timedelta
 from selenium.webdriver.common.by import By
+from utils.scale import sale_record
 from .base_page import BasePage
-import time
+from .pos_actions import POSActions
+from .sales_history_page import SalesHistoryPage
+
+
+# Products are sent in chunks to keep each script payload small
+CATALOG_CHUNK_SIZE = 2000
+
+# Appends to the app's `products` array; renders the grid on the last chunk
+LOAD_PRODUCTS_SCRIPT = """
+var incoming = arguments[0];
+for (var i = 0; i < incoming.length; i++) {
+    products.push(incoming[i]);
+}
+if (arguments[1]) {
+    renderProducts();
+}
+return products.length;
+"""
+
+# Looks a product up in the app's catalog by id or exact name
+FIND_PRODUCT_SCRIPT = """
+var id = arguments[0];
+var name = arguments[1];
+var product = products.find(function (p) {
+    return id !== null ? p.id === id : p.name === name;
+});
+if (!product) {
+    return null;
+}
+return {
+    id: product.id,
+    name: product.name,
+    price: product.price,
+    rendered: document.getElementById('product-' + product.id) !== null
+};
+"""
+
+# Replays each cart ([op, id, op, id, ...]; 0 add, 1 +1, 2 -1, 3 remove)
+# through the app's own handlers from an empty cart and reads the rendered
+# totals. Leaves the cart empty.
+PRICE_CARTS_SCRIPT = """
+var carts = arguments[0];
+var subtotal = document.getElementById('subtotal');
+var tax = document.getElementById('tax');
+var total = document.getElementById('total');
+var results = [];
+for (var c = 0; c < carts.length; c++) {
+    var operations = carts[c];
+    cart = [];
+    updateCart();
+    for (var i = 0; i < operations.length; i += 2) {
+        var id = operations[i + 1];
+        switch (operations[i]) {
+            case 0: addToCart(id); break;
+            case 1: updateQuantity(id, 1); break;
+            case 2: updateQuantity(id, -1); break;
+            case 3: removeFromCart(id); break;
+        }
+    }
+    results.push([subtotal.textContent, tax.textContent, total.textContent]);
+}
+cart = [];
+updateCart();
+return results;
+"""
+
+COUNT_PRODUCTS_SCRIPT = (
+    "return document.getElementById('productsGrid').getElementsByClassName('product-card').length;"
+)
 
 
 class POSPage(BasePage):
@@ -46,17 +116,19 @@ class POSPage(BasePage):
     RECEIPT_TOTAL = (By.ID, "receiptTotal")
     CLOSE_MODAL_BUTTON = (By.ID, "closeModal")
     
-    def __init__(self, driver):
+    # Rebuilt through innerHTML by updateCart()
+    NON_CACHEABLE = frozenset({CART_ITEM, EMPTY_CART})
+    
+    # Random per sale
+    VISUAL_MASKS = (RECEIPT_NUMBER,)
+    
+    def __init__(self, driver, cache_elements=False):
         """Initialize POS page."""
-        super().__init__(driver)
+        super().__init__(driver, cache_elements=cache_elements)
     
     def is_dashboard_displayed(self):
         """Check if dashboard is displayed after login."""
-        try:
-            element = self.wait_for_element(self.DASHBOARD, timeout=10)
-            return element.is_displayed()
-        except:
-            return False
+        return self.is_displayed(self.DASHBOARD, timeout=10)
     
     def get_welcome_username(self):
         """Get the username displayed in welcome message."""
@@ -83,8 +155,46 @@ class POSPage(BasePage):
     
     def get_product_count(self):
         """Get the number of products displayed."""
-        products = self.find_elements(self.PRODUCT_CARDS)
-        return len(products)
+        return self.execute_script(COUNT_PRODUCTS_SCRIPT)
+    
+    def find_product(self, name=None, product_id=None):
+        """
+        Look a product up without fetching the product cards.
+        
+        Args:
+            name: Exact product name
+            product_id: Product id (takes precedence over name)
+            
+        Returns:
+            Dict with id, name, price and rendered (card present), or None
+        """
+        if name is None and product_id is None:
+            raise ValueError("Pass a product name or product_id")
+        return self.execute_script(FIND_PRODUCT_SCRIPT, product_id, name)
+    
+    def get_catalog(self):
+        """Return the app's catalog as dicts with id, name and price."""
+        return self.execute_script(
+            "return products.map(function (p) { return {id: p.id, name: p.name, price: p.price}; });"
+        )
+    
+    def load_catalog(self, products):
+        """
+        Add products to the app's catalog and re-render the grid.
+        
+        Args:
+            products: Dicts with id, name, price and icon (see utils.scale)
+            
+        Returns:
+            Catalog size afterwards
+        """
+        size = None
+        for start in range(0, max(len(products), 1), CATALOG_CHUNK_SIZE):
+            chunk = products[start:start + CATALOG_CHUNK_SIZE]
+            is_last = start + CATALOG_CHUNK_SIZE >= len(products)
+            size = self.execute_script(LOAD_PRODUCTS_SCRIPT, chunk, is_last)
+        self.clear_element_cache()
+        return size
     
     def add_product_to_cart(self, product_id):
         """
@@ -94,8 +204,8 @@ class POSPage(BasePage):
             product_id: The ID of the product (1-8)
         """
         product_locator = (By.ID, f"product-{product_id}")
-        self.click(product_locator)
-        time.sleep(0.3)  # Wait for cart update animation
+        with self.expect_dom_change(self.CART_ITEMS, self.TOTAL):
+            self.click(product_locator)
         return self
     
     def add_product_by_index(self, index):
@@ -107,8 +217,8 @@ class POSPage(BasePage):
         """
         products = self.find_elements(self.PRODUCT_CARDS)
         if index < len(products):
-            products[index].click()
-            time.sleep(0.3)
+            with self.expect_dom_change(self.CART_ITEMS, self.TOTAL):
+                products[index].click()
         return self
     
     def get_cart_item_count(self):
@@ -117,8 +227,24 @@ class POSPage(BasePage):
         return len(items)
     
     def is_cart_empty(self):
-        """Check if cart is empty."""
-        return self.is_displayed(self.EMPTY_CART, timeout=2)
+        """Check if cart is empty (answers once the page has settled)."""
+        return self.settled_state(self.EMPTY_CART)[1]
+    
+    def price_carts(self, carts, batch_size=1000):
+        """
+        Run encoded carts through the app's cart handlers in batches.
+        
+        Args:
+            carts: Flat [op, id, ...] lists (see utils.pricing.page_carts)
+            batch_size: Carts per script call
+            
+        Returns:
+            [subtotal, tax, total] texts per cart, e.g. ['$3.00', '$0.30', '$3.30']
+        """
+        rendered = []
+        for start in range(0, len(carts), batch_size):
+            rendered.extend(self.execute_script(PRICE_CARTS_SCRIPT, carts[start:start + batch_size]))
+        return rendered
     
     def get_subtotal(self):
         """Get the subtotal amount."""
@@ -149,23 +275,17 @@ class POSPage(BasePage):
     
     def click_checkout(self):
         """Click the checkout button to complete sale."""
-        self.click(self.CHECKOUT_BUTTON)
-        time.sleep(0.5)  # Wait for modal animation
+        with self.expect_dom_change(self.SUCCESS_MODAL):
+            self.click(self.CHECKOUT_BUTTON)
         return self
     
     def is_checkout_enabled(self):
         """Check if checkout button is enabled."""
-        button = self.find_element(self.CHECKOUT_BUTTON)
-        return not button.get_attribute('disabled')
+        return not self.get_element_attribute(self.CHECKOUT_BUTTON, 'disabled')
     
     def is_success_modal_displayed(self):
         """Check if success modal is displayed."""
-        try:
-            element = self.wait_for_element(self.SUCCESS_MODAL, timeout=5)
-            style = element.get_attribute('style')
-            return 'flex' in style or 'block' in style
-        except:
-            return False
+        return self.is_displayed(self.SUCCESS_MODAL, timeout=5)
     
     def get_receipt_number(self):
         """Get the receipt number from success modal."""
@@ -181,21 +301,80 @@ class POSPage(BasePage):
     
     def close_success_modal(self):
         """Close the success modal."""
-        self.click(self.CLOSE_MODAL_BUTTON)
-        time.sleep(0.3)
+        with self.expect_dom_change(self.SUCCESS_MODAL):
+            self.click(self.CLOSE_MODAL_BUTTON)
         return self
     
-    def create_sale_with_products(self, product_ids, payment_method='cash'):
+    def seed_sales(self, count=None, sales=None, payment_method='cash', total=1.65,
+                   items=(('Coca-Cola 330ml', 1),), receipt_prefix='RCP-SEED',
+                   newest=None, interval=timedelta(minutes=1), replace=False):
+        """
+        Insert prior sales straight into the history, skipping checkout.
+        
+        Every sale is built in Python and sent in one batched script call
+        (chunked above 5000 sales), so tests that only check history
+        rendering or search can start from any history size. Seeded sales
+        go in front of the existing history, as new checkouts do.
+        
+        Args:
+            count: Number of sales built entirely from the defaults below
+            sales: Explicit sales as dicts with any of receipt_number, date
+                (datetime), items ([(name, quantity)]), total, payment_method
+                and status; missing keys use the defaults
+            payment_method: Default payment ('cash', 'card', 'mobile')
+            total: Default sale total
+            items: Default line items as (name, quantity) pairs
+            receipt_prefix: Default receipts are <prefix>-000001, -000002, ...
+                numbered on from the sales already in the history
+            newest: Date of the first sale (defaults to now); each following
+                sale is `interval` older. Keep it after the existing sales so
+                the history stays newest first
+            replace: Drop the existing history instead of appending to it
+            
+        Returns:
+            Receipt numbers of the seeded sales, in history order
+        """
+        if sales is None:
+            sales = [{}] * (count or 0)
+        newest = newest or datetime.now().replace(microsecond=0)
+        history_page = SalesHistoryPage(self.driver)
+        # Repeated calls in one test must not reuse receipt numbers
+        first_number = 1 if replace else history_page.get_history_size() + 1
+        records = []
+        for index, sale in enumerate(sales):
+            records.append(sale_record(
+                sale.get('receipt_number', f"{receipt_prefix}-{first_number + index:06d}"),
+                sale.get('date', newest - index * interval),
+                sale.get('items', items),
+                sale.get('total', total),
+                sale.get('payment_method', payment_method),
+                sale.get('status', 'Completed'),
+            ))
+        history_page.load_history(records, replace=replace, prepend=True)
+        return [record['receiptNumber'] for record in records]
+    
+    def actions(self):
+        """Start a batch of actions that runs in one round-trip (see POSActions)."""
+        return POSActions(self)
+    
+    def create_sale_with_products(self, product_ids, payment_method='cash', batched=False):
         """
         Complete flow to create a sale with specified products.
         
         Args:
             product_ids: List of product IDs to add
             payment_method: Payment method ('cash', 'card', 'mobile')
+            batched: Run the whole flow in one script call instead of
+                separate WebDriver clicks and reads
             
         Returns:
             Receipt number from the completed sale
         """
+        if batched:
+            results = (self.actions().add(*product_ids).payment(payment_method)
+                       .checkout().receipt().close().run())
+            return results[-2][0]
+        
         # Add products to cart
         for product_id in product_ids:
             self.add_product_to_cart(product_id)
@@ -2,50 +2,217 @@
 NardPOS UI Automation - Sales History Page Object
 """
 
+from collections import namedtuple
 from selenium.webdriver.common.by import By
 from .base_page import BasePage
 
 
+SALE_FIELDS = ('receipt_number', 'date', 'items', 'total', 'payment', 'status')
+
+# Compact, immutable record for streamed rows
+SaleRow = namedtuple('SaleRow', SALE_FIELDS)
+
+# Sales are sent in chunks to keep each script payload small
+HISTORY_CHUNK_SIZE = 5000
+
+# Reads every sale row as a list of cell texts in a single round-trip
+GET_ALL_SALES_SCRIPT = """
+var rows = document.querySelectorAll('#salesTableBody tr.sale-row');
+var sales = [];
+for (var i = 0; i < rows.length; i++) {
+    var cells = rows[i].cells;
+    if (cells.length < 6) {
+        continue;
+    }
+    var values = [];
+    for (var j = 0; j < 6; j++) {
+        values.push(cells[j].textContent.trim());
+    }
+    sales.push(values);
+}
+return sales;
+"""
+
+# Looks a single row up through its data-receipt attribute
+FIND_SALE_SCRIPT = """
+var row = document.querySelector(
+    '#salesTableBody tr.sale-row[data-receipt="' + CSS.escape(arguments[0]) + '"]'
+);
+if (!row || row.cells.length < 6) {
+    return null;
+}
+var values = [];
+for (var j = 0; j < 6; j++) {
+    values.push(row.cells[j].textContent.trim());
+}
+return values;
+"""
+
+COUNT_SALES_SCRIPT = "return document.querySelectorAll('#salesTableBody tr.sale-row').length;"
+
+# Size of the app's salesHistory array, including rows not rendered yet
+HISTORY_SIZE_SCRIPT = "return salesHistory.length;"
+
+# Reads rows [offset, offset + count) of the table body.
+# Returns [next offset, total row count, list of cell-text lists].
+READ_SALES_CHUNK_SCRIPT = """
+var rows = document.getElementById('salesTableBody').rows;
+var start = arguments[0];
+var end = Math.min(rows.length, start + arguments[1]);
+var chunk = [];
+for (var i = start; i < end; i++) {
+    var cells = rows[i].cells;
+    if (cells.length < 6) {
+        continue;
+    }
+    var values = [];
+    for (var j = 0; j < 6; j++) {
+        values.push(cells[j].textContent.trim());
+    }
+    chunk.push(values);
+}
+return [end, rows.length, chunk];
+"""
+
+# Replaces, prepends to or appends to the app's salesHistory array;
+# re-renders the table on the last chunk when the history page is showing
+LOAD_HISTORY_SCRIPT = """
+var incoming = arguments[0], mode = arguments[1];
+if (mode === 'replace') {
+    salesHistory = [];
+}
+if (mode === 'prepend') {
+    salesHistory = incoming.concat(salesHistory);
+} else {
+    for (var i = 0; i < incoming.length; i++) {
+        salesHistory.push(incoming[i]);
+    }
+}
+// The page is hidden by the .sales-history stylesheet rule, not inline style
+var historyPage = document.getElementById('historyPage');
+if (arguments[2] && getComputedStyle(historyPage).display !== 'none') {
+    renderSalesHistory();
+}
+return salesHistory.length;
+"""
+
+
 class SalesHistoryPage(BasePage):
     """Page object for Sales History page."""
-    
+
     HISTORY_PAGE = (By.ID, "historyPage")
     HISTORY_TAB = (By.ID, "historyTab")
     SALES_TABLE_BODY = (By.ID, "salesTableBody")
     SALE_ROWS = (By.CLASS_NAME, "sale-row")
-    
-    def __init__(self, driver):
-        super().__init__(driver)
-    
+    SALE_RECEIPT_CELLS = (By.CSS_SELECTOR, "#salesTableBody .sale-row td:nth-child(1)")
+    SALE_DATE_CELLS = (By.CSS_SELECTOR, "#salesTableBody .sale-row td:nth-child(2)")
+
+    # Rebuilt through innerHTML by renderSalesHistory()
+    NON_CACHEABLE = frozenset({SALE_ROWS})
+
+    # Receipt numbers are random and dates are the time of the sale
+    VISUAL_MASKS = (SALE_RECEIPT_CELLS, SALE_DATE_CELLS)
+
+    def __init__(self, driver, use_cache=False, cache_elements=False):
+        """
+        Initialize sales history page.
+
+        Args:
+            driver: WebDriver instance
+            use_cache: Keep the scraped table and receipt index between calls,
+                invalidated whenever the table body re-renders
+            cache_elements: Reuse element handles (see BasePage)
+        """
+        super().__init__(driver, cache_elements=cache_elements)
+        self.use_cache = use_cache
+        self._cache_key = None
+        self._sales = None
+        self._index = None
+
     def navigate_to_history(self):
         self.click(self.HISTORY_TAB)
         return self
-    
+
     def get_sales_count(self):
-        rows = self.find_elements(self.SALE_ROWS)
-        return len(rows)
-    
+        if self.use_cache:
+            return len(self._load_sales())
+        return self.execute_script(COUNT_SALES_SCRIPT)
+
     def get_all_sales(self):
-        sales = []
-        rows = self.find_elements(self.SALE_ROWS)
-        for row in rows:
-            cells = row.find_elements(By.TAG_NAME, "td")
-            if len(cells) >= 6:
-                sales.append({
-                    'receipt_number': cells[0].text,
-                    'date': cells[1].text,
-                    'items': cells[2].text,
-                    'total': cells[3].text,
-                    'payment': cells[4].text,
-                    'status': cells[5].text
-                })
-        return sales
-    
+        if self.use_cache:
+            return list(self._load_sales())
+        return [dict(zip(SALE_FIELDS, values))
+                for values in self.execute_script(GET_ALL_SALES_SCRIPT)]
+
     def find_sale_by_receipt(self, receipt_number):
-        for sale in self.get_all_sales():
-            if receipt_number in sale['receipt_number']:
-                return sale
-        return None
-    
+        if self.use_cache:
+            self._load_sales()
+            return self._index.get(receipt_number)
+        values = self.execute_script(FIND_SALE_SCRIPT, receipt_number)
+        return dict(zip(SALE_FIELDS, values)) if values else None
+
+    def iter_sales(self, chunk_size=500):
+        """
+        Stream sale rows in table order, `chunk_size` rows per round-trip.
+
+        Yields:
+            SaleRow tuples
+        """
+        offset = 0
+        while True:
+            offset, total, chunk = self.execute_script(READ_SALES_CHUNK_SCRIPT, offset, chunk_size)
+            for values in chunk:
+                yield SaleRow(*values)
+            if offset >= total:
+                return
+
+    def load_history(self, sales, replace=True, prepend=False):
+        """
+        Put pre-built sales into the app's history.
+
+        Args:
+            sales: salesHistory entries, newest first (see utils.scale.sale_record)
+            replace: Drop the existing history first; otherwise append after it
+            prepend: Without replace, put the sales in front of the existing
+                history instead, like the app's own checkouts
+
+        Returns:
+            History size afterwards
+        """
+        starts = list(range(0, max(len(sales), 1), HISTORY_CHUNK_SIZE))
+        if prepend and not replace:
+            # Last chunk first, so the chunks keep their order in front
+            starts.reverse()
+            modes = ['prepend'] * len(starts)
+        else:
+            modes = ['replace' if replace else 'append'] + ['append'] * (len(starts) - 1)
+        size = None
+        for number, (start, mode) in enumerate(zip(starts, modes)):
+            chunk = sales[start:start + HISTORY_CHUNK_SIZE]
+            size = self.execute_script(LOAD_HISTORY_SCRIPT, chunk, mode, number == len(starts) - 1)
+        return size
+
+    def get_history_size(self):
+        """Number of sales in the app's history, rendered or not."""
+        return self.execute_script(HISTORY_SIZE_SCRIPT)
+
     def is_sale_in_history(self, receipt_number):
         return self.find_sale_by_receipt(receipt_number) is not None
+
+    def invalidate_cache(self):
+        """Drop cached sales so the next lookup re-reads the table."""
+        self._cache_key = None
+        self._sales = None
+        self._index = None
+        return self
+
+    def _load_sales(self):
+        """Return cached sales, re-reading the table only after it re-rendered."""
+        snapshot = self.observe_dom(self.SALES_TABLE_BODY)
+        key = (snapshot['token'], tuple(sorted(snapshot['versions'].items())))
+        if key != self._cache_key:
+            self._sales = [dict(zip(SALE_FIELDS, values))
+                           for values in self.execute_script(GET_ALL_SALES_SCRIPT)]
+            self._index = {sale['receipt_number']: sale for sale in self._sales}
+            self._cache_key = key
+        return self._sales
@@ -0,0 +1,125 @@
+"""
+NardPOS API Automation - Postman Collection Suite
+Runs postman_collection.json natively: each collection request is a pytest item.
+"""
+
+import os
+import subprocess
+import sys
+import pytest
+from utils.loadgen import LoadGenerator, parse_budget
+from utils.mock_server import NardPOSServer
+from utils.postman import (
+    CHAINED_URLS, EXTRA_CAPTURES, CollectionRunner, load_collection, load_environment, use_variables
+)
+
+SUITE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SUITE_DIR)
+COLLECTION_PATH = os.path.join(PROJECT_ROOT, 'postman_collection.json')
+ENVIRONMENT_PATH = os.path.join(PROJECT_ROOT, '.env.json')
+
+POSTMAN_REQUESTS, COLLECTION_VARIABLES = load_collection(COLLECTION_PATH)
+# Get Sale by ID reads back the sale this run created
+POSTMAN_REQUESTS = use_variables(POSTMAN_REQUESTS, CHAINED_URLS)
+
+# Load smoke test settings (see utils/loadgen.py for full load runs)
+LOAD_CONCURRENCY = int(os.getenv('LOAD_CONCURRENCY', 4))
+LOAD_ITERATIONS = int(os.getenv('LOAD_ITERATIONS', 10))
+LOAD_BUDGETS = [parse_budget(rule) for rule in os.getenv('LOAD_BUDGETS', 'p95=250').split(',') if rule]
+# Shared CI runners are too noisy for a latency gate; CI only reports violations
+LOAD_FAIL_ON_BUDGET = os.getenv('LOAD_FAIL_ON_BUDGET', 'true').lower() == 'true'
+
+
+@pytest.fixture(scope="module")
+def collection_results(api_base_url):
+    """Run the whole collection once, concurrently where dependencies allow."""
+    variables = dict(COLLECTION_VARIABLES)
+    variables.update(load_environment(ENVIRONMENT_PATH))
+    # Tokens must come from this run's login, not a stale export
+    variables.pop('access_token', None)
+    variables.pop('refresh_token', None)
+    if api_base_url:
+        variables['base_url'] = api_base_url
+
+    runner = CollectionRunner(POSTMAN_REQUESTS, variables, captures=EXTRA_CAPTURES)
+    try:
+        yield runner.run()
+    finally:
+        runner.close()
+
+
+@pytest.mark.api
+@pytest.mark.parametrize(
+    'postman_request', POSTMAN_REQUESTS, ids=[request.name for request in POSTMAN_REQUESTS]
+)
+def test_collection_request(collection_results, postman_request, record_property):
+    """Check one collection request's status, captures and response time."""
+    result = collection_results[postman_request.name]
+    record_property('latency_ms', round(result.latency_ms, 2))
+    print(f"\n{result.method} {result.url} -> {result.status} in {result.latency_ms:.1f}ms")
+
+    assert result.error is None, f"Request failed: {result.error}"
+    if postman_request.expected_status is not None:
+        assert result.status == postman_request.expected_status, \
+            f"Expected {postman_request.expected_status}, got {result.status}: {result.text}"
+    else:
+        assert 200 <= result.status < 300, f"Expected 2xx, got {result.status}: {result.text}"
+    assert not result.missing_captures, \
+        f"Response is missing {', '.join(result.missing_captures)}"
+    if postman_request.max_response_ms is not None:
+        assert result.latency_ms < postman_request.max_response_ms
+
+
+@pytest.mark.api
+def test_created_sale_is_fetched_by_id(collection_results):
+    """Get Sale by ID reads back the sale Create Sale returned, not a fixture id."""
+    created = collection_results['Create Sale - Valid Payload']
+    fetched = collection_results['Get Sale by ID - Valid ID']
+
+    assert created.status == 201, f"Create Sale failed: {created.text}"
+    assert fetched.url.endswith(f"/sales/{created.json['id']}")
+    assert fetched.json == created.json
+
+
+@pytest.mark.api
+def test_suite_runs_with_cache_plugin_disabled():
+    """The duration scheduler copes with -p no:cacheprovider (no config.cache)."""
+    env = dict(os.environ, RESULTS_STORE='false')
+    result = subprocess.run(
+        [sys.executable, '-m', 'pytest', '-q', '-p', 'no:cacheprovider', '-p', 'no:xdist',
+         'test_nardpos_api.py', '-k', 'Login'],
+        cwd=SUITE_DIR, env=env, capture_output=True, text=True, timeout=120,
+    )
+
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+@pytest.fixture(scope="function")
+def load_target():
+    """API_BASE_URL if set, else a private mock server so load runs offline."""
+    if os.getenv('API_BASE_URL'):
+        yield os.getenv('API_BASE_URL')
+        return
+    server = NardPOSServer().start()
+    yield server.url
+    server.stop()
+
+
+@pytest.mark.api
+@pytest.mark.load
+def test_checkout_load_within_budget(load_target, record_property):
+    """Closed-loop checkout load stays error-free; LOAD_BUDGETS gate it if LOAD_FAIL_ON_BUDGET."""
+    generator = LoadGenerator(load_target, concurrency=LOAD_CONCURRENCY)
+    try:
+        stats = generator.run_closed(iterations=LOAD_ITERATIONS)
+    finally:
+        generator.close()
+    print(f"\n{stats.format_report()}")
+
+    assert not stats.errors, f"Unexpected responses: {stats.errors}"
+    violations = stats.check_budgets(LOAD_BUDGETS)
+    record_property('load_budget_violations', violations)
+    for violation in violations:
+        print(f"BUDGET EXCEEDED - {violation}")
+    if LOAD_FAIL_ON_BUDGET:
+        assert not violations, '\n'.join(violations)
@@ -5,9 +5,18 @@ Tests the complete POS flow: Login -> Create Sale -> Verify in History
 
 import pytest
 import os
+from datetime import datetime
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
 from pages.login_page import LoginPage
+from pages.pos_actions import BatchStepError
 from pages.pos_page import POSPage
 from pages.sales_history_page import SalesHistoryPage
+from utils import pricing
+
+# Randomized carts checked against the pricing reference model
+PRICING_CARTS = int(os.getenv('PRICING_CARTS', 2000))
+PRICING_SEED = int(os.getenv('PRICING_SEED', 0)) or None
 
 
 class TestNardPOSEndToEnd:
@@ -51,7 +60,7 @@ class TestNardPOSEndToEnd:
         
         # Verify cart has items
         assert pos_page.get_cart_item_count() == 2, "Cart should have 2 items"
-        assert not pos_page.is_cart_empty(), "Cart should not be empty"
+        pos_page.assert_absent(POSPage.EMPTY_CART, "Cart should not be empty")
         
         # Step 3: Complete checkout
         pos_page.select_payment_cash()
@@ -64,6 +73,7 @@ class TestNardPOSEndToEnd:
         assert receipt_number.startswith('RCP-'), f"Receipt should start with RCP-, got: {receipt_number}"
         
         pos_page.close_success_modal()
+        pos_page.assert_hidden(POSPage.SUCCESS_MODAL, "Success modal should close")
         
         # Step 4: Navigate to Sales History
         history_page.navigate_to_history()
@@ -96,6 +106,7 @@ class TestLogin:
         login_page.login(test_credentials['username'], test_credentials['password'])
         
         assert pos_page.is_dashboard_displayed()
+        login_page.assert_hidden(LoginPage.LOGIN_ERROR, "No login error should be shown")
         screenshot('login_success')
     
     @pytest.mark.regression
@@ -125,13 +136,9 @@ class TestPOS:
     """Test suite for POS functionality."""
     
     @pytest.mark.regression
-    def test_add_products_to_cart(self, driver, base_url, test_credentials, screenshot):
+    def test_add_products_to_cart(self, authenticated_pos, screenshot):
         """Test adding products to cart."""
-        login_page = LoginPage(driver)
-        pos_page = POSPage(driver)
-        
-        driver.get(base_url)
-        login_page.login(test_credentials['username'], test_credentials['password'])
+        pos_page = authenticated_pos
         
         # Add products
         pos_page.add_product_to_cart(1)
@@ -139,35 +146,113 @@ class TestPOS:
         pos_page.add_product_to_cart(3)
         
         assert pos_page.get_cart_item_count() == 3
+        pos_page.assert_absent(POSPage.EMPTY_CART)
         assert pos_page.is_checkout_enabled()
         screenshot('cart_with_products')
     
     @pytest.mark.regression
-    def test_checkout_button_disabled_empty_cart(self, driver, base_url, test_credentials):
+    @pytest.mark.command_budget(max_commands=20)
+    def test_checkout_button_disabled_empty_cart(self, authenticated_pos):
         """Test checkout button is disabled with empty cart."""
-        login_page = LoginPage(driver)
-        pos_page = POSPage(driver)
-        
-        driver.get(base_url)
-        login_page.login(test_credentials['username'], test_credentials['password'])
+        pos_page = authenticated_pos
         
         assert pos_page.is_cart_empty()
         assert not pos_page.is_checkout_enabled()
+    
+    @pytest.mark.regression
+    @pytest.mark.command_budget(max_commands=20)
+    def test_batched_sale_with_twenty_items(self, authenticated_pos):
+        """Test a 20-item sale run as one batched script call."""
+        pos_page = authenticated_pos
+        product_ids = [1, 2, 3, 4, 5] * 4
+        
+        results = (pos_page.actions()
+                   .add(*product_ids).quantity(5, -2).payment('card')
+                   .totals().checkout().receipt().close()
+                   .run())
+        subtotal, tax, total = results[-4]
+        receipt_number, receipt_total = results[-2]
+        
+        assert results[:5] == [1, 1, 1, 1, 1]
+        assert results[len(product_ids)] == 2
+        assert subtotal == '$28.98'
+        assert receipt_total == total
+        assert receipt_number.startswith('RCP-')
+        assert pos_page.is_cart_empty()
+    
+    @pytest.mark.regression
+    def test_batched_actions_report_failed_step(self, authenticated_pos):
+        """Test a failing batched step is reported with the steps before it."""
+        pos_page = authenticated_pos
+        
+        with pytest.raises(BatchStepError, match='checkout button is disabled') as error:
+            pos_page.actions().add(1).remove(1).checkout().run()
+        
+        assert error.value.index == 2
+        assert error.value.results == [1, 0]
+
+
+class TestElementCache:
+    """Element handle cache (CACHE_ELEMENTS) against re-rendered nodes."""
+    
+    # Cacheable on purpose: the line is rebuilt by every cart update
+    FIRST_LINE_PRICE = (By.CSS_SELECTOR, "#cartItems .cart-item .item-price")
+    
+    @pytest.mark.regression
+    def test_stale_cached_element_is_re_resolved(self, driver, authenticated_pos):
+        """Test a cached handle whose node was re-rendered is looked up again."""
+        pos_page = POSPage(driver, cache_elements=True)
+        pos_page.add_product_to_cart(1)
+        
+        assert pos_page.get_text(self.FIRST_LINE_PRICE).endswith('x 1')
+        cached = pos_page.find_element(self.FIRST_LINE_PRICE)
+        
+        pos_page.add_product_to_cart(1)
+        
+        with pytest.raises(StaleElementReferenceException):
+            cached.text
+        assert pos_page.get_text(self.FIRST_LINE_PRICE).endswith('x 2')
+        assert pos_page.find_element(self.FIRST_LINE_PRICE) != cached
+
+
+class TestCartPricing:
+    """Cart math checked against utils.pricing."""
+    
+    @pytest.mark.regression
+    def test_randomized_carts_match_reference_model(self, authenticated_pos):
+        """
+        Test Case: Rendered subtotal, tax and total for randomized carts
+        
+        Steps:
+        1. Generate PRICING_CARTS carts of adds, +1/-1 and removes
+        2. Replay them through the app's handlers in batched script calls
+        3. Compare #subtotal, #tax and #total with the reference model
+        """
+        seed = PRICING_SEED or int.from_bytes(os.urandom(4), 'little')
+        catalog = authenticated_pos.get_catalog()
+        product_ids = [product['id'] for product in catalog]
+        batch = pricing.generate_carts(PRICING_CARTS, len(catalog), seed=seed)
+        
+        expected = pricing.expected_display(batch, [product['price'] for product in catalog])
+        rendered = authenticated_pos.price_carts(pricing.page_carts(batch, product_ids))
+        
+        mismatches = pricing.compare(batch, product_ids, expected, rendered)
+        assert not mismatches, (
+            f"{len(mismatches)}/{PRICING_CARTS} carts priced differently (PRICING_SEED={seed}); "
+            f"first: {mismatches[0]}"
+        )
+        assert authenticated_pos.is_cart_empty()
 
 
 class TestSalesHistory:
     """Test suite for Sales History functionality."""
     
     @pytest.mark.regression
-    def test_sale_appears_in_history(self, driver, base_url, test_credentials, screenshot):
+    def test_sale_appears_in_history(self, driver, authenticated_pos, screenshot):
         """Test that completed sale appears in history."""
-        login_page = LoginPage(driver)
-        pos_page = POSPage(driver)
+        pos_page = authenticated_pos
         history_page = SalesHistoryPage(driver)
         
-        driver.get(base_url)
-        login_page.login(test_credentials['username'], test_credentials['password'])
-        
         # Create a sale
         receipt = pos_page.create_sale_with_products([1, 4], 'card')
         
@@ -176,3 +261,71 @@ class TestSalesHistory:
         
         assert history_page.is_sale_in_history(receipt)
         screenshot('sale_in_history')
+    
+    @pytest.mark.regression
+    def test_cached_history_picks_up_new_sale(self, driver, authenticated_pos):
+        """Test the cached history re-reads the table once it re-renders."""
+        pos_page = authenticated_pos
+        history_page = SalesHistoryPage(driver, use_cache=True)
+        first_receipt = pos_page.create_sale_with_products([1], 'cash')
+        
+        history_page.navigate_to_history()
+        first_read = history_page.get_all_sales()
+        second_read = history_page.get_all_sales()
+        
+        # Unchanged table: served from the cache, not scraped again
+        assert second_read[0] is first_read[0]
+        assert history_page.is_sale_in_history(first_receipt)
+        
+        pos_page.click_pos_tab()
+        second_receipt = pos_page.create_sale_with_products([2, 3], 'card')
+        history_page.navigate_to_history()
+        
+        # No invalidate_cache(): the re-render alone makes the next read fresh
+        assert history_page.get_sales_count() == len(first_read) + 1
+        assert history_page.is_sale_in_history(second_receipt)
+        assert history_page.find_sale_by_receipt(first_receipt) is not None
+    
+    @pytest.mark.regression
+    def test_seeded_history_renders_and_searches(self, driver, seed_sales):
+        """Test history rendering and receipt search against seeded sales."""
+        history_page = SalesHistoryPage(driver)
+        
+        # Oldest first: each call goes in front of the history
+        seed_sales(sales=[{
+            'receipt_number': 'RCP-20250102-9999',
+            'date': datetime(2025, 1, 2, 14, 5, 9),
+            'items': [('Coffee', 2), ('Apple', 1)],
+            'total': 6.33,
+            'payment_method': 'mobile',
+        }])
+        receipts = seed_sales(200)
+        
+        history_page.navigate_to_history()
+        
+        assert history_page.get_sales_count() == 201
+        assert history_page.is_sale_in_history(receipts[0])
+        assert history_page.is_sale_in_history(receipts[-1])
+        sale = history_page.find_sale_by_receipt('RCP-20250102-9999')
+        assert sale == {
+            'receipt_number': 'RCP-20250102-9999',
+            'date': '1/2/2025, 2:05:09 PM',
+            'items': '3 items',
+            'total': '$6.33',
+            'payment': 'Mobile',
+            'status': 'Completed',
+        }
+    
+    @pytest.mark.regression
+    def test_seeding_twice_keeps_receipts_unique_and_newest_first(self, driver, seed_sales):
+        """Test that a second seed_sales() call numbers on and lands in front."""
+        history_page = SalesHistoryPage(driver)
+        
+        older = seed_sales(3, newest=datetime(2025, 1, 1, 12, 0))
+        newer = seed_sales(2)
+        history_page.navigate_to_history()
+        
+        assert len(set(older + newer)) == 5
+        receipts = [sale['receipt_number'] for sale in history_page.get_all_sales()]
+        assert receipts[:5] == newer + older
+        assert history_page.find_sale_by_receipt(newer[-1]) is not None
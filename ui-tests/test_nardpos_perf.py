@@ -0,0 +1,177 @@
+"""
+NardPOS UI Automation - Front-End Performance Suite
+Click-to-render budgets for the cart, checkout and sales history re-renders,
+how page-object lookups scale with catalog and history size, and memory
+growth over a long shift.
+"""
+
+import os
+import time
+import pytest
+from pages.sales_history_page import SalesHistoryPage
+from utils.cashiers import simulate_cashiers
+from utils.parallel import artifact_path
+from utils.soak import run_soak
+
+# p95 click-to-render budget per interaction, in milliseconds
+UI_RENDER_BUDGET_MS = float(os.getenv('UI_RENDER_BUDGET_MS', 200))
+
+# Share of SCALE_PRODUCTS / SCALE_SALES loaded by each benchmark step
+SCALE_STEPS = (0.1, 0.5, 1.0)
+
+
+# Soak settings: cycles in one session, sampling interval and thresholds
+SOAK_MODE = os.getenv('SOAK_MODE', 'false').lower() == 'true'
+SOAK_CYCLES = int(os.getenv('SOAK_CYCLES', 1000))
+SOAK_SAMPLE_EVERY = int(os.getenv('SOAK_SAMPLE_EVERY', 50))
+SOAK_MAX_HEAP_GROWTH_MB = float(os.getenv('SOAK_MAX_HEAP_GROWTH_MB', 50))
+SOAK_MAX_DOM_NODES_PER_CYCLE = float(os.getenv('SOAK_MAX_DOM_NODES_PER_CYCLE', 30))
+SOAK_MAX_LATENCY_DRIFT = float(os.getenv('SOAK_MAX_LATENCY_DRIFT', 3.0))
+SOAK_DIR = os.path.join(os.path.dirname(__file__), 'reports', 'soak')
+
+# Multi-cashier simulation: concurrent browser sessions creating sales
+CASHIER_SIMULATION = os.getenv('CASHIER_SIMULATION', 'false').lower() == 'true'
+CASHIERS = int(os.getenv('CASHIERS', 4))
+CASHIER_SALES = int(os.getenv('CASHIER_SALES', 25))
+CASHIER_FAIL_ON_DUPLICATES = os.getenv('CASHIER_FAIL_ON_DUPLICATES', 'false').lower() == 'true'
+
+
+def _timed(func, *args):
+    """Run func(*args) and return (result, elapsed milliseconds)."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+@pytest.mark.perf
+class TestRenderLatency:
+    """Rendering cost of the innerHTML-driven views."""
+    
+    def test_sale_flow_render_latency(self, ui_metrics, authenticated_pos):
+        """
+        Test Case: Cart, checkout and history render within budget
+        
+        Steps:
+        1. Add products to the cart (addToCart)
+        2. Complete checkout (handleCheckout)
+        3. Open Sales History (renderSalesHistory)
+        4. Assert every interaction's p95 click-to-render latency
+        """
+        for product_id in (1, 2, 3, 1, 2, 3):
+            authenticated_pos.add_product_to_cart(product_id)
+        authenticated_pos.select_payment_cash()
+        authenticated_pos.click_checkout()
+        authenticated_pos.close_success_modal()
+        SalesHistoryPage(authenticated_pos.driver).navigate_to_history()
+        
+        summary = ui_metrics.collect()
+        for name in ('addToCart', 'handleCheckout', 'renderSalesHistory'):
+            assert name in summary['interactions'], f"{name} was not measured"
+        assert summary['interactions']['addToCart']['count'] == 6
+        
+        ui_metrics.assert_budget(max_ms=UI_RENDER_BUDGET_MS, max_long_tasks=0)
+
+
+@pytest.mark.perf
+@pytest.mark.scale
+class TestScale:
+    """Page-object cost at store volume (SCALE_MODE=true)."""
+    
+    @pytest.mark.parametrize("fraction", SCALE_STEPS, ids=lambda fraction: f"x{fraction:g}")
+    def test_lookup_scaling(self, fraction, scale_data, authenticated_pos, record_property):
+        """
+        Test Case: Product and history lookups at growing data sizes
+        
+        Steps:
+        1. Load a slice of the generated catalog and history
+        2. Time get_product_count, find_product, get_all_sales,
+           iter_sales and find_sale_by_receipt
+        3. Verify every lookup returns the seeded data
+        """
+        products = scale_data['products'][:int(len(scale_data['products']) * fraction)]
+        sales = scale_data['sales'][:int(len(scale_data['sales']) * fraction)]
+        history_page = SalesHistoryPage(authenticated_pos.driver)
+        
+        authenticated_pos.load_catalog(products)
+        history_page.navigate_to_history()
+        history_page.load_history(sales)
+        
+        oldest_receipt = sales[-1]['receiptNumber']
+        timings = {}
+        count, timings['get_product_count'] = _timed(authenticated_pos.get_product_count)
+        product, timings['find_product'] = _timed(
+            lambda: authenticated_pos.find_product(name=products[-1]['name'])
+        )
+        all_sales, timings['get_all_sales'] = _timed(history_page.get_all_sales)
+        streamed, timings['iter_sales'] = _timed(lambda: sum(1 for _ in history_page.iter_sales()))
+        found, timings['find_sale_by_receipt'] = _timed(history_page.find_sale_by_receipt, oldest_receipt)
+        
+        record_property('scale_benchmark', {
+            'products': len(products), 'sales': len(sales),
+            **{name: round(ms, 2) for name, ms in timings.items()},
+        })
+        print(f"\n{len(products)} products / {len(sales)} sales: " +
+              ', '.join(f"{name} {ms:.1f}ms" for name, ms in timings.items()))
+        
+        assert count == 8 + len(products)
+        assert product is not None and product['rendered']
+        assert len(all_sales) == streamed == len(sales)
+        assert found is not None and found['receipt_number'] == oldest_receipt
+
+
+@pytest.mark.perf
+@pytest.mark.soak
+@pytest.mark.skipif(not SOAK_MODE, reason="Soak tests run with SOAK_MODE=true")
+class TestSoak:
+    """Memory and latency over a long shift (SOAK_MODE=true)."""
+    
+    def test_checkout_history_soak(self, authenticated_pos, record_property):
+        """
+        Test Case: Heap, DOM size and latency stay bounded over SOAK_CYCLES sales
+        
+        Steps:
+        1. Repeat checkout -> Sales History -> POS tab SOAK_CYCLES times
+        2. Sample heap, DOM nodes and latency every SOAK_SAMPLE_EVERY cycles
+        3. Write the time series to reports/soak/
+        4. Fail if growth or latency drift exceeds the thresholds
+        """
+        recorder = run_soak(authenticated_pos, SOAK_CYCLES, SOAK_SAMPLE_EVERY)
+        
+        csv_path = recorder.write_csv(artifact_path(SOAK_DIR, 'checkout_history', 'csv'))
+        summary = recorder.summary()
+        record_property('soak', summary)
+        print(f"\n🧪 Soak time series: {csv_path}\n{summary}")
+        
+        violations = recorder.check(
+            max_heap_growth_mb=SOAK_MAX_HEAP_GROWTH_MB,
+            max_dom_nodes_per_cycle=SOAK_MAX_DOM_NODES_PER_CYCLE,
+            max_latency_drift=SOAK_MAX_LATENCY_DRIFT,
+        )
+        assert not violations, "Soak thresholds exceeded:\n" + '\n'.join(violations)
+
+
+@pytest.mark.perf
+@pytest.mark.skipif(not CASHIER_SIMULATION, reason="Cashier simulation runs with CASHIER_SIMULATION=true")
+class TestMultiCashier:
+    """Many cashiers checking out at once (CASHIER_SIMULATION=true)."""
+    
+    def test_concurrent_cashiers(self, cashier_factory, base_url, test_credentials, record_property):
+        """
+        Test Case: CASHIERS concurrent sessions complete CASHIER_SALES sales each
+        
+        Steps:
+        1. Launch one browser per cashier and log in
+        2. Create sales concurrently through POSPage
+        3. Report throughput, per-session latency and duplicate receipts
+        4. Fail on duplicates when CASHIER_FAIL_ON_DUPLICATES=true
+        """
+        report = simulate_cashiers(cashier_factory, base_url, test_credentials,
+                                   cashiers=CASHIERS, sales_per_cashier=CASHIER_SALES)
+        
+        record_property('cashier_simulation', report.summary())
+        print("\n" + report.format())
+        
+        assert not report.errors, f"Cashier sessions failed: {report.errors}"
+        assert len(report.receipts) == CASHIERS * CASHIER_SALES
+        if CASHIER_FAIL_ON_DUPLICATES:
+            assert not report.duplicates(), f"Duplicate receipts issued: {report.duplicates()}"
@@ -0,0 +1,205 @@
+"""
+NardPOS UI Automation - Base Page Unit Tests
+Wait and check helpers of BasePage, driven by WebDriver stand-ins.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from selenium.common.exceptions import (
+    NoSuchElementException, StaleElementReferenceException, TimeoutException
+)
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage, locator_to_css
+from pages.login_page import LoginPage
+from pages.pos_page import POSPage
+
+pytestmark = pytest.mark.unit
+
+
+class _SettledDriver:
+    """Driver stub answering SETTLED_STATE_SCRIPT with fixed [present, visible] per selector."""
+    
+    def __init__(self, states, elements=()):
+        self.states = states
+        self.elements = list(elements)
+        self.calls = []
+    
+    def execute_async_script(self, script, selector, quiet, timeout):
+        self.calls.append((selector, quiet))
+        return self.states.get(selector, [False, False])
+    
+    def find_elements(self, by, value):
+        return self.elements
+    
+    def find_element(self, by, value):
+        if not self.elements:
+            raise NoSuchElementException(value)
+        return self.elements[0]
+
+
+class TestNegativeChecks:
+    """BasePage.is_absent/is_hidden/assert_absent/assert_hidden."""
+    
+    EMPTY_CART = (By.CLASS_NAME, 'empty-cart')
+    MODAL = (By.ID, 'successModal')
+    
+    def test_absent_and_hidden_from_settled_state(self):
+        page = BasePage(_SettledDriver({'.empty-cart': [False, False], '#successModal': [True, False]}))
+        
+        assert page.is_absent(self.EMPTY_CART)
+        assert page.is_hidden(self.EMPTY_CART)
+        assert not page.is_absent(self.MODAL)
+        assert page.is_hidden(self.MODAL)
+    
+    def test_checks_wait_for_the_settle_period_once(self):
+        driver = _SettledDriver({})
+        page = BasePage(driver)
+        
+        page.assert_absent(self.EMPTY_CART).assert_hidden(self.MODAL)
+        
+        assert driver.calls == [('.empty-cart', BasePage.SETTLE_MS), ('#successModal', BasePage.SETTLE_MS)]
+    
+    def test_assert_absent_fails_with_message(self):
+        page = BasePage(_SettledDriver({'.empty-cart': [True, True]}))
+        
+        with pytest.raises(AssertionError, match='Cart should not be empty'):
+            page.assert_absent(self.EMPTY_CART, "Cart should not be empty")
+    
+    def test_assert_hidden_fails_for_visible_element(self):
+        page = BasePage(_SettledDriver({'#successModal': [True, True]}))
+        
+        with pytest.raises(AssertionError, match='successModal'):
+            page.assert_hidden(self.MODAL)
+    
+    def test_positive_checks_wait_for_the_element(self):
+        visible = SimpleNamespace(is_displayed=lambda: True)
+        driver = _SettledDriver({}, elements=[visible])
+        
+        assert BasePage(driver).is_displayed(self.MODAL)
+        assert BasePage(driver).is_element_present(self.MODAL)
+        assert not BasePage(_SettledDriver({})).is_displayed(self.MODAL, timeout=0.05)
+        assert driver.calls == []
+    
+    def test_error_and_empty_cart_answer_from_the_settled_page(self):
+        driver = _SettledDriver({'#loginError': [True, True], '.empty-cart': [True, False]})
+        
+        assert LoginPage(driver).is_error_displayed()
+        assert not POSPage(driver).is_cart_empty()
+        assert [selector for selector, _ in driver.calls] == ['#loginError', '.empty-cart']
+    
+    def test_xpath_is_looked_up_once_after_settling(self):
+        visible = SimpleNamespace(is_displayed=lambda: True)
+        page = BasePage(_SettledDriver({}, elements=[visible]))
+        
+        assert not page.is_absent((By.XPATH, '//div'))
+        assert not page.is_hidden((By.XPATH, '//div'))
+
+
+class _Element:
+    """WebElement stub that goes stale once its node is re-rendered."""
+    
+    def __init__(self, text):
+        self._text = text
+        self.stale = False
+    
+    @property
+    def text(self):
+        if self.stale:
+            raise StaleElementReferenceException('node was re-rendered')
+        return self._text
+
+
+class _RenderingDriver:
+    """Driver stub whose find_element returns the currently rendered node."""
+    
+    def __init__(self):
+        self.current = _Element('$1.50 x 1')
+        self.lookups = 0
+    
+    def find_element(self, by, value):
+        self.lookups += 1
+        return self.current
+    
+    def render(self, text):
+        self.current.stale = True
+        self.current = _Element(text)
+
+
+class TestElementCache:
+    """BasePage element cache: reuse and stale re-resolution."""
+    
+    PRICE = (By.CSS_SELECTOR, '.cart-item .item-price')
+    
+    def test_cached_handle_is_reused(self):
+        driver = _RenderingDriver()
+        page = BasePage(driver, cache_elements=True)
+        
+        assert page.get_text(self.PRICE) == page.get_text(self.PRICE) == '$1.50 x 1'
+        assert driver.lookups == 1
+    
+    def test_stale_handle_is_re_resolved(self):
+        driver = _RenderingDriver()
+        page = BasePage(driver, cache_elements=True)
+        page.get_text(self.PRICE)
+        
+        driver.render('$1.50 x 2')
+        
+        assert page.get_text(self.PRICE) == '$1.50 x 2'
+        assert driver.lookups == 2
+        assert page.find_element(self.PRICE) is driver.current
+    
+    def test_non_cacheable_locator_is_always_looked_up(self):
+        driver = _RenderingDriver()
+        page = BasePage(driver, cache_elements=True)
+        page.NON_CACHEABLE = frozenset({self.PRICE})
+        
+        page.get_text(self.PRICE)
+        page.get_text(self.PRICE)
+        
+        assert driver.lookups == 2
+
+
+class _MutationDriver:
+    """Driver stub for the observe/wait mutation scripts."""
+    
+    def __init__(self, changed=True):
+        self.changed = changed
+        self.events = []
+    
+    def execute_script(self, script, selectors):
+        self.events.append(('observe', selectors))
+        return {'token': 'page-1', 'versions': {selector: 0 for selector in selectors}}
+    
+    def execute_async_script(self, script, snapshot, timeout_ms):
+        self.events.append(('wait', timeout_ms))
+        return self.changed
+
+
+class TestDomChangeWaits:
+    """BasePage.expect_dom_change/observe_dom/wait_for_dom_change."""
+    
+    CART_ITEMS = (By.ID, 'cartItems')
+    TOTAL = (By.ID, 'total')
+    
+    def test_observes_before_the_action_and_waits_after(self):
+        driver = _MutationDriver()
+        page = BasePage(driver)
+        
+        with page.expect_dom_change(self.CART_ITEMS, self.TOTAL, timeout=2):
+            driver.events.append(('action', None))
+        
+        assert driver.events == [('observe', ['#cartItems', '#total']), ('action', None), ('wait', 2000)]
+    
+    def test_no_change_raises_timeout_naming_the_elements(self):
+        page = BasePage(_MutationDriver(changed=False))
+        
+        with pytest.raises(TimeoutException, match='#cartItems, #total'):
+            with page.expect_dom_change(self.CART_ITEMS, self.TOTAL, timeout=1):
+                pass
+    
+    def test_locators_are_converted_to_css(self):
+        assert locator_to_css((By.CLASS_NAME, 'sale-row')) == '.sale-row'
+        assert locator_to_css((By.CSS_SELECTOR, '#cartItems .item')) == '#cartItems .item'
+        with pytest.raises(ValueError):
+            locator_to_css((By.XPATH, '//div'))
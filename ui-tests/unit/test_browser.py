@@ -0,0 +1,150 @@
+"""
+NardPOS UI Automation - Browser Unit Tests
+Driver path caching and session recovery.
+"""
+
+import os
+
+import pytest
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+from utils import browser
+
+pytestmark = pytest.mark.unit
+
+
+class _SeleniumManager:
+    """Stand-in for Selenium Manager that records every lookup."""
+    
+    driver_path = None
+    calls = []
+    
+    def driver_location(self, options):
+        self.calls.append(options)
+        options.binary_location = '/opt/chrome/chrome'
+        return self.driver_path
+
+
+class _ReusedDriver:
+    """WebDriver stand-in for BrowserSession: records calls, can be killed."""
+    
+    def __init__(self, windows=1):
+        self.window_handles = [f"window-{number}" for number in range(windows)]
+        self.switch_to = self
+        self.alive = True
+        self.calls = []
+    
+    @property
+    def current_window_handle(self):
+        if not self.alive:
+            raise WebDriverException('invalid session id')
+        return self.window_handles[0]
+    
+    def execute_script(self, script):
+        self.calls.append('execute_script')
+    
+    def delete_all_cookies(self):
+        if not self.alive:
+            raise WebDriverException('invalid session id')
+        self.calls.append('delete_all_cookies')
+    
+    def window(self, handle):
+        self.calls.append(('window', handle))
+    
+    def close(self):
+        self.calls.append('close')
+    
+    def get(self, url):
+        self.calls.append(('get', url))
+    
+    def quit(self):
+        self.calls.append('quit')
+        if not self.alive:
+            raise WebDriverException('invalid session id')
+
+
+class TestDriverCache:
+    """utils.browser: driver paths resolved once and cached on disk."""
+    
+    @pytest.fixture
+    def manager(self, tmp_path, monkeypatch):
+        driver_path = tmp_path / 'chromedriver'
+        driver_path.write_text('')
+        monkeypatch.setattr(browser, 'DRIVER_CACHE_PATH', str(tmp_path / 'cache' / 'drivers.json'))
+        monkeypatch.setattr(browser, '_resolved_drivers', {})
+        monkeypatch.setattr(browser, 'SeleniumManager', _SeleniumManager)
+        monkeypatch.setattr(_SeleniumManager, 'driver_path', str(driver_path))
+        monkeypatch.setattr(_SeleniumManager, 'calls', [])
+        return _SeleniumManager
+    
+    def test_resolved_paths_are_reused_across_runs(self, manager, monkeypatch):
+        assert browser.resolve_driver('chrome', browser.chrome_options()) == manager.driver_path
+        monkeypatch.setattr(browser, '_resolved_drivers', {})
+        options = browser.chrome_options()
+        
+        assert browser.resolve_driver('chrome', options) == manager.driver_path
+        assert options.binary_location == '/opt/chrome/chrome'
+        assert len(manager.calls) == 1
+    
+    def test_missing_driver_is_re_resolved(self, manager):
+        browser.resolve_driver('chrome', browser.chrome_options())
+        os.remove(manager.driver_path)
+        
+        browser.resolve_driver('chrome', browser.chrome_options())
+        
+        assert len(manager.calls) == 2
+    
+    def test_session_failure_refreshes_the_driver_once(self, manager):
+        attempts = []
+        
+        def start(driver_path):
+            attempts.append(driver_path)
+            if len(attempts) == 1:
+                raise SessionNotCreatedException('browser was updated')
+            return 'session'
+        
+        assert browser._start_with_cached_driver('chrome', browser.chrome_options(), start) == 'session'
+        assert len(attempts) == 2 and len(manager.calls) == 2
+
+
+class TestBrowserSession:
+    """utils.browser: one reused browser per worker, reset between tests."""
+    
+    @pytest.fixture
+    def session(self):
+        return browser.BrowserSession(_ReusedDriver)
+    
+    def test_browser_is_launched_once_and_reused(self, session):
+        first = session.acquire()
+        session.reset()
+        
+        assert session.acquire() is first
+        assert session.launches == 1
+        assert first.calls == ['execute_script', 'delete_all_cookies', ('get', 'about:blank')]
+    
+    def test_dead_session_is_replaced(self, session):
+        first = session.acquire()
+        first.alive = False
+        
+        second = session.acquire()
+        
+        assert second is not first and session.launches == 2
+        assert 'quit' in first.calls
+    
+    def test_failed_reset_discards_the_browser(self, session):
+        first = session.acquire()
+        first.alive = False
+        
+        session.reset()
+        
+        assert session.browser is None
+        assert session.acquire() is not first
+    
+    def test_reset_closes_windows_opened_by_the_test(self):
+        driver = _ReusedDriver(windows=3)
+        
+        browser.reset_app_state(driver)
+        
+        assert driver.calls[2:] == [
+            ('window', 'window-1'), 'close', ('window', 'window-2'), 'close',
+            ('window', 'window-0'), ('get', 'about:blank'),
+        ]
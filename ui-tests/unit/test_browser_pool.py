@@ -0,0 +1,158 @@
+"""
+NardPOS UI Automation - Browser Pool Unit Tests
+Leases, idle reuse, TTL reclaim and the PooledChrome client.
+"""
+
+import threading
+import time
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+from utils import browser_pool
+
+pytestmark = pytest.mark.unit
+
+
+class _PooledProcess:
+    """Stand-in for one Chrome process in the browser pool."""
+    
+    def __init__(self, number):
+        self.id = f"browser-{number}"
+        self.debugger_address = f"127.0.0.1:{9000 + number}"
+        self.alive = True
+        self.terminated = False
+    
+    def is_alive(self):
+        return self.alive
+    
+    def terminate(self):
+        self.terminated = True
+
+
+def _wait_for_launches(pool):
+    deadline = time.monotonic() + 5
+    while pool.status()['launching'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return pool.status()
+
+
+class TestBrowserPool:
+    """utils.browser_pool: lease bookkeeping and the HTTP API."""
+    
+    @pytest.fixture
+    def pool(self, monkeypatch):
+        launched = []
+        
+        def launch(pool):
+            launched.append(_PooledProcess(len(launched) + 1))
+            return launched[-1]
+        
+        monkeypatch.setattr(browser_pool, 'resolve_driver',
+                            lambda name, options: setattr(options, 'binary_location', '/opt/chrome/chrome'))
+        monkeypatch.setattr(browser_pool.BrowserPool, '_launch', launch)
+        pool = browser_pool.BrowserPool(size=1).start()
+        pool.launched = launched
+        _wait_for_launches(pool)
+        yield pool
+        pool.close()
+    
+    @pytest.fixture
+    def pool_url(self, pool):
+        server = browser_pool.BrowserPoolServer(pool, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+        server.shutdown()
+        server.server_close()
+    
+    def test_lease_prefers_idle_browsers_and_refills(self, pool):
+        lease = pool.lease()
+        
+        assert lease == {'id': 'browser-1', 'debugger_address': '127.0.0.1:9001', 'ttl': browser_pool.LEASE_TTL}
+        assert _wait_for_launches(pool) == {'size': 1, 'idle': 1, 'leased': 1, 'launching': 0, 'reclaimed': 0}
+    
+    def test_dead_idle_browsers_are_skipped(self, pool):
+        pool.launched[0].alive = False
+        
+        lease = pool.lease()
+        
+        assert lease['id'] == 'browser-2' and pool.launched[0].terminated
+    
+    def test_release_keeps_at_most_size_idle(self, pool):
+        first = pool.lease()
+        _wait_for_launches(pool)
+        second = pool.lease()
+        _wait_for_launches(pool)
+        
+        assert pool.release(first['id']) and pool.release(second['id'], recycle=True)
+        assert not pool.release('unknown')
+        status = _wait_for_launches(pool)
+        assert (status['idle'], status['leased']) == (1, 0)
+        assert [process.terminated for process in pool.launched[:2]] == [True, True]
+    
+    def test_unrenewed_leases_are_reclaimed(self, pool):
+        pool.lease_ttl = 0
+        abandoned = pool.lease()
+        
+        assert pool.status()['reclaimed'] == 1
+        assert not pool.renew(abandoned['id']) and not pool.release(abandoned['id'])
+        assert pool.launched[0].terminated
+    
+    def test_renewed_leases_are_kept(self, pool):
+        lease = pool.lease()
+        pool.lease_ttl = 0
+        
+        assert pool.renew(lease['id'])
+        pool.lease_ttl = browser_pool.LEASE_TTL
+        assert pool.renew(lease['id'])
+        assert pool.status()['leased'] == 1 and not pool.launched[0].terminated
+    
+    def test_pooled_chrome_attaches_renews_and_releases_on_quit(self, pool, pool_url, monkeypatch):
+        sessions = []
+        monkeypatch.setattr(browser_pool, '_start_with_cached_driver',
+                            lambda name, options, start: start('/drivers/chromedriver'))
+        monkeypatch.setattr(browser_pool.webdriver.Chrome, '__init__',
+                            lambda self, options, service: sessions.append(options.debugger_address))
+        monkeypatch.setattr(browser_pool.webdriver.Chrome, 'implicitly_wait', lambda self, seconds: None)
+        monkeypatch.setattr(browser_pool.webdriver.Chrome, 'quit', lambda self: sessions.append('quit'))
+        monkeypatch.setattr(browser_pool, 'reset_app_state', lambda driver: None)
+        pool.lease_ttl = 0.2
+        
+        driver = browser_pool.create_pooled_browser(pool_url)
+        time.sleep(0.4)
+        
+        assert sessions == ['127.0.0.1:9001']
+        assert pool.status() == {'size': 1, 'idle': 1, 'leased': 1, 'launching': 0, 'reclaimed': 0}
+        pool.size = 2
+        driver.quit()
+        assert sessions[-1] == 'quit'
+        assert pool.status()['leased'] == 0 and not pool.launched[0].terminated
+    
+    def test_failed_reset_recycles_the_browser(self, pool, pool_url, monkeypatch):
+        monkeypatch.setattr(browser_pool.webdriver.Chrome, '__init__', lambda self, **kwargs: None)
+        monkeypatch.setattr(browser_pool.webdriver.Chrome, 'quit', lambda self: None)
+        
+        def broken_reset(driver):
+            raise WebDriverException('tab crashed')
+        
+        monkeypatch.setattr(browser_pool, 'reset_app_state', broken_reset)
+        driver = browser_pool.PooledChrome(pool_url, browser_pool.lease_browser(pool_url))
+        pool.size = 2
+        
+        driver.quit()
+        
+        assert pool.status()['leased'] == 0 and pool.launched[0].terminated
+    
+    def test_http_round_trip(self, pool):
+        server = browser_pool.BrowserPoolServer(pool, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            lease = browser_pool.lease_browser(url)
+            assert pool.status()['leased'] == 1
+            browser_pool.release_browser(url, lease['id'])
+            assert pool.status()['leased'] == 0
+        finally:
+            server.shutdown()
+            server.server_close()
+        with pytest.raises(browser_pool.BrowserPoolError, match='is unavailable'):
+            browser_pool.lease_browser(url, timeout=1)
@@ -0,0 +1,95 @@
+"""
+NardPOS UI Automation - Cashier Simulation Unit Tests
+Concurrent cashier sessions against fake page objects.
+"""
+
+import time
+
+import pytest
+from utils import browser, cashiers
+
+pytestmark = pytest.mark.unit
+
+
+class _Browser:
+    def __init__(self, launch_s=0.0, logs_in=True):
+        time.sleep(launch_s)
+        self.logs_in = logs_in
+    
+    def get(self, url):
+        pass
+    
+    def quit(self):
+        pass
+
+
+class _LoginPage:
+    def __init__(self, browser):
+        self.browser = browser
+    
+    def login_in_page(self, username, password):
+        return self.browser.logs_in
+
+
+class _POSPage:
+    """Issues unique receipts from a shared counter."""
+    
+    counter = iter(())
+    
+    def __init__(self, browser):
+        pass
+    
+    def get_catalog(self):
+        return [{'id': product_id} for product_id in range(1, 9)]
+    
+    def create_sale_with_products(self, product_ids, payment_method):
+        time.sleep(0.001)
+        return f"RCP-{next(self.counter)}"
+
+
+@pytest.fixture
+def fake_pos(monkeypatch):
+    """Swap the page objects utils.cashiers drives for in-memory fakes."""
+    monkeypatch.setattr(cashiers, 'LoginPage', _LoginPage)
+    monkeypatch.setattr(cashiers, 'POSPage', _POSPage)
+    monkeypatch.setattr(_POSPage, 'counter', iter(range(1000, 10000)))
+
+
+class TestCashiers:
+    """utils.cashiers: throughput window, failures and duplicate receipts."""
+    
+    CREDENTIALS = {'username': 'test_user', 'password': '123456'}
+    
+    def test_throughput_excludes_browser_startup(self, fake_pos):
+        # The slowest browser takes 0.3s to launch; the selling takes ~5ms
+        launch_times = iter([0.0, 0.1, 0.3])
+        
+        report = cashiers.simulate_cashiers(lambda: _Browser(next(launch_times)), 'http://pos',
+                                            self.CREDENTIALS, cashiers=3, sales_per_cashier=5)
+        
+        assert len(report.receipts) == 15 and not report.errors
+        assert report.summary()['startup_s'] >= 0.3
+        assert report.elapsed < 0.25
+    
+    def test_failed_login_does_not_block_other_cashiers(self, fake_pos):
+        logins = iter([True, False])
+        
+        report = cashiers.simulate_cashiers(lambda: _Browser(logs_in=next(logins)), 'http://pos',
+                                            self.CREDENTIALS, cashiers=2, sales_per_cashier=3)
+        
+        assert len(report.receipts) == 3
+        assert list(report.errors.values()) == ['login did not reach the dashboard']
+    
+    def test_duplicates_map_to_cashier_and_sale(self):
+        report = cashiers.SimulationReport([
+            cashiers.CashierResult(1, ['RCP-1', 'RCP-2'], [10.0, 20.0], 0.0, None),
+            cashiers.CashierResult(2, ['RCP-3', 'RCP-2'], [30.0, 40.0], 0.0, None),
+        ], elapsed=2.0)
+        
+        assert report.duplicates() == {'RCP-2': [(1, 1), (2, 1)]}
+        assert report.summary()['checkouts_per_s'] == 2.0
+        assert report.summary()['sessions'][2]['max_ms'] == 40.0
+    
+    def test_collision_probability_birthday_bound(self):
+        assert cashiers.collision_probability(1) == 0.0
+        assert cashiers.collision_probability(112) == pytest.approx(0.5, abs=0.01)
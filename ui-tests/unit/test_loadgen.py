@@ -0,0 +1,84 @@
+"""
+NardPOS UI Automation - Load Generator Unit Tests
+Percentiles, latency budgets, histograms and the checkout scenario.
+"""
+
+import pytest
+from utils.loadgen import SCENARIO_STEP, Budget, LoadGenerator, LoadStats, parse_budget, percentile
+from utils.mock_server import NardPOSServer
+
+pytestmark = pytest.mark.unit
+
+
+class TestLoadStats:
+    """utils.loadgen: percentiles, budgets and histograms."""
+    
+    def test_nearest_rank_percentile(self):
+        values = list(range(1, 101))
+        
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99.9) == 100
+        assert percentile([7.0], 1) == 7.0
+        assert percentile([], 95) == 0.0
+    
+    def test_parse_budget(self):
+        assert parse_budget('p95=100') == Budget(None, 95.0, 100.0)
+        assert parse_budget('Create Sale - Valid Payload:p99.9=250') == \
+            Budget('Create Sale - Valid Payload', 99.9, 250.0)
+        with pytest.raises(ValueError, match='expected e.g. p95=100'):
+            parse_budget('95=100')
+    
+    def test_summary_percentiles_and_errors(self):
+        stats = LoadStats()
+        stats.started, stats.finished = 10.0, 12.0
+        for latency in range(1, 21):
+            stats.record('login', float(latency), ok=latency != 20)
+        
+        row = stats.summary()['login']
+        
+        assert (row['count'], row['errors'], row['throughput_rps']) == (20, 1, 10.0)
+        assert (row['p50_ms'], row['p95_ms'], row['p99_ms'], row['max_ms']) == (10.0, 19.0, 20.0, 20.0)
+        assert row['mean_ms'] == 10.5
+    
+    def test_histogram_buckets(self):
+        stats = LoadStats()
+        for latency in (0.5, 1.0, 1.5, 99.0, 6000.0):
+            stats.record('login', latency)
+        
+        counts = stats.histogram('login')
+        
+        assert counts[:2] == [2, 1] and counts[6] == 1 and counts[-1] == 1
+        assert sum(counts) == 5
+    
+    def test_global_budget_skips_scenario_totals(self):
+        stats = LoadStats()
+        for latency in (10.0, 20.0, 300.0):
+            stats.record('Create Sale - Valid Payload', latency)
+            stats.record(SCENARIO_STEP, latency * 5)
+        
+        violations = stats.check_budgets([parse_budget('p50=100'), parse_budget('p95=250')])
+        
+        assert violations == ['Create Sale - Valid Payload: p95 300.0ms > 250ms']
+        assert stats.check_budgets([parse_budget('Get Products - With Token:p95=1')]) == [
+            'Get Products - With Token: no samples recorded',
+        ]
+
+
+class TestLoadGenerator:
+    """utils.loadgen.LoadGenerator: the checkout scenario against the mock server."""
+    
+    def test_sale_is_fetched_by_the_id_each_user_created(self):
+        server = NardPOSServer().start()
+        generator = LoadGenerator(server.url, concurrency=2)
+        try:
+            stats = generator.run_closed(iterations=2)
+        finally:
+            generator.close()
+            server.stop()
+        
+        fetch = next(step for step in generator.steps if step.name == 'Get Sale by ID - Valid ID')
+        assert fetch.url.endswith('/sales/{{sale_id}}')
+        assert not stats.errors
+        # The seeded sale plus one per scenario run
+        assert len(server.store.by_id) == 1 + 2 * 2
@@ -0,0 +1,65 @@
+"""
+NardPOS UI Automation - Browser Matrix Unit Tests
+Browser ids, timing rows and the summary tables.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from utils.matrix import BrowserMatrix, parse_browsers, without_browser_id
+
+pytestmark = pytest.mark.unit
+
+
+def _browser_report(nodeid, browser, seconds, steps=None, when='call', passed=True):
+    properties = [('browser', browser)] + ([('step_timings', steps)] if steps else [])
+    return SimpleNamespace(nodeid=nodeid, when=when, passed=passed, duration=seconds,
+                           user_properties=properties)
+
+
+class TestBrowserMatrix:
+    """utils.matrix: browser ids, timing rows and the summary tables."""
+    
+    def test_parse_browsers(self):
+        assert parse_browsers('chrome, Firefox,chrome', 'edge') == ['chrome', 'firefox']
+        assert parse_browsers(' , ', 'edge') == ['edge']
+        assert parse_browsers(None, 'chrome') == ['chrome']
+    
+    def test_without_browser_id(self):
+        assert without_browser_id('test_a[firefox]', 'firefox') == 'test_a'
+        assert without_browser_id('test_b[x10-firefox]', 'firefox') == 'test_b[x10]'
+        assert without_browser_id('test_c[chrome-x10]', 'firefox') == 'test_c[chrome-x10]'
+        assert without_browser_id('test_d', 'firefox') == 'test_d'
+    
+    def test_rows_rank_by_spread_and_flag_slow_browsers(self):
+        matrix = BrowserMatrix(slowdown=1.5, min_delta_ms=20)
+        for browser, checkout, login, steps in (('chrome', 0.2, 0.010, {'POSPage.checkout': 50.0}),
+                                                ('firefox', 0.5, 0.018, {'POSPage.checkout': 30.0})):
+            matrix.add_report(_browser_report(f"t.py::test_checkout[{browser}]", browser, checkout, steps))
+            matrix.add_report(_browser_report(f"t.py::test_login[{browser}]", browser, login))
+        matrix.add_report(_browser_report('t.py::test_scan[chrome]', 'chrome', 0.1))
+        matrix.add_report(_browser_report('t.py::test_void[firefox]', 'firefox', 9.0, passed=False))
+        matrix.add_report(_browser_report('t.py::test_void[firefox]', 'firefox', 9.0, when='teardown'))
+        
+        tests = matrix.rows('test')
+        
+        assert [(name, slowest, flagged) for name, _, slowest, _, flagged in tests] == [
+            ('t.py::test_checkout', 'firefox', True),
+            ('t.py::test_login', 'firefox', False),
+        ]
+        assert tests[0][3] == pytest.approx(2.5) and tests[1][3] == pytest.approx(1.8)
+        assert matrix.rows('step') == [
+            ('POSPage.checkout', {'chrome': 50.0, 'firefox': 30.0}, 'chrome', pytest.approx(5 / 3), True),
+        ]
+    
+    def test_format_and_html(self):
+        matrix = BrowserMatrix()
+        for browser, seconds in (('chrome', 0.1), ('firefox', 0.3)):
+            matrix.add_report(_browser_report(f"test_cart[{browser}]", browser, seconds))
+        
+        lines = matrix.format().splitlines()
+        
+        assert lines[0].split() == ['Test', 'chrome', 'firefox', 'slowest']
+        assert lines[1].split() == ['test_cart', '100.0ms', '300.0ms', 'firefox', 'x3.00', 'SLOWER']
+        assert '<tr style="color:#c00"><td>test_cart</td><td>100.0</td><td>300.0</td>' in matrix.html()
+        assert BrowserMatrix().format() == '' and BrowserMatrix().html() == ''
@@ -0,0 +1,83 @@
+"""
+NardPOS UI Automation - Mock Server Unit Tests
+API status codes, the indexed sales store and mock-ui over HTTP.
+"""
+
+import pytest
+import requests
+from utils.mock_server import ApiError, NardPOSServer, SalesStore
+
+pytestmark = pytest.mark.unit
+
+SALE = {'items': [{'product_id': 2, 'name': 'Pepsi 500ml', 'quantity': 3, 'unit_price': 175}]}
+
+
+@pytest.fixture
+def server():
+    server = NardPOSServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def auth(server):
+    response = requests.post(f"{server.url}/auth/login",
+                             json={'username': 'test_user', 'password': '123456'})
+    assert response.status_code == 200
+    return {'Authorization': f"Bearer {response.json()['access_token']}"}
+
+
+class TestSalesStore:
+    """utils.mock_server.SalesStore: validation and indexes."""
+    
+    def test_sales_are_indexed_by_id_and_receipt(self):
+        store = SalesStore()
+        
+        sale = store.create(SALE)
+        
+        assert sale['total'] == 525
+        assert store.get(sale['id']) is sale
+        assert store.by_receipt[sale['receipt_number']] is sale
+    
+    @pytest.mark.parametrize('payload', [
+        {}, {'items': []}, {'items': [{'name': 'no id'}]},
+        {'items': [{'product_id': 1, 'quantity': 0}]},
+    ])
+    def test_invalid_payloads_are_rejected(self, payload):
+        with pytest.raises(ApiError) as error:
+            SalesStore().create(payload)
+        
+        assert error.value.status == 400
+
+
+class TestMockServer:
+    """utils.mock_server.NardPOSServer: routes over HTTP."""
+    
+    def test_wrong_password_is_unauthorized(self, server):
+        response = requests.post(f"{server.url}/auth/login",
+                                 json={'username': 'test_user', 'password': 'wrong'})
+        
+        assert response.status_code == 401
+    
+    def test_api_routes_require_a_token(self, server):
+        for path in ('/products', '/sales/1', '/sales-arc/archive'):
+            assert requests.get(f"{server.url}{path}").status_code == 401
+    
+    def test_created_sale_is_fetched_by_id(self, server, auth):
+        created = requests.post(f"{server.url}/sales", json=SALE, headers=auth)
+        fetched = requests.get(f"{server.url}/sales/{created.json()['id']}", headers=auth)
+        
+        assert created.status_code == 201
+        assert fetched.json() == created.json()
+    
+    def test_sale_lookup_errors(self, server, auth):
+        assert requests.get(f"{server.url}/sales/10", headers=auth).status_code == 404
+        assert requests.get(f"{server.url}/sales/abc", headers=auth).status_code == 400
+        assert requests.post(f"{server.url}/sales", json={}, headers=auth).status_code == 400
+    
+    def test_mock_ui_is_served(self, server):
+        response = requests.get(server.url)
+        
+        assert response.status_code == 200
+        assert 'text/html' in response.headers['Content-Type']
+        assert requests.get(f"{server.url}/../.env").status_code == 404
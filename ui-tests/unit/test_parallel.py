@@ -0,0 +1,49 @@
+"""
+NardPOS UI Automation - Parallel Execution Unit Tests
+Duration history and scheduling order for xdist runs.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from utils.parallel import load_durations, order_by_duration, save_durations
+
+pytestmark = pytest.mark.unit
+
+
+class _Cache:
+    """Stand-in for pytest's config.cache."""
+    
+    def __init__(self):
+        self.values = {}
+    
+    def get(self, key, default):
+        return self.values.get(key, default)
+    
+    def set(self, key, value):
+        self.values[key] = value
+
+
+class TestParallel:
+    """utils.parallel: duration history and scheduling order."""
+    
+    def test_durations_are_smoothed_against_earlier_runs(self):
+        config = SimpleNamespace(cache=_Cache())
+        save_durations(config, {}, {'a': 2.0})
+        save_durations(config, load_durations(config), {'a': 4.0, 'b': 1.0})
+        
+        assert load_durations(config) == {'a': 3.0, 'b': 1.0}
+    
+    def test_durations_without_cache_plugin(self):
+        # -p no:cacheprovider leaves Config without a cache attribute
+        config = SimpleNamespace()
+        
+        assert load_durations(config) == {}
+        save_durations(config, {}, {'a': 1.0})
+    
+    def test_unknown_tests_are_ordered_at_the_median(self):
+        durations = {'slow': 9.0, 'mid': 5.0, 'fast': 1.0}
+        
+        order = order_by_duration(['fast', 'new', 'slow', 'mid'], durations)
+        
+        assert order == [2, 1, 3, 0]
@@ -0,0 +1,38 @@
+"""
+NardPOS UI Automation - Postman Runner Unit Tests
+URL chaining and dependency levels for postman_collection.json requests.
+"""
+
+import pytest
+from utils.postman import PostmanRequest, dependency_levels, use_variables
+
+pytestmark = pytest.mark.unit
+
+
+def _postman_request(name, url, captures=None):
+    return PostmanRequest(name, '', 'GET', url, [], '', '', None, None, captures or {})
+
+
+class TestPostman:
+    """utils.postman: URL chaining and dependency levels."""
+    
+    def test_chained_url_runs_after_its_producer(self):
+        requests_ = [
+            _postman_request('login', '{{base_url}}/auth/login', {'access_token': 'access_token'}),
+            _postman_request('create', '{{base_url}}/sales?t={{access_token}}'),
+            _postman_request('get', '{{base_url}}/sales/1'),
+            _postman_request('missing', '{{base_url}}/sales/10'),
+        ]
+        
+        chained = use_variables(requests_, {'get': {'/sales/1': '/sales/{{sale_id}}'}})
+        levels = dependency_levels(chained, {'create': {'sale_id': 'id'}})
+        
+        assert chained[2].url == '{{base_url}}/sales/{{sale_id}}'
+        assert chained[3].url == '{{base_url}}/sales/10'
+        assert [[request.name for request in level] for level in levels] == [
+            ['login', 'missing'], ['create'], ['get'],
+        ]
+    
+    def test_missing_literal_is_an_error(self):
+        with pytest.raises(ValueError, match='/sales/2'):
+            use_variables([_postman_request('get', '{{base_url}}/sales/1')], {'get': {'/sales/2': '{{id}}'}})
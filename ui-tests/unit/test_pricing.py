@@ -0,0 +1,84 @@
+"""
+NardPOS UI Automation - Pricing Model Unit Tests
+The cart reference model against the app's JavaScript math.
+"""
+
+import numpy as np
+import pytest
+from utils import pricing
+
+pytestmark = pytest.mark.unit
+
+
+class TestPricingModel:
+    """utils.pricing: the reference model against the app's JavaScript math."""
+    
+    PRICES = [0.1, 0.2, 0.3, 19.99]
+    IDS = [11, 12, 13, 14]
+    
+    @staticmethod
+    def _batch(*carts):
+        width = max(len(cart) for cart in carts)
+        operations = np.full((len(carts), width), pricing.PAD)
+        products = np.zeros((len(carts), width), dtype=np.int64)
+        for row, cart in enumerate(carts):
+            for slot, (operation, product) in enumerate(cart):
+                operations[row, slot], products[row, slot] = operation, product
+        return pricing.CartBatch(operations, products)
+    
+    @pytest.mark.parametrize('value, digits, js', [
+        (1.005, 2, '1.00'),
+        (1.045, 2, '1.04'),
+        (8.345, 2, '8.35'),
+        (10.235, 2, '10.23'),
+        (0.1 + 0.2, 2, '0.30'),
+        (1.45, 1, '1.4'),
+        (2.5, 0, '3'),
+        (-2.5, 0, '-3'),
+        (0, 2, '0.00'),
+    ])
+    def test_to_fixed_matches_javascript(self, value, digits, js):
+        assert pricing.to_fixed(value, digits) == js
+    
+    def test_totals_follow_cart_operations(self):
+        batch = self._batch(
+            [(pricing.ADD, 3), (pricing.INCREMENT, 3), (pricing.ADD, 0), (pricing.DECREMENT, 0)],
+            [(pricing.ADD, 1), (pricing.INCREMENT, 2), (pricing.REMOVE, 1), (pricing.ADD, 2)],
+            [(pricing.ADD, 0), (pricing.ADD, 0), (pricing.ADD, 3), (pricing.DECREMENT, 3)],
+        )
+        
+        subtotal, tax, total = pricing.expected_totals(batch, self.PRICES)
+        
+        assert subtotal.tolist() == [19.99 * 2, 0.3, 0.1 * 2]
+        assert tax.tolist() == [value * 0.10 for value in subtotal.tolist()]
+        assert total.tolist() == [value + value * 0.10 for value in subtotal.tolist()]
+    
+    def test_subtotal_sums_in_insertion_order(self):
+        # 0.1 + 0.2 + 0.3 and 0.3 + 0.2 + 0.1 differ in the last bit
+        forward = self._batch([(pricing.ADD, 0), (pricing.ADD, 1), (pricing.ADD, 2)])
+        readded = self._batch([(pricing.ADD, 0), (pricing.ADD, 2), (pricing.ADD, 1),
+                               (pricing.REMOVE, 0), (pricing.ADD, 0)])
+        
+        assert pricing.expected_totals(forward, self.PRICES)[0].tolist() == [0.1 + 0.2 + 0.3]
+        assert pricing.expected_totals(readded, self.PRICES)[0].tolist() == [0.3 + 0.2 + 0.1]
+    
+    def test_generated_carts_start_with_an_add(self):
+        batch = pricing.generate_carts(200, product_count=4, max_operations=6, seed=1)
+        
+        assert batch.operations.shape == batch.products.shape == (200, 6)
+        assert (batch.operations[:, 0] == pricing.ADD).all()
+        assert batch.products.max() < 4
+        for operations in batch.operations:
+            used = int((operations != pricing.PAD).sum())
+            assert (operations[used:] == pricing.PAD).all()
+    
+    def test_page_encoding_and_mismatch_steps(self):
+        batch = self._batch([(pricing.ADD, 3), (pricing.INCREMENT, 3)], [(pricing.ADD, 0)])
+        expected = pricing.expected_display(batch, self.PRICES)
+        
+        rendered = [expected[0], ('$0.10', '$0.01', '$0.12')]
+        mismatches = pricing.compare(batch, self.IDS, expected, rendered)
+        
+        assert pricing.page_carts(batch, self.IDS) == [[0, 14, 1, 14], [0, 11]]
+        assert expected == [('$39.98', '$4.00', '$43.98'), ('$0.10', '$0.01', '$0.11')]
+        assert mismatches == [pricing.PriceMismatch(1, ['add 11'], expected[1], rendered[1])]
@@ -0,0 +1,78 @@
+"""
+NardPOS UI Automation - Command Profiler Unit Tests
+Wire command counting, budgets and the run summary.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+import conftest
+from utils.profiler import CommandProfiler, CommandSummary, check_budget
+
+pytestmark = pytest.mark.unit
+
+
+class _WireDriver:
+    """WebDriver stand-in whose execute() is the wire hook."""
+    
+    def execute(self, driver_command, params=None):
+        return {'value': driver_command}
+
+
+class TestProfiler:
+    """utils.profiler: command counting, budgets and the run summary."""
+    
+    def test_counts_only_while_enabled(self):
+        driver = _WireDriver()
+        profiler = CommandProfiler.install(driver)
+        assert CommandProfiler.install(driver) is profiler
+        
+        driver.execute('findElement')
+        profiler.enabled = True
+        driver.execute('findElement')
+        driver.execute('clickElement')
+        
+        snapshot = profiler.snapshot()
+        assert snapshot['count'] == 2
+        assert {key: count for key, (count, ms) in snapshot['by_command'].items()} == {
+            'findElement': 1, 'clickElement': 1,
+        }
+        assert list(snapshot['by_caller']) == ['TestProfiler.test_counts_only_while_enabled']
+    
+    def test_only_the_call_phase_is_counted(self):
+        driver = _WireDriver()
+        item = SimpleNamespace(command_profiler=CommandProfiler.install(driver))
+        driver.execute('get')
+        
+        hook = conftest.pytest_runtest_call(item)
+        next(hook)
+        driver.execute('findElement')
+        with pytest.raises(StopIteration):
+            hook.send(None)
+        driver.execute('deleteSession')
+        
+        assert item.command_profiler.snapshot()['count'] == 1
+        assert list(item.command_profiler.snapshot()['by_command']) == ['findElement']
+    
+    def test_check_budget_lists_hottest_callers(self):
+        snapshot = {'count': 12, 'total_ms': 480.0, 'by_command': {},
+                    'by_caller': {'POSPage.checkout': [9, 400.0], 'LoginPage.login': [3, 80.0]}}
+        
+        assert check_budget(snapshot, max_commands=12, max_ms=500) is None
+        message = check_budget(snapshot, max_commands=10, max_ms=100)
+        
+        assert message.startswith('Command budget exceeded: 12 WebDriver commands > budget of 10; '
+                                  '480ms in WebDriver commands > budget of 100ms')
+        assert message.index('POSPage.checkout: 9 commands') < message.index('LoginPage.login: 3 commands')
+    
+    def test_summary_ranks_by_time(self):
+        summary = CommandSummary()
+        summary.add({'by_command': {'findElement': [5, 50.0], 'clickElement': [1, 90.0]}, 'by_caller': {}})
+        summary.add({'by_command': {'findElement': [5, 50.0]}, 'by_caller': {}})
+        
+        lines = summary.format().splitlines()
+        
+        assert summary.tests == 2 and summary.by_command['findElement'] == [10, 100.0]
+        assert lines[0] == 'Hottest commands:'
+        assert lines[1].split() == ['findElement', '10', 'cmds', '100', 'ms']
+        assert lines[2].split()[0] == 'clickElement'
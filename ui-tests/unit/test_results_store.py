@@ -0,0 +1,100 @@
+"""
+NardPOS UI Automation - Results Store Unit Tests
+Run outcomes, history queries and slowdown detection.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from utils.results_store import ResultsStore, RunCollector
+
+pytestmark = pytest.mark.unit
+
+
+def _report(nodeid, when, outcome='passed', duration=0.1, user_properties=()):
+    return SimpleNamespace(nodeid=nodeid, when=when, outcome=outcome, duration=duration,
+                           passed=outcome == 'passed', user_properties=list(user_properties))
+
+
+def _run(store, durations):
+    """Ingest one run where every test in `durations` (seconds) passed."""
+    collector = RunCollector()
+    for nodeid, seconds in durations.items():
+        for when in ('setup', 'call', 'teardown'):
+            collector.add_report(_report(nodeid, when, duration=seconds if when == 'call' else 0.0))
+    return store.ingest(collector)
+
+
+class TestResultsStore:
+    """utils.results_store: outcomes and slowdown detection."""
+    
+    def test_teardown_error_overrides_passed_call(self):
+        collector = RunCollector()
+        collector.add_report(_report('t::a', 'setup'))
+        collector.add_report(_report('t::a', 'call'))
+        collector.add_report(_report('t::a', 'teardown', 'failed'))
+        
+        assert collector.outcomes == {'t::a': 'failed'}
+        assert [row for row in collector.rows() if row[0] == 'test'] == []
+    
+    def test_setup_outcome_and_call_outcome(self):
+        collector = RunCollector()
+        collector.add_report(_report('t::skipped', 'setup', 'skipped'))
+        collector.add_report(_report('t::skipped', 'teardown'))
+        collector.add_report(_report('t::failed', 'setup'))
+        collector.add_report(_report('t::failed', 'call', 'failed'))
+        collector.add_report(_report('t::failed', 'teardown', 'failed'))
+        collector.add_report(_report('t::passed', 'setup'))
+        collector.add_report(_report('t::passed', 'call'))
+        collector.add_report(_report('t::passed', 'teardown'))
+        
+        assert collector.outcomes == {'t::skipped': 'skipped', 't::failed': 'failed', 't::passed': 'passed'}
+    
+    def test_step_and_latency_metrics_are_collected(self):
+        collector = RunCollector()
+        collector.add_report(_report('t::a', 'call', user_properties=[
+            ('step_timings', {'POSPage.add_product_to_cart': 12.5}), ('latency_ms', 3.0),
+        ]))
+        
+        assert sorted(collector.metrics) == [
+            ('endpoint', 't::a', 'latency', 3.0), ('step', 't::a', 'POSPage.add_product_to_cart', 12.5),
+        ]
+    
+    def test_slowdown_beyond_z_threshold_is_flagged(self, tmp_path):
+        store = ResultsStore(str(tmp_path / 'results.sqlite'))
+        try:
+            for seconds in (0.100, 0.102, 0.098, 0.101, 0.099):
+                _run(store, {'t::slow': seconds, 't::steady': seconds})
+            run_id = _run(store, {'t::slow': 0.200, 't::steady': 0.101})
+        
+            regressions = store.regressions(run_id)
+        finally:
+            store.close()
+        
+        assert [regression.scope for regression in regressions] == ['t::slow']
+        assert regressions[0].baseline_ms == pytest.approx(100.0)
+        assert regressions[0].samples == 5
+    
+    def test_small_increase_of_stable_metric_is_not_flagged(self, tmp_path):
+        # z is huge for a metric that never varied, but 10% / 10ms is below min_increase
+        store = ResultsStore(str(tmp_path / 'results.sqlite'))
+        try:
+            for _ in range(5):
+                _run(store, {'t::a': 0.100})
+            run_id = _run(store, {'t::a': 0.110})
+        
+            assert store.regressions(run_id) == []
+            assert len(store.regressions(run_id, min_increase=0.05)) == 1
+        finally:
+            store.close()
+    
+    def test_too_little_history_is_not_judged(self, tmp_path):
+        store = ResultsStore(str(tmp_path / 'results.sqlite'))
+        try:
+            for _ in range(4):
+                _run(store, {'t::a': 0.100})
+            run_id = _run(store, {'t::a': 1.0})
+        
+            assert store.regressions(run_id) == []
+        finally:
+            store.close()
@@ -0,0 +1,70 @@
+"""
+NardPOS UI Automation - Sales History Page Unit Tests
+Bulk extraction and the cached receipt index.
+"""
+
+import pytest
+from pages import sales_history_page
+from pages.sales_history_page import SalesHistoryPage
+
+pytestmark = pytest.mark.unit
+
+ROWS = [
+    ['RCP-2', '1/2/2025', '1', '$1.50', 'Cash', 'Completed'],
+    ['RCP-1', '1/1/2025', '2', '$3.00', 'Card', 'Completed'],
+]
+
+
+class _HistoryDriver:
+    """Driver stub answering the history scripts and counting round-trips."""
+    
+    def __init__(self, rows):
+        self.rows = rows
+        self.version = 1
+        self.scripts = []
+    
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        if script == sales_history_page.GET_ALL_SALES_SCRIPT:
+            return [list(row) for row in self.rows]
+        if script == sales_history_page.FIND_SALE_SCRIPT:
+            return next((list(row) for row in self.rows if row[0] == args[0]), None)
+        # OBSERVE_MUTATIONS_SCRIPT
+        return {'token': 'page-1', 'versions': {selector: self.version for selector in args[0]}}
+    
+    def reads(self):
+        return sum(script == sales_history_page.GET_ALL_SALES_SCRIPT for script, _ in self.scripts)
+
+
+class TestSalesHistoryPage:
+    """pages.sales_history_page: one-call reads and the cached receipt index."""
+    
+    def test_table_is_read_in_one_round_trip(self):
+        driver = _HistoryDriver(ROWS)
+        
+        sales = SalesHistoryPage(driver).get_all_sales()
+        
+        assert [sale['receipt_number'] for sale in sales] == ['RCP-2', 'RCP-1']
+        assert sales[1]['payment'] == 'Card'
+        assert len(driver.scripts) == 1
+    
+    def test_receipt_lookup_queries_the_row_directly(self):
+        driver = _HistoryDriver(ROWS)
+        page = SalesHistoryPage(driver)
+        
+        assert page.find_sale_by_receipt('RCP-1')['total'] == '$3.00'
+        assert not page.is_sale_in_history('RCP-9')
+        assert driver.reads() == 0
+    
+    def test_cache_is_reused_until_the_table_re_renders(self):
+        driver = _HistoryDriver(ROWS)
+        page = SalesHistoryPage(driver, use_cache=True)
+        
+        assert page.is_sale_in_history('RCP-1') and page.get_sales_count() == 2
+        driver.rows = ROWS + [['RCP-0', '12/31/2024', '1', '$0.99', 'Cash', 'Completed']]
+        assert not page.is_sale_in_history('RCP-0')
+        driver.version += 1
+        
+        assert page.is_sale_in_history('RCP-0')
+        assert driver.reads() == 2
+
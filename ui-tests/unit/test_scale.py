@@ -0,0 +1,48 @@
+"""
+NardPOS UI Automation - Scale Data Unit Tests
+Generated catalogs and sales histories.
+"""
+
+from datetime import datetime
+
+import pytest
+from utils import scale
+
+pytestmark = pytest.mark.unit
+
+
+class TestScaleData:
+    """utils.scale: generated catalogs and sales histories."""
+    
+    def test_products_are_deterministic_and_unique(self):
+        products = scale.generate_products(500, seed=3)
+        
+        assert products == scale.generate_products(500, seed=3)
+        assert products != scale.generate_products(500, seed=4)
+        assert [product['id'] for product in products] == list(range(scale.FIRST_GENERATED_ID, 509))
+        assert len({product['name'] for product in products}) == 500
+        assert all(0.25 <= product['price'] <= 50.0 for product in products)
+    
+    def test_format_sale_date_matches_en_us_locale_string(self):
+        assert scale.format_sale_date(datetime(2025, 1, 5, 0, 7, 9)) == '1/5/2025, 12:07:09 AM'
+        assert scale.format_sale_date(datetime(2025, 12, 31, 12, 0, 0)) == '12/31/2025, 12:00:00 PM'
+        assert scale.format_sale_date(datetime(2025, 7, 4, 23, 59, 1)) == '7/4/2025, 11:59:01 PM'
+    
+    def test_sale_record_shape(self):
+        record = scale.sale_record('RCP-1', datetime(2025, 1, 1, 9, 30), [('Cola', 2), ('Chips', 1)], 7.7)
+        
+        assert record == {
+            'receiptNumber': 'RCP-1', 'date': '1/1/2025, 9:30:00 AM', 'items': 'Cola x2, Chips x1',
+            'itemCount': 3, 'total': '7.70', 'payment': 'cash', 'status': 'Completed',
+        }
+    
+    def test_sales_are_newest_first_with_unique_receipts(self):
+        products = scale.generate_products(20)
+        
+        sales = scale.generate_sales(300, products)
+        
+        assert len({sale['receiptNumber'] for sale in sales}) == 300
+        assert sales[0]['receiptNumber'].endswith('-000300') and sales[-1]['receiptNumber'].endswith('-000001')
+        dates = [datetime.strptime(sale['date'], '%m/%d/%Y, %I:%M:%S %p') for sale in sales]
+        assert dates == sorted(dates, reverse=True) and dates[0] < datetime(2025, 1, 1, 18, 0)
+        assert all(sale['payment'] in scale.PAYMENT_METHODS for sale in sales)
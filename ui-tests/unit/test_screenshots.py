@@ -0,0 +1,92 @@
+"""
+NardPOS UI Automation - Screenshot Pipeline Unit Tests
+Deduplication, Pillow re-encoding and the per-worker manifest.
+"""
+
+import io
+import json
+import os
+
+import pytest
+from PIL import Image
+from utils.screenshots import ScreenshotWriter
+
+pytestmark = pytest.mark.unit
+
+
+def _png(color, size=(40, 30), mode='RGB'):
+    buffer = io.BytesIO()
+    Image.new(mode, size, color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _manifest(writer):
+    with open(writer.manifest_path) as handle:
+        return [json.loads(line) for line in handle]
+
+
+class TestScreenshotWriter:
+    """utils.screenshots: background writes, dedupe and re-encoding."""
+    
+    def test_identical_captures_are_stored_once(self, tmp_path):
+        writer = ScreenshotWriter(str(tmp_path))
+        
+        first = writer.submit(_png('red'), 'cart_before', 'test_cart')
+        second = writer.submit(_png('red'), 'cart_after', 'test_cart')
+        other = writer.submit(_png('blue'), 'receipt', 'test_checkout')
+        writer.close()
+        
+        assert first == second != other
+        assert sorted(os.listdir(tmp_path)) == sorted([
+            os.path.basename(first), os.path.basename(other), os.path.basename(writer.manifest_path),
+        ])
+        entries = _manifest(writer)
+        assert [(entry['name'], entry['test']) for entry in entries] == [
+            ('cart_before', 'test_cart'), ('cart_after', 'test_cart'), ('receipt', 'test_checkout'),
+        ]
+        assert [entry['file'] for entry in entries] == [os.path.basename(path) for path in (first, second, other)]
+    
+    def test_failed_write_does_not_hide_later_captures(self, tmp_path, monkeypatch):
+        writer = ScreenshotWriter(str(tmp_path), max_workers=1)
+        encode = writer._encode
+        
+        def disk_full(png):
+            raise OSError('disk full')
+        
+        monkeypatch.setattr(writer, '_encode', disk_full)
+        path = writer.submit(_png('red'), 'cart')
+        with pytest.raises(OSError, match='disk full'):
+            writer.flush()
+        monkeypatch.setattr(writer, '_encode', encode)
+        writer.submit(_png('red'), 'cart_retry')
+        writer.close()
+        
+        assert os.path.isfile(path)
+        assert [entry['name'] for entry in _manifest(writer)] == ['cart_retry']
+        assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+    
+    def test_scaled_jpeg_output(self, tmp_path):
+        writer = ScreenshotWriter(str(tmp_path), scale=0.5, image_format='jpeg', quality=60)
+        
+        path = writer.submit(_png((255, 0, 0, 128), size=(80, 60), mode='RGBA'), 'receipt')
+        writer.close()
+        
+        assert path.endswith('.jpg')
+        with Image.open(path) as image:
+            assert (image.format, image.size) == ('JPEG', (40, 30))
+    
+    def test_without_dedupe_files_are_named_after_the_capture(self, tmp_path):
+        writer = ScreenshotWriter(str(tmp_path), dedupe=False)
+        
+        first = writer.submit(_png('red'), 'login page')
+        second = writer.submit(_png('red'), 'login page')
+        writer.close()
+        
+        assert first != second
+        assert os.path.basename(first).startswith('login_page_')
+        assert os.path.isfile(first) and os.path.isfile(second)
+        assert not os.path.exists(writer.manifest_path)
+    
+    def test_unsupported_format(self, tmp_path):
+        with pytest.raises(ValueError, match='Unsupported screenshot format: gif'):
+            ScreenshotWriter(str(tmp_path), image_format='gif')
@@ -0,0 +1,67 @@
+"""
+NardPOS UI Automation - Soak Testing Unit Tests
+Sampling, growth, drift and leak thresholds.
+"""
+
+import pytest
+from utils.soak import MemorySampler, SoakRecorder, SoakSample
+
+pytestmark = pytest.mark.unit
+
+
+class _ScriptDriver:
+    """Non-Chromium driver stand-in answering MEMORY_SCRIPT."""
+    
+    def __init__(self, heap_bytes, nodes):
+        self.result = [heap_bytes, nodes]
+    
+    def execute_script(self, script):
+        return self.result
+
+
+def _soak_run(sale_ms, history_ms, samples):
+    recorder = SoakRecorder()
+    for sale, history in zip(sale_ms, history_ms):
+        recorder.record_cycle(sale, history)
+    for cycle, heap_mb, nodes in samples:
+        recorder.add_sample(cycle, heap_mb, nodes, None)
+    return recorder
+
+
+class TestSoak:
+    """utils.soak: sampling, growth, drift and thresholds."""
+    
+    def test_samples_take_the_median_since_the_last_sample(self):
+        recorder = _soak_run([10.0, 30.0, 20.0, 100.0, 300.0], [5.0] * 5,
+                             [(0, 12.0, 100), (3, 12.5, 130), (5, 13.0, 160)])
+        
+        assert [sample.sale_ms for sample in recorder.samples] == [0.0, 20.0, 200.0]
+        assert [sample.history_ms for sample in recorder.samples] == [0.0, 5.0, 5.0]
+    
+    def test_summary_growth_and_drift(self):
+        sale_ms = [10.0] * 90 + [40.0] * 10
+        recorder = _soak_run(sale_ms, [8.0] * 100, [(0, 20.0, 500), (50, 21.0, 500), (100, 32.5, 2500)])
+        
+        assert recorder.summary() == {
+            'cycles': 100, 'heap_growth_mb': 12.5, 'dom_nodes_per_cycle': 20.0,
+            'sale_drift': 4.0, 'history_drift': 1.0,
+        }
+        assert recorder.check(max_heap_growth_mb=10, max_dom_nodes_per_cycle=30, max_latency_drift=3) == [
+            'JS heap grew 12.5MB > 10MB',
+            'sale drift x4.00 > x3',
+        ]
+        assert recorder.check(max_heap_growth_mb=50, max_dom_nodes_per_cycle=30, max_latency_drift=5) == []
+    
+    def test_heap_is_optional_without_devtools(self, tmp_path):
+        sampler = MemorySampler(_ScriptDriver(None, 240))
+        recorder = _soak_run([10.0, 12.0], [5.0, 6.0], [(0, *sampler.sample()[:2]), (2, None, 300)])
+        
+        path = recorder.write_csv(str(tmp_path / 'soak' / 'samples.csv'))
+        
+        assert MemorySampler(_ScriptDriver(3 * 2 ** 20, 240)).sample() == (3.0, 240, None)
+        assert recorder.summary()['heap_growth_mb'] is None
+        assert recorder.check(max_heap_growth_mb=1, max_dom_nodes_per_cycle=10) == [
+            'DOM grew 30.0 nodes/cycle > 10',
+        ]
+        with open(path) as handle:
+            assert handle.read().splitlines()[0] == ','.join(SoakSample._fields)
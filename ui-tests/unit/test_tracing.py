@@ -0,0 +1,85 @@
+"""
+NardPOS UI Automation - Step Tracing Unit Tests
+Nested spans, step summaries and the Chrome trace export.
+"""
+
+import json
+
+import pytest
+from utils import tracing
+
+pytestmark = pytest.mark.unit
+
+
+class _TracedPage:
+    """Page object stand-in for instrument_class()."""
+    
+    def click(self, name):
+        return self.wait(name)
+    
+    def wait(self, name):
+        return f"clicked {name}"
+    
+    def _private(self):
+        return 'untraced'
+    
+    def rows(self):
+        yield 'row'
+
+
+class TestTracing:
+    """utils.tracing: nested spans, step summaries and the Chrome export."""
+    
+    @pytest.fixture
+    def tracer(self):
+        tracer = tracing.start('test_checkout')
+        yield tracer
+        tracing.stop()
+    
+    def test_untraced_calls_go_straight_through(self):
+        tracing.instrument_class(_TracedPage)
+        
+        assert tracing.active_tracer() is None
+        assert _TracedPage().click('pay') == 'clicked pay'
+    
+    def test_instrumented_methods_record_nested_spans(self, tracer):
+        tracing.instrument_class(_TracedPage)
+        tracing.instrument_class(_TracedPage)
+        
+        _TracedPage().click('pay')
+        _TracedPage()._private()
+        list(_TracedPage().rows())
+        
+        events = sorted(tracer.events, key=lambda event: event['ts'])
+        assert [(event['name'], event['depth']) for event in events] == [
+            ('_TracedPage.click', 0), ('_TracedPage.wait', 1),
+        ]
+        assert events[0]['args'] == {'args': "'pay'"}
+        assert events[0]['dur'] >= events[1]['dur']
+    
+    def test_step_summary_aggregates_by_name(self, tracer):
+        for _ in range(3):
+            with tracer.span('POSPage.add_product'):
+                with tracer.span('BasePage.click'):
+                    pass
+        
+        summary = tracer.step_summary()
+        
+        assert [(row['step'], row['calls'], row['depth']) for row in summary] == [
+            ('POSPage.add_product', 3, 0), ('BasePage.click', 3, 1),
+        ]
+        assert summary[0]['max_ms'] <= summary[0]['total_ms']
+        assert "padding-left:24px'>BasePage.click" in tracer.step_table_html()
+    
+    def test_chrome_trace_export(self, tracer, tmp_path):
+        with tracer.span('LoginPage.login', user='test_user'):
+            pass
+        
+        path = tracer.write(str(tmp_path / 'traces' / 'test_checkout.json'))
+        
+        with open(path) as handle:
+            trace = json.load(handle)
+        span, metadata = trace['traceEvents']
+        assert (span['name'], span['cat'], span['ph']) == ('LoginPage.login', 'LoginPage', 'X')
+        assert span['args'] == {'user': 'test_user'} and 'depth' not in span
+        assert metadata['args'] == {'name': 'test_checkout'}
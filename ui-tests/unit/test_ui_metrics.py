@@ -0,0 +1,87 @@
+"""
+NardPOS UI Automation - UI Metrics Unit Tests
+Interaction summaries, DevTools deltas and render budgets.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from utils.ui_metrics import UIMetrics, summary_table_html
+
+pytestmark = pytest.mark.unit
+
+
+class _DevToolsDriver:
+    """Chromium driver stand-in replaying interactions and Performance metrics."""
+    
+    def __init__(self, batches, layout_s):
+        self.batches = list(batches)
+        self.layout_s = list(layout_s)
+        self.commands = []
+    
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append(command)
+        if command == 'Page.addScriptToEvaluateOnNewDocument':
+            return {'identifier': '7'}
+        if command == 'Performance.getMetrics':
+            return {'metrics': [{'name': 'LayoutDuration', 'value': self.layout_s.pop(0)},
+                                {'name': 'ScriptDuration', 'value': 0.25}]}
+        return {}
+    
+    def execute_async_script(self, script):
+        return self.batches.pop(0)
+
+
+def _interaction(name, render_ms, handler_ms=1.0):
+    return {'name': name, 'input_ms': 0.5, 'handler_ms': handler_ms, 'render_ms': render_ms, 'dom_nodes': 40}
+
+
+class TestUIMetrics:
+    """utils.ui_metrics: summaries, budgets and CDP deltas."""
+    
+    def test_requires_devtools(self):
+        with pytest.raises(RuntimeError, match='Chromium'):
+            UIMetrics(SimpleNamespace())
+    
+    def test_collect_summarizes_interactions_and_cdp_deltas(self):
+        clicks = [_interaction('addToCart', ms, handler_ms=ms / 10) for ms in range(10, 101, 10)]
+        driver = _DevToolsDriver(
+            batches=[{'interactions': clicks, 'longTasks': [{'start_ms': 5.0, 'duration_ms': 60.0}]}],
+            layout_s=[1.0, 1.0125],
+        )
+        metrics = UIMetrics(driver).start()
+        
+        summary = metrics.collect()
+        metrics.stop()
+        
+        assert summary['interactions']['addToCart'] == {
+            'count': 10, 'p50_ms': 50.0, 'p95_ms': 100.0, 'max_ms': 100.0, 'handler_ms': 5.5,
+        }
+        assert (summary['long_tasks'], summary['long_task_ms']) == (1, 60.0)
+        assert summary['cdp_ms'] == {'LayoutDuration': 12.5, 'RecalcStyleDuration': 0.0,
+                                     'ScriptDuration': 0.0, 'TaskDuration': 0.0}
+        assert driver.commands[-2:] == ['Page.removeScriptToEvaluateOnNewDocument', 'Performance.disable']
+        assert '<td>addToCart</td><td>10</td><td>50.0</td>' in summary_table_html(summary)
+    
+    def test_check_budget_reports_every_limit(self):
+        driver = _DevToolsDriver(
+            batches=[{'interactions': [_interaction('handleCheckout', 250.0)],
+                      'longTasks': [{'start_ms': 0.0, 'duration_ms': 80.0}] * 2}],
+            layout_s=[0.0, 0.05],
+        )
+        metrics = UIMetrics(driver).start()
+        
+        violations = metrics.check_budget(max_ms=200, max_long_tasks=1, max_layout_ms=20)
+        
+        assert violations == [
+            'handleCheckout: p95 click-to-render 250.0ms > 200ms',
+            '2 long tasks > 1',
+            'layout + style 50.0ms > 20ms',
+        ]
+    
+    def test_missing_interaction_is_a_violation(self):
+        driver = _DevToolsDriver(batches=[{'interactions': [], 'longTasks': []}], layout_s=[0.0, 0.0])
+        metrics = UIMetrics(driver).start()
+        
+        with pytest.raises(AssertionError, match='renderSalesHistory: no interactions recorded'):
+            metrics.assert_budget(interaction='renderSalesHistory', max_ms=200)
@@ -0,0 +1,104 @@
+"""
+NardPOS UI Automation - Visual Regression Unit Tests
+Baselines, masks and the block diff on synthetic screenshots.
+"""
+
+import io
+import json
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+from utils.visual import VisualComparator
+
+pytestmark = pytest.mark.unit
+
+
+def _screen(height=64, width=96):
+    """A synthetic capture: light background with a dark header and a panel."""
+    pixels = np.full((height, width, 3), 240, dtype=np.uint8)
+    pixels[:12] = (40, 60, 90)
+    pixels[20:52, 8:40] = (200, 210, 230)
+    return pixels
+
+
+def _png(pixels):
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class TestVisualComparator:
+    """utils.visual: baselines, masks and the block diff."""
+    
+    RECEIPT = (60, 24, 90, 32)
+    
+    @pytest.fixture
+    def comparator(self, tmp_path):
+        return VisualComparator(str(tmp_path / 'baselines'), str(tmp_path / 'diffs'))
+    
+    @staticmethod
+    def _with_receipt(value):
+        pixels = _screen()
+        pixels[24:32, 60:90] = value
+        return _png(pixels)
+    
+    def test_first_capture_records_a_baseline(self, comparator):
+        result = comparator.compare('pos checkout/receipt', _png(_screen()), [self.RECEIPT])
+        
+        assert result.status == 'new'
+        path = comparator.baseline_path('pos checkout/receipt')
+        assert os.path.basename(path) == 'pos_checkout_receipt.png'
+        with open(path[:-len('.png')] + '.json') as handle:
+            assert json.load(handle)['masks'] == [list(self.RECEIPT)]
+        assert comparator.compare('pos checkout/receipt', _png(_screen()), [self.RECEIPT]).status == 'match'
+    
+    def test_masked_regions_are_ignored(self, comparator):
+        comparator.compare('receipt', self._with_receipt(0), [self.RECEIPT])
+        
+        # Baseline masks apply even when the capture passes none
+        assert comparator.compare('receipt', self._with_receipt(128), [self.RECEIPT]).status == 'match'
+        assert comparator.compare('receipt', self._with_receipt(255), []).status == 'match'
+    
+    def test_changed_block_is_a_mismatch_with_a_diff_image(self, comparator):
+        comparator.compare('cart', _png(_screen()))
+        changed = _screen()
+        changed[20:52, 8:40] = (40, 200, 40)
+        
+        result = comparator.compare('cart', _png(changed))
+        
+        assert (result.status, result.changed_blocks) == ('mismatch', 9)
+        assert result.message.startswith('9 of 24 blocks changed')
+        assert Image.open(result.diff_path).size == (96, 64)
+    
+    def test_tolerance_and_block_allowance(self, tmp_path):
+        comparator = VisualComparator(str(tmp_path / 'baselines'), str(tmp_path / 'diffs'), max_changed_blocks=1)
+        comparator.compare('cart', _png(_screen()))
+        noisy, dot = _screen(), _screen()
+        noisy[20:52, 8:40] += 10
+        dot[40:44, 60:64] = 0
+        
+        assert comparator.compare('cart', _png(noisy)).status == 'match'
+        result = comparator.compare('cart', _png(dot))
+        assert (result.status, result.changed_blocks) == ('match', 1)
+    
+    def test_different_screen_and_size(self, comparator):
+        comparator.compare('history', _png(_screen()))
+        
+        different = comparator.compare('history', _png(255 - _screen()[::-1, ::-1]))
+        resized = comparator.compare('history', _png(_screen(width=80)))
+        
+        assert different.status == 'mismatch' and different.message.startswith('Looks like a different screen')
+        assert different.hash_distance > comparator.max_hash_distance
+        assert resized.message == 'Size changed: baseline 96x64, capture 80x64'
+    
+    def test_update_overwrites_baselines(self, tmp_path):
+        baseline_dir, diff_dir = str(tmp_path / 'baselines'), str(tmp_path / 'diffs')
+        VisualComparator(baseline_dir, diff_dir).compare('login', _png(_screen()))
+        changed = _png(255 - _screen())
+        
+        results = VisualComparator(baseline_dir, diff_dir, update=True).compare_many([('login', changed, ())])
+        
+        assert [result.status for result in results] == ['updated']
+        assert VisualComparator(baseline_dir, diff_dir).compare('login', changed).status == 'match'
@@ -0,0 +1,180 @@
+"""
+NardPOS UI Automation - Watch Mode Unit Tests
+Symbol extraction, change detection and test selection on a miniature suite.
+"""
+
+import sys
+import textwrap
+from types import SimpleNamespace
+
+import pytest
+from utils import watch
+
+pytestmark = pytest.mark.unit
+
+
+# A miniature suite for the watch-mode AST helpers
+WATCH_TREE = {
+    'conftest.py': """
+        import pytest
+        from pages.cart_page import CartPage
+        
+        def pytest_configure(config):
+            pass
+        
+        @pytest.fixture
+        def cart():
+            return CartPage()
+    """,
+    'pages/__init__.py': """
+        from .cart_page import CartPage
+    """,
+    'pages/cart_page.py': """
+        class CartPage:
+            ADD_BUTTON = '#add'
+        
+            def __init__(self):
+                self.items = []
+        
+            def add(self, item):
+                self.items.append(item)
+        
+            def total(self):
+                return len(self.items)
+    """,
+    'utils/report.py': """
+        def total(rows):
+            return sum(rows)
+    """,
+    'test_cart.py': """
+        class TestCart:
+            def test_add(self, cart):
+                cart.add(1)
+        
+            def test_total(self, cart):
+                assert cart.total() == 0
+        
+        def test_standalone():
+            assert True
+    """,
+    'test_report.py': """
+        from utils.report import total
+        
+        def test_report_total():
+            assert total([1]) == 1
+    """,
+}
+
+
+@pytest.fixture
+def watch_tree(tmp_path, monkeypatch):
+    """Write WATCH_TREE under tmp_path and point utils.watch at it."""
+    monkeypatch.setattr(watch, 'ROOT', str(tmp_path))
+    
+    def _write(path, source):
+        full_path = tmp_path / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(textwrap.dedent(source))
+        return str(full_path)
+    
+    paths = {path: _write(path, source) for path, source in WATCH_TREE.items()}
+    return SimpleNamespace(root=tmp_path, paths=paths, write=_write)
+
+
+def _affected(tree, path, source):
+    """Nodeids the watch loop would rerun after saving `source` to `path`."""
+    symbols = {full_path: watch.parse_symbols(full_path) for full_path in tree.paths.values()}
+    imports = {full_path: watch.local_imports(full_path) for full_path in tree.paths.values()}
+    full_path = tree.write(path, source)
+    new_symbols = watch.parse_symbols(full_path)
+    changes = {full_path: watch.changed_names(symbols[full_path], new_symbols)}
+    symbols[full_path] = new_symbols
+    return watch.affected_tests(symbols, imports, changes)
+
+
+class TestWatch:
+    """utils.watch: symbol extraction, change detection and test selection."""
+    
+    def test_parse_symbols_gives_tests_their_nodeids(self, watch_tree):
+        symbols = watch.parse_symbols(watch_tree.paths['test_cart.py'])
+        
+        nodeids = {symbol.name: symbol.nodeid for symbol in symbols}
+        assert nodeids == {
+            'TestCart': None,
+            'test_add': 'test_cart.py::TestCart::test_add',
+            'test_total': 'test_cart.py::TestCart::test_total',
+            'test_standalone': 'test_cart.py::test_standalone',
+        }
+    
+    def test_parse_symbols_attributes_constructor_to_class(self, watch_tree):
+        symbols = watch.parse_symbols(watch_tree.paths['pages/cart_page.py'])
+        
+        assert [symbol.name for symbol in symbols] == ['CartPage', 'ADD_BUTTON', 'CartPage', 'add', 'total']
+        assert 'items' in symbols[3].refs
+    
+    def test_changed_names_ignores_formatting(self, watch_tree):
+        path = watch_tree.paths['pages/cart_page.py']
+        old = watch.parse_symbols(path)
+        source = WATCH_TREE['pages/cart_page.py'].replace(
+            'return len(self.items)', 'return len( self.items )  # count'
+        )
+        
+        new = watch.parse_symbols(watch_tree.write('pages/cart_page.py', source))
+        assert watch.changed_names(old, new) == set()
+    
+    def test_changed_names_reports_edited_added_and_removed(self, watch_tree):
+        path = watch_tree.paths['pages/cart_page.py']
+        old = watch.parse_symbols(path)
+        source = WATCH_TREE['pages/cart_page.py'].replace(
+            'return len(self.items)', 'return sum(self.items)'
+        ).replace("ADD_BUTTON = '#add'", "CLEAR_BUTTON = '#clear'")
+        
+        new = watch.parse_symbols(watch_tree.write('pages/cart_page.py', source))
+        
+        assert watch.changed_names(old, new) == {'total', 'ADD_BUTTON', 'CLEAR_BUTTON'}
+    
+    def test_edited_method_reruns_tests_calling_it(self, watch_tree):
+        source = WATCH_TREE['pages/cart_page.py'].replace('self.items.append(item)', 'self.items.insert(0, item)')
+        
+        assert _affected(watch_tree, 'pages/cart_page.py', source) == ['test_cart.py::TestCart::test_add']
+    
+    def test_same_name_in_unimported_module_does_not_spread(self, watch_tree):
+        # utils.report.total shares its name with CartPage.total
+        source = WATCH_TREE['utils/report.py'].replace('sum(rows)', 'sum(rows) or 0')
+        
+        assert _affected(watch_tree, 'utils/report.py', source) == ['test_report.py::test_report_total']
+    
+    def test_changed_fixture_reruns_its_users(self, watch_tree):
+        source = WATCH_TREE['conftest.py'].replace('return CartPage()', 'return CartPage() or None')
+        
+        assert _affected(watch_tree, 'conftest.py', source) == [
+            'test_cart.py::TestCart::test_add', 'test_cart.py::TestCart::test_total',
+        ]
+    
+    def test_changed_conftest_hook_reruns_everything(self, watch_tree):
+        source = WATCH_TREE['conftest.py'].replace('pass', 'config.option.verbose = 1')
+        
+        assert _affected(watch_tree, 'conftest.py', source) is None
+    
+    def test_local_imports_resolves_package_relative_imports(self, watch_tree):
+        imports = watch.local_imports(watch_tree.paths['pages/__init__.py'])
+        
+        assert imports == {'pages.cart_page', 'pages.cart_page.CartPage'}
+    
+    def test_local_imports_of_absolute_imports(self, watch_tree):
+        imports = watch.local_imports(watch_tree.paths['conftest.py'])
+        
+        assert imports == {'pytest', 'pages.cart_page', 'pages.cart_page.CartPage'}
+    
+    def test_unload_drops_package_of_edited_page(self, watch_tree, monkeypatch):
+        for name in ('pages', 'pages.cart_page', 'conftest', 'test_cart'):
+            if name in sys.modules:
+                # unload() pops from sys.modules; restore the suite's own modules afterwards
+                monkeypatch.setitem(sys.modules, name, sys.modules[name])
+        watcher = watch.Watcher()
+        try:
+            stale = watcher.unload([watch_tree.paths['pages/cart_page.py']])
+        finally:
+            watcher.close()
+        
+        assert stale == {'pages.cart_page', 'pages', 'conftest'}
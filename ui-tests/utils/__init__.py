@@ -0,0 +1,4 @@
+"""
+NardPOS UI Automation - Test Utilities
+Helpers shared by the fixtures and hooks in conftest.py.
+"""
@@ -0,0 +1,264 @@
+"""
+NardPOS UI Automation - Browser Management
+Creates WebDriver instances and keeps one browser alive per pytest worker.
+"""
+
+import json
+import os
+import tempfile
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.common.selenium_manager import SeleniumManager
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+WINDOW_SIZE = (1920, 1080)
+
+# Chrome switches that strip work a test browser never needs
+LEAN_CHROME_ARGUMENTS = (
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-client-side-phishing-detection',
+    '--disable-domain-reliability',
+    '--metrics-recording-only',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--no-service-autorun',
+    '--password-store=basic',
+    '--mute-audio',
+)
+NO_IMAGES_ARGUMENT = '--blink-settings=imagesEnabled=false'
+
+# Resolved driver/browser paths survive between runs so Selenium Manager
+# is only consulted when the cache is missing or stale
+DRIVER_CACHE_PATH = os.path.expanduser(os.getenv(
+    'DRIVER_CACHE_PATH', os.path.join('~', '.cache', 'nardpos', 'drivers.json')
+))
+_resolved_drivers = {}
+
+
+def lean_chrome_arguments(disable_images=False):
+    """Return the lean preset, optionally with image loading turned off."""
+    arguments = list(LEAN_CHROME_ARGUMENTS)
+    if disable_images:
+        arguments.append(NO_IMAGES_ARGUMENT)
+    return arguments
+
+
+def _read_driver_cache():
+    try:
+        with open(DRIVER_CACHE_PATH) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def resolve_driver(browser_name, options, refresh=False):
+    """
+    Return the driver binary path for `browser_name`, cached on disk.
+
+    Fills options.binary_location with the cached browser path too, exactly
+    as Selenium Manager would have done.
+
+    Args:
+        browser_name: 'chrome' or 'firefox'
+        options: The browser Options the driver will be started with
+        refresh: Ignore the cache and ask Selenium Manager again
+    """
+    entry = None if refresh else _resolved_drivers.get(browser_name)
+    if entry is None and not refresh:
+        entry = _read_driver_cache().get(browser_name)
+    if entry is None or not os.path.isfile(entry['driver_path']):
+        driver_path = SeleniumManager().driver_location(options)
+        entry = {'driver_path': driver_path,
+                 'browser_path': getattr(options, 'binary_location', '') or ''}
+        cache = _read_driver_cache()
+        cache[browser_name] = entry
+        try:
+            os.makedirs(os.path.dirname(DRIVER_CACHE_PATH), exist_ok=True)
+            with open(DRIVER_CACHE_PATH, 'w') as handle:
+                json.dump(cache, handle, indent=2)
+        except OSError:
+            # Read-only home directory: keep the in-process cache only
+            pass
+    elif entry['browser_path'] and not getattr(options, 'binary_location', ''):
+        options.binary_location = entry['browser_path']
+    _resolved_drivers[browser_name] = entry
+    return entry['driver_path']
+
+
+def chrome_options(headless=False, lean=False, disable_images=False, profile_dir=None):
+    """Build the ChromeOptions every launch path shares."""
+    options = ChromeOptions()
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument(f'--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}')
+    options.add_argument('--disable-gpu')
+    if lean:
+        for argument in lean_chrome_arguments(disable_images):
+            options.add_argument(argument)
+    elif disable_images:
+        options.add_argument(NO_IMAGES_ARGUMENT)
+    if profile_dir:
+        options.add_argument(f'--user-data-dir={profile_dir}')
+    return options
+
+
+def create_browser(browser_name='chrome', headless=False, implicit_wait=0,
+                   temp_dir=None, driver_port=0, lean=False, disable_images=False):
+    """
+    Launch a new Chrome or Firefox WebDriver instance.
+
+    Args:
+        browser_name: 'chrome' or 'firefox' (anything else falls back to Chrome)
+        headless: Run the browser without a visible window
+        implicit_wait: Implicit wait in seconds applied to the driver
+        temp_dir: Private directory for the browser profile and temp files,
+            so parallel workers never share a profile
+        driver_port: Port for chromedriver/geckodriver (0 picks a free port)
+        lean: Chrome only - apply LEAN_CHROME_ARGUMENTS
+        disable_images: Don't load images (Chrome: blink setting, Firefox: pref)
+
+    Returns:
+        A configured WebDriver instance
+    """
+    env = None
+    profile_dir = None
+    if temp_dir:
+        profile_dir = tempfile.mkdtemp(prefix='profile-', dir=temp_dir)
+        env = dict(os.environ, TMPDIR=temp_dir, TEMP=temp_dir, TMP=temp_dir)
+
+    if browser_name == 'firefox':
+        options = FirefoxOptions()
+        if headless:
+            options.add_argument('--headless')
+        options.add_argument('--width=1920')
+        options.add_argument('--height=1080')
+        if profile_dir:
+            options.add_argument('-profile')
+            options.add_argument(profile_dir)
+        if disable_images:
+            options.set_preference('permissions.default.image', 2)
+        browser = _start_with_cached_driver(
+            'firefox', options,
+            lambda path: webdriver.Firefox(
+                options=options, service=FirefoxService(path, port=driver_port, env=env)
+            ),
+        )
+    else:
+        # Default to Chrome
+        options = chrome_options(headless, lean, disable_images, profile_dir)
+        browser = _start_with_cached_driver(
+            'chrome', options,
+            lambda path: webdriver.Chrome(
+                options=options, service=ChromeService(path, port=driver_port, env=env)
+            ),
+        )
+
+    browser.implicitly_wait(implicit_wait)
+    browser.maximize_window()
+    return browser
+
+
+def _start_with_cached_driver(browser_name, options, start):
+    """
+    Call start(driver_path) with the cached driver, re-resolving it once
+    if the session can't be created (e.g. the browser auto-updated).
+    """
+    try:
+        return start(resolve_driver(browser_name, options))
+    except SessionNotCreatedException:
+        return start(resolve_driver(browser_name, options, refresh=True))
+
+
+def reset_app_state(browser):
+    """
+    Return a reused browser to a pristine state between tests.
+
+    The mock app keeps its cart, salesHistory, login/dashboard visibility
+    and modal state in page memory only, so unloading the document drops
+    all of it. Storage and cookies are cleared first in case the app starts
+    persisting a session later.
+    """
+    try:
+        browser.execute_script(
+            "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+        )
+    except WebDriverException:
+        # Nothing to clear on pages without storage access (about:blank, errors)
+        pass
+    browser.delete_all_cookies()
+    if len(browser.window_handles) > 1:
+        # Close any windows a test opened and keep the first one
+        main_window = browser.window_handles[0]
+        for handle in browser.window_handles[1:]:
+            browser.switch_to.window(handle)
+            browser.close()
+        browser.switch_to.window(main_window)
+    browser.get('about:blank')
+
+
+class BrowserSession:
+    """
+    Hands out one long-lived browser per pytest worker.
+
+    The browser is launched lazily on first use, reset between tests and
+    transparently replaced when the WebDriver session breaks (crashed
+    browser, closed window, lost chromedriver).
+    """
+
+    def __init__(self, factory):
+        """
+        Args:
+            factory: Zero-argument callable that launches a new browser
+        """
+        self.factory = factory
+        self.browser = None
+        self.launches = 0
+
+    def acquire(self):
+        """Return a live browser, launching a new one if needed."""
+        if self.browser is not None and not self.is_alive():
+            self.discard()
+        if self.browser is None:
+            self.browser = self.factory()
+            self.launches += 1
+        return self.browser
+
+    def is_alive(self):
+        """Check whether the current WebDriver session still responds."""
+        try:
+            self.browser.current_window_handle
+            return True
+        except WebDriverException:
+            return False
+
+    def reset(self):
+        """Reset app state after a test, dropping the browser if that fails."""
+        if self.browser is None:
+            return
+        try:
+            reset_app_state(self.browser)
+        except WebDriverException:
+            self.discard()
+
+    def discard(self):
+        """Quit the current browser, ignoring errors from a dead session."""
+        if self.browser is None:
+            return
+        try:
+            self.browser.quit()
+        except WebDriverException:
+            pass
+        self.browser = None
+
+    def close(self):
+        """Quit the browser at the end of the session."""
+        self.discard()
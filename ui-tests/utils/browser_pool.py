@@ -0,0 +1,390 @@
+"""
+NardPOS UI Automation - Warm Browser Pool
+A long-lived local process that keeps headless Chrome instances launched,
+sized and idle, and leases them to pytest runs and xdist workers over a
+small HTTP API. Test processes attach through the browser's DevTools port,
+so a rerun skips driver resolution and the cold browser start.
+
+Run with:  python -m utils.browser_pool --size 4 --port 9555
+Then:      BROWSER_POOL_URL=http://127.0.0.1:9555 pytest -n 4
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import URLError
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import Request, urlopen
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+from .browser import _start_with_cached_driver, chrome_options, reset_app_state, resolve_driver
+
+DEFAULT_PORT = 9555
+STARTUP_TIMEOUT = 20
+# Leases expire unless the client renews them; a killed pytest run or xdist
+# worker stops renewing, so its browser is reclaimed instead of leaking
+LEASE_TTL = 60
+
+
+class BrowserPoolError(Exception):
+    """The pool could not be reached or could not provide a browser."""
+
+
+class PooledProcess:
+    """One headless Chrome process with its own profile and DevTools port."""
+
+    def __init__(self, binary, arguments, temp_dir=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.profile_dir = tempfile.mkdtemp(prefix='pool-profile-', dir=temp_dir)
+        # Port 0 lets Chrome pick a free port and write it to DevToolsActivePort
+        self.process = subprocess.Popen(
+            [binary, '--remote-debugging-port=0', f'--user-data-dir={self.profile_dir}']
+            + arguments + ['about:blank'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        self.port = self._wait_for_devtools()
+
+    def _wait_for_devtools(self):
+        port_file = os.path.join(self.profile_dir, 'DevToolsActivePort')
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                with open(port_file) as handle:
+                    port = int(handle.readline().strip())
+                urlopen(f'http://127.0.0.1:{port}/json/version', timeout=1).close()
+                return port
+            except (OSError, ValueError):
+                time.sleep(0.05)
+        self.terminate()
+        raise BrowserPoolError('Chrome did not open its DevTools port in time')
+
+    @property
+    def debugger_address(self):
+        return f'127.0.0.1:{self.port}'
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+    def terminate(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+class BrowserPool:
+    """
+    Keeps `size` idle browsers ready; leases beyond that launch on demand.
+
+    Released browsers go back to the idle set (the client resets app state
+    before releasing) unless they died or the client asked to recycle them.
+    Leases not renewed within `lease_ttl` seconds are reclaimed.
+    """
+
+    def __init__(self, size=2, headless=True, lean=True, disable_images=False, lease_ttl=LEASE_TTL):
+        self.size = size
+        self.lease_ttl = lease_ttl
+        self.reclaimed = 0
+        self._lock = threading.Lock()
+        self._idle = deque()
+        self._leased = {}
+        # lease id -> time.monotonic() deadline
+        self._expires = {}
+        self._launching = 0
+        self._closed = False
+        self._temp_dir = tempfile.mkdtemp(prefix='nardpos-pool-')
+        options = chrome_options(headless=headless, lean=lean, disable_images=disable_images)
+        resolve_driver('chrome', options)
+        if not options.binary_location:
+            raise BrowserPoolError('Could not locate a Chrome binary')
+        self.binary = options.binary_location
+        self.arguments = list(options.arguments)
+
+    def start(self):
+        """Launch the initial idle browsers in parallel."""
+        self._refill()
+        return self
+
+    def _launch(self):
+        return PooledProcess(self.binary, self.arguments, self._temp_dir)
+
+    def _refill(self):
+        with self._lock:
+            missing = self.size - len(self._idle) - self._launching
+            self._launching += max(missing, 0)
+        for _ in range(max(missing, 0)):
+            threading.Thread(target=self._launch_idle, daemon=True).start()
+
+    def _launch_idle(self):
+        try:
+            browser = self._launch()
+        except BrowserPoolError:
+            browser = None
+        with self._lock:
+            self._launching -= 1
+            if browser is None:
+                return
+            if self._closed:
+                browser.terminate()
+            else:
+                self._idle.append(browser)
+
+    def lease(self):
+        """Hand out a live browser, launching one if none is idle."""
+        self._reclaim_expired()
+        browser = None
+        with self._lock:
+            while self._idle:
+                candidate = self._idle.popleft()
+                if candidate.is_alive():
+                    browser = candidate
+                    break
+                candidate.terminate()
+        if browser is None:
+            browser = self._launch()
+        with self._lock:
+            self._leased[browser.id] = browser
+            self._expires[browser.id] = time.monotonic() + self.lease_ttl
+        self._refill()
+        return {'id': browser.id, 'debugger_address': browser.debugger_address, 'ttl': self.lease_ttl}
+
+    def renew(self, lease_id):
+        """Extend a lease by lease_ttl; returns False once it was released or reclaimed."""
+        with self._lock:
+            if lease_id not in self._leased:
+                return False
+            self._expires[lease_id] = time.monotonic() + self.lease_ttl
+            return True
+
+    def _reclaim_expired(self):
+        """Terminate leased browsers whose client stopped renewing them."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [lease_id for lease_id, deadline in self._expires.items() if deadline <= now]
+            browsers = [self._leased.pop(lease_id) for lease_id in expired]
+            for lease_id in expired:
+                del self._expires[lease_id]
+            self.reclaimed += len(browsers)
+        for browser in browsers:
+            browser.terminate()
+        return len(browsers)
+
+    def release(self, lease_id, recycle=False):
+        """Return a leased browser; returns False for unknown lease ids."""
+        with self._lock:
+            browser = self._leased.pop(lease_id, None)
+            if browser is None:
+                return False
+            del self._expires[lease_id]
+            keep = not recycle and not self._closed and browser.is_alive() and \
+                len(self._idle) < self.size
+            if keep:
+                self._idle.append(browser)
+        if not keep:
+            browser.terminate()
+            self._refill()
+        return True
+
+    def status(self):
+        self._reclaim_expired()
+        with self._lock:
+            return {'size': self.size, 'idle': len(self._idle), 'leased': len(self._leased),
+                    'launching': self._launching, 'reclaimed': self.reclaimed}
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            browsers = list(self._idle) + list(self._leased.values())
+            self._idle.clear()
+            self._leased.clear()
+            self._expires.clear()
+        for browser in browsers:
+            browser.terminate()
+        shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+
+class BrowserPoolRequestHandler(BaseHTTPRequestHandler):
+    """POST /lease, POST /renew/<id>, POST /release/<id>[?recycle=1], GET /status."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if urlsplit(self.path).path == '/status':
+            self._send_json(200, self.server.pool.status())
+        else:
+            self._send_json(404, {'message': 'Not found'})
+
+    def do_POST(self):
+        parts = urlsplit(self.path)
+        try:
+            if parts.path == '/lease':
+                self._send_json(200, self.server.pool.lease())
+            elif parts.path.startswith('/renew/'):
+                renewed = self.server.pool.renew(parts.path[len('/renew/'):])
+                self._send_json(200 if renewed else 404, {'renewed': renewed})
+            elif parts.path.startswith('/release/'):
+                recycle = parse_qs(parts.query).get('recycle', ['0'])[0] == '1'
+                released = self.server.pool.release(parts.path[len('/release/'):], recycle)
+                self._send_json(200 if released else 404, {'released': released})
+            else:
+                self._send_json(404, {'message': 'Not found'})
+        except BrowserPoolError as error:
+            self._send_json(503, {'message': str(error)})
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class BrowserPoolServer(ThreadingHTTPServer):
+    """HTTP front end for a BrowserPool."""
+
+    daemon_threads = True
+
+    def __init__(self, pool, host='127.0.0.1', port=DEFAULT_PORT):
+        super().__init__((host, port), BrowserPoolRequestHandler)
+        self.pool = pool
+
+
+def _call_pool(pool_url, path, timeout):
+    try:
+        with urlopen(Request(pool_url.rstrip('/') + path, method='POST'), timeout=timeout) as response:
+            return json.load(response)
+    except (URLError, OSError, ValueError) as error:
+        raise BrowserPoolError(f"Browser pool at {pool_url} is unavailable: {error}") from error
+
+
+def lease_browser(pool_url, timeout=STARTUP_TIMEOUT):
+    """Lease a browser: returns {'id', 'debugger_address', 'ttl'}."""
+    return _call_pool(pool_url, '/lease', timeout)
+
+
+def renew_lease(pool_url, lease_id):
+    """Keep a lease alive; False once the pool no longer knows it."""
+    try:
+        return _call_pool(pool_url, f"/renew/{lease_id}", 5)['renewed']
+    except BrowserPoolError:
+        return False
+
+
+def release_browser(pool_url, lease_id, recycle=False):
+    """Give a leased browser back to the pool."""
+    try:
+        _call_pool(pool_url, f"/release/{lease_id}{'?recycle=1' if recycle else ''}", 5)
+    except BrowserPoolError:
+        # Pool already gone; its shutdown terminates the browser anyway
+        pass
+
+
+class PooledChrome(webdriver.Chrome):
+    """
+    Chrome WebDriver attached to a pooled browser.
+
+    A background thread renews the lease while the driver is open. quit()
+    resets the app state, ends the chromedriver session (an attached
+    browser keeps running) and hands the browser back to the pool.
+    """
+
+    def __init__(self, pool_url, lease, **kwargs):
+        self.pool_url = pool_url
+        self.lease = lease
+        # Set before connecting: a failed session start calls quit() itself
+        self._released = threading.Event()
+        super().__init__(**kwargs)
+        threading.Thread(target=self._keep_lease, daemon=True).start()
+
+    def _keep_lease(self):
+        interval = self.lease.get('ttl', LEASE_TTL) / 4
+        while not self._released.wait(interval):
+            renew_lease(self.pool_url, self.lease['id'])
+
+    def quit(self):
+        self._released.set()
+        recycle = False
+        try:
+            reset_app_state(self)
+        except WebDriverException:
+            recycle = True
+        try:
+            super().quit()
+        finally:
+            release_browser(self.pool_url, self.lease['id'], recycle)
+
+
+def create_pooled_browser(pool_url, implicit_wait=0):
+    """
+    Attach a WebDriver to a browser leased from the pool at `pool_url`.
+
+    Raises:
+        BrowserPoolError: The pool is not running or could not launch Chrome
+    """
+    lease = lease_browser(pool_url)
+    options = ChromeOptions()
+    options.debugger_address = lease['debugger_address']
+    try:
+        browser = _start_with_cached_driver(
+            'chrome', options,
+            lambda path: PooledChrome(pool_url, lease, options=options, service=ChromeService(path)),
+        )
+    except WebDriverException:
+        release_browser(pool_url, lease['id'], recycle=True)
+        raise
+    # Pool browsers are launched at WINDOW_SIZE already
+    browser.implicitly_wait(implicit_wait)
+    return browser
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep warm headless Chrome browsers for test runs')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--size', type=int, default=int(os.getenv('BROWSER_POOL_SIZE', 2)),
+                        help='Idle browsers to keep ready (use the xdist worker count)')
+    parser.add_argument('--show', action='store_true', help='Launch visible browsers')
+    parser.add_argument('--full', action='store_true', help="Don't apply the lean options preset")
+    parser.add_argument('--no-images', action='store_true', help='Disable image loading')
+    parser.add_argument('--lease-ttl', type=float, default=LEASE_TTL,
+                        help='Seconds a lease survives without renewal')
+    args = parser.parse_args()
+
+    pool = BrowserPool(args.size, headless=not args.show, lean=not args.full,
+                       disable_images=args.no_images, lease_ttl=args.lease_ttl).start()
+    server = BrowserPoolServer(pool, args.host, args.port)
+    print(f"NardPOS browser pool ({args.size} browsers) listening on "
+          f"http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+
+
+if __name__ == '__main__':
+    main()
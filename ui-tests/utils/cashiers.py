@@ -0,0 +1,175 @@
+"""
+NardPOS UI Automation - Multi-Cashier Simulation
+Runs independent cashier sessions concurrently, one browser each, creating
+sales through POSPage, then reports throughput, latency and duplicate
+receipt numbers across all sessions.
+"""
+
+import math
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from pages.login_page import LoginPage
+from pages.pos_page import POSPage
+
+from .loadgen import percentile
+
+# The app draws receipts from RCP-YYYYMMDD- plus 1000..9999
+RECEIPT_SPACE = 9000
+PAYMENT_METHODS = ('cash', 'card', 'mobile')
+
+CashierResult = namedtuple('CashierResult', ['cashier', 'receipts', 'latencies_ms', 'finished_at', 'error'])
+# finished_at: time.perf_counter() when the shift ended
+
+
+def collision_probability(receipts, space=RECEIPT_SPACE):
+    """Birthday-bound chance of at least one duplicate among `receipts` draws."""
+    return 1 - math.exp(-receipts * (receipts - 1) / (2 * space))
+
+
+def run_cashier(cashier, factory, base_url, credentials, sales, seed=None, ready=None):
+    """
+    One cashier shift: own browser, in-page login, `sales` checkouts.
+
+    Errors end the shift early and are returned rather than raised, so one
+    broken session doesn't hide the others' results.
+
+    Args:
+        ready: threading.Barrier shared by all cashiers, passed once logged
+            in (or on failure), so every shift starts selling together
+    """
+    rng = random.Random(seed)
+    receipts, latencies = [], []
+    browser = None
+    waiting = ready is not None
+    try:
+        browser = factory()
+        browser.get(base_url)
+        if not LoginPage(browser).login_in_page(credentials['username'], credentials['password']):
+            return CashierResult(cashier, receipts, latencies, time.perf_counter(),
+                                 'login did not reach the dashboard')
+        pos_page = POSPage(browser)
+        catalog = [product['id'] for product in pos_page.get_catalog()]
+        if waiting:
+            waiting = False
+            ready.wait()
+        for _ in range(sales):
+            product_ids = rng.sample(catalog, rng.randint(1, 3))
+            start = time.perf_counter()
+            receipts.append(pos_page.create_sale_with_products(product_ids, rng.choice(PAYMENT_METHODS)))
+            latencies.append((time.perf_counter() - start) * 1000)
+        finished_at = time.perf_counter()
+    except Exception as error:
+        return CashierResult(cashier, receipts, latencies, time.perf_counter(),
+                             f"{type(error).__name__}: {error}")
+    finally:
+        if waiting:
+            # Don't hold the other cashiers back
+            ready.wait()
+        if browser is not None:
+            browser.quit()
+    return CashierResult(cashier, receipts, latencies, finished_at, None)
+
+
+class SimulationReport:
+    """
+    Results of every cashier session.
+
+    `elapsed` covers the selling only, from the moment every cashier was
+    logged in; browser launch and login time is `startup`.
+    """
+
+    def __init__(self, results, elapsed, startup=0.0):
+        self.results = sorted(results, key=lambda result: result.cashier)
+        self.elapsed = elapsed
+        self.startup = startup
+
+    @property
+    def receipts(self):
+        return [receipt for result in self.results for receipt in result.receipts]
+
+    @property
+    def errors(self):
+        return {result.cashier: result.error for result in self.results if result.error}
+
+    def duplicates(self):
+        """Receipts issued more than once, mapped to (cashier, sale index) pairs."""
+        seen = {}
+        for result in self.results:
+            for index, receipt in enumerate(result.receipts):
+                seen.setdefault(receipt, []).append((result.cashier, index))
+        return {receipt: issued for receipt, issued in seen.items() if len(issued) > 1}
+
+    def summary(self):
+        sales = len(self.receipts)
+        sessions = {}
+        for result in self.results:
+            ordered = sorted(result.latencies_ms)
+            sessions[result.cashier] = {
+                'sales': len(ordered),
+                'p50_ms': round(percentile(ordered, 50), 1),
+                'p95_ms': round(percentile(ordered, 95), 1),
+                'max_ms': round(ordered[-1], 1) if ordered else 0.0,
+            }
+        return {
+            'cashiers': len(self.results),
+            'sales': sales,
+            'startup_s': round(self.startup, 2),
+            'elapsed_s': round(self.elapsed, 2),
+            'checkouts_per_s': round(sales / self.elapsed, 2) if self.elapsed else 0.0,
+            'duplicates': len(self.duplicates()),
+            'collision_probability': round(collision_probability(sales), 3),
+            'sessions': sessions,
+        }
+
+    def format(self):
+        summary = self.summary()
+        lines = [
+            f"{summary['cashiers']} cashiers, {summary['sales']} sales in {summary['elapsed_s']}s "
+            f"({summary['checkouts_per_s']} checkouts/s) after {summary['startup_s']}s launching "
+            f"browsers and logging in",
+            f"{'Cashier':<10}{'Sales':>7}{'p50':>9}{'p95':>9}{'Max':>9}",
+        ]
+        for cashier, row in summary['sessions'].items():
+            lines.append(f"{cashier:<10}{row['sales']:>7}{row['p50_ms']:>9.1f}"
+                         f"{row['p95_ms']:>9.1f}{row['max_ms']:>9.1f}")
+        lines.append(f"Duplicate receipts: {summary['duplicates']} "
+                     f"(birthday bound for {summary['sales']} receipts: "
+                     f"{summary['collision_probability']:.1%})")
+        for receipt, issued in self.duplicates().items():
+            lines.append(f"  {receipt}: " + ', '.join(f"cashier {c} sale {i}" for c, i in issued))
+        for cashier, error in self.errors.items():
+            lines.append(f"  cashier {cashier} stopped early: {error}")
+        return '\n'.join(lines)
+
+
+def simulate_cashiers(factory, base_url, credentials, cashiers=4, sales_per_cashier=25, seed=None):
+    """
+    Run `cashiers` concurrent sessions of `sales_per_cashier` checkouts.
+
+    Args:
+        factory: Zero-argument callable launching an independent browser
+        base_url: App URL every cashier opens
+        credentials: Dict with username and password
+        seed: Makes each cashier's product/payment choices reproducible
+
+    Returns:
+        SimulationReport; throughput is measured from the moment the last
+        cashier logged in, so browser startup doesn't dilute it
+    """
+    selling_since = []
+    ready = threading.Barrier(cashiers, action=lambda: selling_since.append(time.perf_counter()))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=cashiers) as executor:
+        futures = [
+            executor.submit(run_cashier, cashier, factory, base_url, credentials,
+                            sales_per_cashier, None if seed is None else seed + cashier, ready)
+            for cashier in range(1, cashiers + 1)
+        ]
+        results = [future.result() for future in futures]
+    selling_start = selling_since[0] if selling_since else time.perf_counter()
+    finished = max(result.finished_at for result in results)
+    return SimulationReport(results, max(finished - selling_start, 0.0), selling_start - start)
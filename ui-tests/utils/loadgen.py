@@ -0,0 +1,283 @@
+"""
+NardPOS UI Automation - API Load Generator
+Replays the checkout requests from postman_collection.json under load and
+reports throughput and latency percentiles per endpoint.
+
+Closed loop: N virtual cashiers repeat the scenario back to back.
+Open loop:   scenarios start at a fixed arrival rate regardless of how fast
+             the server answers, with latency measured from the scheduled
+             start so queueing delay is not hidden (no coordinated omission).
+
+Examples:
+    python -m utils.loadgen --local --mode closed --concurrency 8 --duration 10
+    python -m utils.loadgen --base-url http://localhost:3000 --mode open --rate 50 \\
+        --budget p95=100 --budget "Create Sale - Valid Payload:p99=250"
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .postman import CHAINED_URLS, EXTRA_CAPTURES, CollectionRunner, load_collection, use_variables
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+COLLECTION_PATH = os.path.join(PROJECT_ROOT, 'postman_collection.json')
+
+# One checkout session, in order, using the collection's request definitions
+SCENARIO = (
+    'Login - Valid Credentials',
+    'Get Products - With Token',
+    'Create Sale - Valid Payload',
+    'Get Sale by ID - Valid ID',
+    'Get Archived Sales - With Token',
+)
+SCENARIO_STEP = 'scenario'
+PERCENTILES = (50, 95, 99)
+# Histogram bucket upper bounds in milliseconds
+HISTOGRAM_BOUNDS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+Budget = namedtuple('Budget', ['step', 'percentile', 'max_ms'])
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def parse_budget(text):
+    """
+    Parse 'p95=100' (all endpoints) or '<request name>:p99=250'.
+
+    Returns:
+        Budget(step, percentile, max_ms); step None applies to every endpoint
+    """
+    step, _, rule = text.rpartition(':')
+    name, _, value = rule.partition('=')
+    if not name.startswith('p') or not value:
+        raise ValueError(f"Invalid latency budget: {text!r} (expected e.g. p95=100)")
+    return Budget(step or None, float(name[1:]), float(value))
+
+
+class LoadStats:
+    """Thread-safe latency samples and error counts per step."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+        self.started = None
+        self.finished = None
+
+    def record(self, step, latency_ms, ok=True):
+        with self._lock:
+            self.samples.setdefault(step, []).append(latency_ms)
+            if not ok:
+                self.errors[step] = self.errors.get(step, 0) + 1
+
+    @property
+    def elapsed(self):
+        return max((self.finished or time.perf_counter()) - self.started, 1e-9)
+
+    def summary(self):
+        """Per-step count, throughput, error count and percentiles."""
+        result = {}
+        for step, values in self.samples.items():
+            ordered = sorted(values)
+            row = {
+                'count': len(ordered),
+                'errors': self.errors.get(step, 0),
+                'throughput_rps': len(ordered) / self.elapsed,
+                'mean_ms': sum(ordered) / len(ordered),
+                'max_ms': ordered[-1],
+            }
+            for pct in PERCENTILES:
+                row[f'p{pct}_ms'] = percentile(ordered, pct)
+            result[step] = row
+        return result
+
+    def histogram(self, step):
+        """Counts per HISTOGRAM_BOUNDS bucket (last bucket is open-ended)."""
+        counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        for value in self.samples.get(step, []):
+            index = next((i for i, bound in enumerate(HISTOGRAM_BOUNDS) if value <= bound),
+                         len(HISTOGRAM_BOUNDS))
+            counts[index] += 1
+        return counts
+
+    def check_budgets(self, budgets):
+        """Return a message for every budget that was exceeded."""
+        violations = []
+        for budget in budgets:
+            steps = [budget.step] if budget.step else [s for s in self.samples if s != SCENARIO_STEP]
+            for step in steps:
+                ordered = sorted(self.samples.get(step, []))
+                if not ordered:
+                    violations.append(f"{step}: no samples recorded")
+                    continue
+                actual = percentile(ordered, budget.percentile)
+                if actual > budget.max_ms:
+                    violations.append(
+                        f"{step}: p{budget.percentile:g} {actual:.1f}ms > {budget.max_ms:g}ms"
+                    )
+        return violations
+
+    def format_report(self):
+        """Human readable table plus a latency histogram per step."""
+        lines = [f"Elapsed: {self.elapsed:.2f}s"]
+        header = f"{'Step':<36}{'Count':>8}{'Errors':>8}{'RPS':>9}" + \
+            ''.join(f"{'p%d' % pct:>9}" for pct in PERCENTILES) + f"{'Max':>9}"
+        lines.append(header)
+        lines.append('-' * len(header))
+        for step, row in self.summary().items():
+            lines.append(
+                f"{step[:35]:<36}{row['count']:>8}{row['errors']:>8}{row['throughput_rps']:>9.1f}"
+                + ''.join(f"{row[f'p{pct}_ms']:>9.1f}" for pct in PERCENTILES)
+                + f"{row['max_ms']:>9.1f}"
+            )
+        for step in self.samples:
+            counts = self.histogram(step)
+            peak = max(counts) or 1
+            lines.append(f"\nLatency histogram - {step}")
+            labels = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS] + [f">{HISTOGRAM_BOUNDS[-1]}ms"]
+            for label, count in zip(labels, counts):
+                if count:
+                    lines.append(f"  {label:>9} {'#' * max(1, int(40 * count / peak))} {count}")
+        return '\n'.join(lines)
+
+
+class LoadGenerator:
+    """Drives the checkout scenario in closed- or open-loop mode."""
+
+    def __init__(self, base_url, concurrency=8, collection_path=COLLECTION_PATH,
+                 scenario=SCENARIO, timeout=10):
+        requests_, variables = load_collection(collection_path)
+        # Each virtual user reads back the sale it created, not fixture id 1
+        requests_ = use_variables(requests_, CHAINED_URLS)
+        by_name = {request.name: request for request in requests_}
+        missing = [name for name in scenario if name not in by_name]
+        if missing:
+            raise ValueError(f"Requests not found in collection: {', '.join(missing)}")
+        self.steps = [by_name[name] for name in scenario]
+        self.variables = dict(variables, base_url=base_url)
+        self.concurrency = concurrency
+        self.runner = CollectionRunner(self.steps, self.variables, max_workers=concurrency,
+                                       timeout=timeout, captures=EXTRA_CAPTURES)
+        self.stats = LoadStats()
+
+    def run_scenario(self, scheduled_at=None):
+        """Run every step once with this virtual user's own variables."""
+        variables = dict(self.variables)
+        started = time.perf_counter()
+        for request in self.steps:
+            result = self.runner.send(request, variables)
+            expected = request.expected_status
+            ok = result.error is None and (
+                result.status == expected if expected is not None
+                else result.status is not None and 200 <= result.status < 300
+            )
+            self.stats.record(request.name, result.latency_ms, ok)
+            self.runner.capture(request, result, variables)
+        # Open loop measures from the planned start to expose queueing delay
+        origin = scheduled_at if scheduled_at is not None else started
+        self.stats.record(SCENARIO_STEP, (time.perf_counter() - origin) * 1000)
+
+    def run_closed(self, duration=None, iterations=None):
+        """Each of `concurrency` users repeats the scenario back to back."""
+        if duration is None and iterations is None:
+            raise ValueError("Closed loop needs a duration or an iteration count")
+        self.stats.started = time.perf_counter()
+        deadline = self.stats.started + duration if duration else None
+
+        def user():
+            done = 0
+            while (iterations is None or done < iterations) and \
+                    (deadline is None or time.perf_counter() < deadline):
+                self.run_scenario()
+                done += 1
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for future in [executor.submit(user) for _ in range(self.concurrency)]:
+                future.result()
+        self.stats.finished = time.perf_counter()
+        return self.stats
+
+    def run_open(self, rate, duration):
+        """Start `rate` scenarios per second for `duration` seconds."""
+        self.stats.started = time.perf_counter()
+        total = int(rate * duration)
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for index in range(total):
+                scheduled_at = self.stats.started + index / rate
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(executor.submit(self.run_scenario, scheduled_at))
+            for future in futures:
+                future.result()
+        self.stats.finished = time.perf_counter()
+        return self.stats
+
+    def close(self):
+        self.runner.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='NardPOS API load generator')
+    parser.add_argument('--base-url', default=os.getenv('API_BASE_URL'),
+                        help='API root (default: API_BASE_URL)')
+    parser.add_argument('--local', action='store_true',
+                        help='Start the in-process mock server and load it (offline)')
+    parser.add_argument('--mode', choices=('closed', 'open'), default='closed')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run')
+    parser.add_argument('--iterations', type=int, help='Closed loop: scenarios per user')
+    parser.add_argument('--rate', type=float, default=20.0, help='Open loop: scenarios per second')
+    parser.add_argument('--budget', action='append', default=[], type=parse_budget,
+                        help="Latency budget, e.g. p95=100 or 'Create Sale - Valid Payload:p99=250'")
+    parser.add_argument('--json', help='Write the summary as JSON to this path')
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.local:
+        from .mock_server import NardPOSServer
+        server = NardPOSServer().start()
+        args.base_url = server.url
+    if not args.base_url:
+        parser.error('Pass --base-url, set API_BASE_URL or use --local')
+
+    generator = LoadGenerator(args.base_url, concurrency=args.concurrency)
+    try:
+        if args.mode == 'open':
+            stats = generator.run_open(args.rate, args.duration)
+        elif args.iterations:
+            stats = generator.run_closed(iterations=args.iterations)
+        else:
+            stats = generator.run_closed(duration=args.duration)
+    finally:
+        generator.close()
+        if server is not None:
+            server.stop()
+
+    print(stats.format_report())
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(stats.summary(), handle, indent=2)
+
+    violations = stats.check_budgets(args.budget)
+    for violation in violations:
+        print(f"BUDGET EXCEEDED - {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
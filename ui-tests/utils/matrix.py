@@ -0,0 +1,134 @@
+"""
+NardPOS UI Automation - Cross-Browser Matrix
+Helpers for running the UI suite on several browsers in one invocation
+(BROWSERS=chrome,firefox) and comparing test and step timings across them.
+"""
+
+import html
+import statistics
+
+# A browser counts as slower when it takes this much longer than the fastest
+# one, and by at least MIN_DELTA_MS so millisecond steps don't flag jitter
+DEFAULT_SLOWDOWN = 1.5
+MIN_DELTA_MS = 20.0
+FLAGGED_STYLE = ' style="color:#c00"'
+
+
+def parse_browsers(value, default):
+    """'chrome, Firefox,chrome' -> ['chrome', 'firefox']; `default` when empty."""
+    browsers = [name.strip().lower() for name in (value or '').split(',') if name.strip()]
+    return list(dict.fromkeys(browsers)) or [default]
+
+
+def without_browser_id(name, browser):
+    """
+    Drop the browser's parameter id from a test name or nodeid, so the same
+    test lines up across browsers ('test_a[firefox]' -> 'test_a',
+    'test_b[x10-firefox]' -> 'test_b[x10]').
+    """
+    base, bracket, ids = name.partition('[')
+    if not bracket:
+        return name
+    kept = [part for part in ids[:-1].split('-') if part != browser]
+    return f"{base}[{'-'.join(kept)}]" if kept else base
+
+
+class BrowserMatrix:
+    """
+    Collects per-browser timings from pytest reports (xdist controller side).
+
+    Reads the 'browser' user_property set for every browser test, the call
+    duration and, with TRACE_STEPS, 'step_timings'.
+    """
+
+    def __init__(self, slowdown=DEFAULT_SLOWDOWN, min_delta_ms=MIN_DELTA_MS):
+        self.slowdown = slowdown
+        self.min_delta_ms = min_delta_ms
+        self.browsers = []
+        # test -> browser -> ms
+        self.tests = {}
+        # step -> browser -> [total ms per test]
+        self.steps = {}
+
+    def add_report(self, report):
+        if report.when != 'call' or not report.passed:
+            return
+        properties = dict(report.user_properties)
+        browser = properties.get('browser')
+        if browser is None:
+            return
+        if browser not in self.browsers:
+            self.browsers.append(browser)
+        test = without_browser_id(report.nodeid, browser)
+        self.tests.setdefault(test, {})[browser] = report.duration * 1000
+        for step, ms in properties.get('step_timings', {}).items():
+            self.steps.setdefault(step, {}).setdefault(browser, []).append(ms)
+
+    def rows(self, kind):
+        """
+        Rows of tests or steps measured on at least two browsers, the
+        largest spread first.
+
+        Args:
+            kind: 'test' or 'step'; steps are compared by their mean total
+                per test
+
+        Returns:
+            List of (name, {browser: ms}, slowest browser, slowest/fastest
+            ratio, flagged) tuples
+        """
+        if kind == 'test':
+            timings = self.tests
+        else:
+            timings = {step: {browser: statistics.fmean(values) for browser, values in by_browser.items()}
+                       for step, by_browser in self.steps.items()}
+        rows = []
+        for name, by_browser in timings.items():
+            if len(by_browser) < 2:
+                continue
+            slowest = max(by_browser, key=by_browser.get)
+            fastest = min(by_browser.values())
+            ratio = by_browser[slowest] / fastest if fastest else float('inf')
+            flagged = ratio >= self.slowdown and by_browser[slowest] - fastest >= self.min_delta_ms
+            rows.append((name, by_browser, slowest, ratio, flagged))
+        return sorted(rows, key=lambda row: (-row[3], row[0]))
+
+    def format(self):
+        """Side-by-side text tables for the terminal summary."""
+        lines = []
+        for kind, title in (('test', 'Test'), ('step', 'Step (mean ms per test)')):
+            rows = self.rows(kind)
+            if not rows:
+                continue
+            width = max(len(title), *(len(row[0]) for row in rows))
+            lines.append(f"{title:<{width}}" + ''.join(f"{browser:>11}" for browser in self.browsers)
+                         + "   slowest")
+            for name, by_browser, slowest, ratio, flagged in rows:
+                values = ''.join(
+                    f"{by_browser[browser]:>9.1f}ms" if browser in by_browser else f"{'-':>11}"
+                    for browser in self.browsers
+                )
+                lines.append(f"{name:<{width}}{values}   {slowest} x{ratio:.2f}" + ('  SLOWER' if flagged else ''))
+            lines.append('')
+        return '\n'.join(lines).rstrip()
+
+    def html(self):
+        """The same tables for the pytest-html summary."""
+        tables = []
+        for kind, title in (('test', 'Test'), ('step', 'Step (mean ms per test)')):
+            rows = self.rows(kind)
+            if not rows:
+                continue
+            head = ''.join(f"<th>{html.escape(browser)} (ms)</th>" for browser in self.browsers)
+            body = ''.join(
+                f"<tr{FLAGGED_STYLE if flagged else ''}><td>{html.escape(name)}</td>"
+                + ''.join(f"<td>{by_browser[browser]:.1f}</td>" if browser in by_browser else "<td>-</td>"
+                          for browser in self.browsers)
+                + f"<td>{html.escape(slowest)} x{ratio:.2f}</td></tr>"
+                for name, by_browser, slowest, ratio, flagged in rows
+            )
+            tables.append(
+                f"<table class='browser-matrix'><thead><tr><th>{title}</th>{head}<th>Slowest</th></tr></thead>"
+                f"<tbody>{body}</tbody></table>"
+            )
+        return ''.join(tables)
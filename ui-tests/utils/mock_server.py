@@ -0,0 +1,283 @@
+"""
+NardPOS UI Automation - In-Process Mock Server
+A threaded stand-in for the NardPOS backend that implements the API
+routes used by postman_collection.json and serves mock-ui over HTTP.
+
+Run standalone with:  python -m utils.mock_server --port 3000
+"""
+
+import argparse
+import json
+import mimetypes
+import os
+import re
+import secrets
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+MOCK_UI_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'mock-ui'
+)
+
+VALID_USERS = {
+    'test_user': {'id': 1, 'password': '123456', 'tenant_id': 'TENANT-001'},
+}
+
+# Same catalog as mock-ui/index.html
+PRODUCTS = [
+    {'id': 1, 'name': 'Coca-Cola 330ml', 'price': 1.50},
+    {'id': 2, 'name': 'Pepsi 500ml', 'price': 1.75},
+    {'id': 3, 'name': 'Lays Chips', 'price': 2.25},
+    {'id': 4, 'name': 'Snickers Bar', 'price': 1.25},
+    {'id': 5, 'name': 'Mineral Water', 'price': 0.99},
+    {'id': 6, 'name': 'Coffee', 'price': 2.50},
+    {'id': 7, 'name': 'Sandwich', 'price': 4.99},
+    {'id': 8, 'name': 'Apple', 'price': 0.75},
+]
+
+SALE_ID_PATTERN = re.compile(r'^/sales/([^/]+)$')
+ARCHIVE_PATHS = ('/sales-arc/archive', '/sales/archive')
+
+
+class ApiError(Exception):
+    """An error response with an HTTP status and a JSON message."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class SalesStore:
+    """
+    Thread-safe in-memory sales storage.
+
+    Sales are indexed by id and by receipt number so lookups stay O(1)
+    however many sales a test or load run creates.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self.by_id = {}
+        self.by_receipt = {}
+        self.archived = []
+        self.tokens = set()
+        # Seed data expected by the collection: sale 1 exists, sale 10 does not
+        self.create({
+            'items': [{'product_id': 1, 'name': 'Coca-Cola 330ml', 'quantity': 2, 'unit_price': 150}],
+            'payment_method': 'cash',
+        })
+        self.archived.append({
+            'id': 0,
+            'receipt_number': 'RCP-20250101-0001',
+            'total': 300,
+            'payment_method': 'card',
+            'status': 'archived',
+            'created_at': '2025-01-01T09:00:00',
+        })
+
+    def issue_token(self):
+        token = secrets.token_hex(48)
+        with self._lock:
+            self.tokens.add(token)
+        return token
+
+    def is_valid_token(self, token):
+        return token in self.tokens
+
+    def create(self, payload):
+        """Validate a sale payload and store it; raises ApiError(400) when invalid."""
+        items = payload.get('items') if isinstance(payload, dict) else None
+        if not isinstance(items, list) or not items:
+            raise ApiError(400, 'Invalid payload: items are required')
+        for item in items:
+            if not isinstance(item, dict) or 'product_id' not in item:
+                raise ApiError(400, 'Invalid payload: each item needs a product_id')
+            if not isinstance(item.get('quantity', 1), int) or item.get('quantity', 1) <= 0:
+                raise ApiError(400, 'Invalid payload: quantity must be a positive integer')
+
+        total = payload.get('Total', payload.get('total'))
+        if total is None:
+            total = sum(item.get('unit_price', 0) * item.get('quantity', 1) for item in items)
+
+        with self._lock:
+            sale_id = self._next_id
+            self._next_id += 1
+            now = datetime.now()
+            sale = {
+                'id': sale_id,
+                'receipt_number': f"RCP-{now:%Y%m%d}-{sale_id:06d}",
+                'items': items,
+                'total': total,
+                'payment_method': payload.get('payment_method', 'cash'),
+                'status': 'completed',
+                'created_at': now.isoformat(timespec='seconds'),
+            }
+            self.by_id[sale_id] = sale
+            self.by_receipt[sale['receipt_number']] = sale
+        return sale
+
+    def get(self, sale_id):
+        return self.by_id.get(sale_id)
+
+
+class NardPOSRequestHandler(BaseHTTPRequestHandler):
+    """Routes API calls to the store and everything else to mock-ui files."""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without TCP_NODELAY every
+    # keep-alive response waits ~40ms on the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # Keep test output clean; the runner reports latencies itself
+        pass
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def _dispatch(self, method):
+        path = urlsplit(self.path).path.rstrip('/') or '/'
+        try:
+            if method == 'POST' and path == '/auth/login':
+                self._login()
+            elif method == 'GET' and path == '/products':
+                self._authorize()
+                self._send_json(200, {'products': PRODUCTS, 'count': len(PRODUCTS)})
+            elif method == 'POST' and path == '/sales':
+                self._authorize()
+                self._send_json(201, self.server.store.create(self._read_json()))
+            elif method == 'GET' and path in ARCHIVE_PATHS:
+                self._authorize()
+                archived = self.server.store.archived
+                self._send_json(200, {'sales': archived, 'count': len(archived)})
+            elif method == 'GET' and SALE_ID_PATTERN.match(path):
+                self._authorize()
+                self._get_sale(SALE_ID_PATTERN.match(path).group(1))
+            elif method == 'GET':
+                self._send_static(path)
+            else:
+                raise ApiError(404, 'Not found')
+        except ApiError as error:
+            self._send_json(error.status, {'message': error.message})
+
+    def _login(self):
+        payload = self._read_json()
+        username = payload.get('username') if isinstance(payload, dict) else None
+        password = payload.get('password') if isinstance(payload, dict) else None
+        user = VALID_USERS.get(username)
+        if user is None or user['password'] != password:
+            raise ApiError(401, 'Invalid username or password')
+        self._send_json(200, {
+            'access_token': self.server.store.issue_token(),
+            'refresh_token': secrets.token_hex(24),
+            'token_type': 'Bearer',
+            'expires_in': 3600,
+            'user': {'id': user['id'], 'username': username, 'tenant_id': user['tenant_id']},
+        })
+
+    def _get_sale(self, raw_id):
+        if not raw_id.isdigit():
+            raise ApiError(400, 'Invalid sale id format')
+        sale = self.server.store.get(int(raw_id))
+        if sale is None:
+            raise ApiError(404, 'Sale not found')
+        self._send_json(200, sale)
+
+    def _authorize(self):
+        header = self.headers.get('Authorization', '')
+        scheme, _, token = header.partition(' ')
+        if scheme != 'Bearer' or not self.server.store.is_valid_token(token.strip()):
+            raise ApiError(401, 'Unauthorized: missing or invalid token')
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            raise ApiError(400, 'Invalid JSON body')
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_static(self, path):
+        if path == '/':
+            path = '/index.html'
+        root = os.path.realpath(self.server.static_dir)
+        file_path = os.path.realpath(os.path.join(root, path.lstrip('/')))
+        if not file_path.startswith(root + os.sep) or not os.path.isfile(file_path):
+            raise ApiError(404, 'Not found')
+        with open(file_path, 'rb') as handle:
+            body = handle.read()
+        self.send_response(200)
+        self.send_header('Content-Type', mimetypes.guess_type(file_path)[0] or 'application/octet-stream')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class NardPOSServer(ThreadingHTTPServer):
+    """
+    Threaded NardPOS stand-in bound on construction.
+
+    The listening socket exists as soon as the object is created, so clients
+    can connect immediately after start() without any startup sleep.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, static_dir=MOCK_UI_DIR):
+        super().__init__((host, port), NardPOSRequestHandler)
+        self.static_dir = static_dir
+        self.store = SalesStore()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve requests on a background daemon thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name='nardpos-mock', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the NardPOS mock backend')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3000)
+    args = parser.parse_args()
+
+    server = NardPOSServer(args.host, args.port)
+    print(f"NardPOS mock server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
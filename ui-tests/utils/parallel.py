@@ -0,0 +1,141 @@
+"""
+NardPOS UI Automation - Parallel Execution Helpers
+Worker-aware artifact naming and duration-based scheduling for pytest-xdist.
+"""
+
+import os
+import re
+import statistics
+from datetime import datetime
+
+try:
+    from xdist.scheduler import LoadScheduling
+except ImportError:  # pytest-xdist is optional for serial runs
+    LoadScheduling = object
+
+DURATIONS_CACHE_KEY = 'nardpos/durations'
+# Weight of the newest run when smoothing recorded durations
+DURATION_SMOOTHING = 0.5
+
+
+def worker_id():
+    """Return the xdist worker id ('gw0', 'gw1', ...) or 'master' for serial runs."""
+    return os.getenv('PYTEST_XDIST_WORKER', 'master')
+
+
+def worker_index():
+    """Return the numeric index of the current xdist worker (0 for serial runs)."""
+    match = re.search(r'(\d+)$', worker_id())
+    return int(match.group(1)) if match else 0
+
+
+def is_xdist_worker(config):
+    """Check whether this pytest process is an xdist worker."""
+    return hasattr(config, 'workerinput')
+
+
+def artifact_path(directory, name, extension):
+    """
+    Build an artifact path that is unique across workers and fast reruns.
+
+    Serial runs keep the original '<name>_<timestamp>' layout; under xdist the
+    worker id is added. Timestamps include microseconds so two captures in
+    the same second never overwrite each other.
+    """
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    name = name.replace(' ', '_')
+    if worker_id() != 'master':
+        name = f"{name}_{worker_id()}"
+    return os.path.join(directory, f"{name}_{timestamp}.{extension}")
+
+
+def load_durations(config):
+    """Load per-test durations (seconds, keyed by nodeid) from earlier runs."""
+    # No cache attribute at all with -p no:cacheprovider
+    cache = getattr(config, 'cache', None)
+    if cache is None:
+        return {}
+    return cache.get(DURATIONS_CACHE_KEY, {})
+
+
+def save_durations(config, previous, current):
+    """Merge this run's durations into the cache, smoothing against older runs."""
+    cache = getattr(config, 'cache', None)
+    if cache is None or not current:
+        return
+    merged = dict(previous)
+    for nodeid, duration in current.items():
+        if nodeid in merged:
+            duration = DURATION_SMOOTHING * duration + (1 - DURATION_SMOOTHING) * merged[nodeid]
+        merged[nodeid] = round(duration, 4)
+    cache.set(DURATIONS_CACHE_KEY, merged)
+
+
+def order_by_duration(nodeids, durations):
+    """
+    Return collection indices ordered longest-first.
+
+    Tests without history are assumed to take the median known duration,
+    so a new test neither jumps the queue nor ends up last.
+    """
+    known = [durations[nodeid] for nodeid in nodeids if nodeid in durations]
+    default = statistics.median(known) if known else 0.0
+    return sorted(
+        range(len(nodeids)),
+        key=lambda index: (-durations.get(nodeids[index], default), index),
+    )
+
+
+class DurationScheduling(LoadScheduling):
+    """
+    xdist scheduler that balances workers using recorded test durations.
+
+    Tests are handed out longest-first and each worker is kept topped up
+    with at most two pending tests, which is greedy LPT scheduling: long
+    tests start early and short ones fill the gaps at the end of the run.
+    """
+
+    def __init__(self, config, log=None):
+        super().__init__(config, log)
+        self.durations = load_durations(config)
+
+    def schedule(self):
+        """Distribute the first tests round-robin, longest first."""
+        assert self.collection_is_completed
+
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(self.node2collection.values())[0]
+        self.pending[:] = order_by_duration(self.collection, self.durations)
+        if not self.collection:
+            return
+
+        # Two rounds so every worker has a next item queued
+        for _ in range(2):
+            for node in self.nodes:
+                self._send_tests(node, 1)
+
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    def check_schedule(self, node, duration=0):
+        """Top the node back up to two pending tests."""
+        if node.shutting_down:
+            return
+
+        if self.pending:
+            node_pending = self.node2pending[node]
+            if len(node_pending) < 2:
+                self._send_tests(node, 2 - len(node_pending))
+        else:
+            node.shutdown()
+
+        self.log("num items waiting for node:", len(self.pending))
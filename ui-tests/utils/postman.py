@@ -0,0 +1,265 @@
+"""
+NardPOS UI Automation - Postman Collection Runner
+Runs postman_collection.json natively in Python: one pooled HTTP session,
+variables resolved like Postman, and independent requests sent concurrently.
+"""
+
+import json
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+VARIABLE_PATTERN = re.compile(r'\{\{\s*([\w.-]+)\s*\}\}')
+STATUS_PATTERN = re.compile(r'to\.have\.status\(\s*(\d{3})\s*\)')
+DESCRIPTION_STATUS_PATTERN = re.compile(r'should return (\d{3})')
+RESPONSE_TIME_PATTERN = re.compile(r'responseTime\)\.to\.be\.below\(\s*(\d+)\s*\)')
+# pm.collectionVariables.set('access_token', jsonData.access_token)
+CAPTURE_PATTERN = re.compile(
+    r"pm\.(?:collectionVariables|environment|globals|variables)\.set\(\s*"
+    r"['\"]([\w.-]+)['\"]\s*,\s*jsonData\.([\w.]+)\s*\)"
+)
+
+PostmanRequest = namedtuple('PostmanRequest', [
+    'name', 'folder', 'method', 'url', 'headers', 'body', 'description',
+    'expected_status', 'max_response_ms', 'captures',
+])
+
+RequestResult = namedtuple('RequestResult', [
+    'name', 'method', 'url', 'status', 'latency_ms', 'json', 'text', 'error',
+    'missing_captures',
+])
+
+# Values postman_collection.json relies on but does not capture in its own scripts
+EXTRA_CAPTURES = {
+    'Create Sale - Valid Payload': {'sale_id': 'id'},
+}
+# Fetch the sale the run created instead of the exported fixture id, which
+# also orders the request after the create (see use_variables)
+CHAINED_URLS = {
+    'Get Sale by ID - Valid ID': {'/sales/1': '/sales/{{sale_id}}'},
+}
+
+
+def _script_source(item, listen):
+    """Join the exec lines of an item's 'test' or 'prerequest' script."""
+    for event in item.get('event', []):
+        if event.get('listen') == listen:
+            return '\n'.join(event.get('script', {}).get('exec', []))
+    return ''
+
+
+def _parse_request(item, folder):
+    request = item['request']
+    url = request['url']
+    url = url.get('raw', '') if isinstance(url, dict) else url
+    headers = [(header['key'], header['value'])
+               for header in request.get('header', []) if not header.get('disabled')]
+    body = (request.get('body') or {}).get('raw') or ''
+    description = request.get('description', '') or ''
+    tests = _script_source(item, 'test')
+
+    status = STATUS_PATTERN.search(tests) or DESCRIPTION_STATUS_PATTERN.search(description)
+    response_time = RESPONSE_TIME_PATTERN.search(tests)
+    return PostmanRequest(
+        name=item['name'],
+        folder=folder,
+        method=request.get('method', 'GET').upper(),
+        url=url,
+        headers=headers,
+        body=body,
+        description=description,
+        expected_status=int(status.group(1)) if status else None,
+        max_response_ms=int(response_time.group(1)) if response_time else None,
+        captures=dict(CAPTURE_PATTERN.findall(tests)),
+    )
+
+
+def load_collection(path):
+    """
+    Load every request of a Postman v2.1 collection, in run order.
+
+    Returns:
+        (requests, variables) - list of PostmanRequest and the collection
+        variables as a dict
+    """
+    with open(path) as handle:
+        collection = json.load(handle)
+
+    parsed = []
+
+    def walk(items, folder):
+        for item in items:
+            if 'item' in item:
+                walk(item['item'], item['name'])
+            else:
+                parsed.append(_parse_request(item, folder))
+
+    walk(collection.get('item', []), '')
+    variables = {var['key']: var.get('value', '') for var in collection.get('variable', [])}
+    return parsed, variables
+
+
+def load_environment(path):
+    """Load the enabled values of a Postman environment export."""
+    with open(path) as handle:
+        environment = json.load(handle)
+    return {value['key']: value.get('value', '')
+            for value in environment.get('values', []) if value.get('enabled', True)}
+
+
+def resolve(template, variables):
+    """Replace {{name}} placeholders; unknown variables are left untouched."""
+    return VARIABLE_PATTERN.sub(
+        lambda match: str(variables.get(match.group(1), match.group(0))), template
+    )
+
+
+def used_variables(request):
+    """Names of the {{variables}} a request reads from its URL, headers or body."""
+    text = ' '.join([request.url, request.body] + [value for _, value in request.headers])
+    return set(VARIABLE_PATTERN.findall(text))
+
+
+def use_variables(requests_, replacements):
+    """
+    Swap literal parts of request URLs for {{variables}}, e.g. an exported
+    fixture id for the id an earlier request captures. dependency_levels
+    then orders each rewritten request after the one producing its value.
+
+    Args:
+        replacements: {request name: {literal: replacement}}, e.g.
+            {'Get Sale': {'/sales/1': '/sales/{{sale_id}}'}}
+    """
+    rewritten = []
+    for request in requests_:
+        url = request.url
+        for literal, replacement in replacements.get(request.name, {}).items():
+            if literal not in url:
+                raise ValueError(f"{request.name}: '{literal}' not found in {url}")
+            url = url.replace(literal, replacement)
+        rewritten.append(request._replace(url=url))
+    return rewritten
+
+
+def dependency_levels(requests_, extra_captures=None):
+    """
+    Group requests into levels that can run concurrently.
+
+    A request depends on the closest earlier request that captures a
+    variable it uses (e.g. everything sending {{access_token}} waits for
+    the login). Level 0 has no dependencies, level 1 only depends on level
+    0, and so on; collection order is preserved within each level.
+    """
+    extra_captures = extra_captures or {}
+    producers = {}
+    levels = []
+    for index, request in enumerate(requests_):
+        depends_on = [producers[name] for name in used_variables(request) if name in producers]
+        levels.append(1 + max((levels[i] for i in depends_on), default=-1))
+        captured = set(request.captures) | set(extra_captures.get(request.name, {}))
+        for name in captured:
+            producers[name] = index
+
+    grouped = {}
+    for index, level in enumerate(levels):
+        grouped.setdefault(level, []).append(requests_[index])
+    return [grouped[level] for level in sorted(grouped)]
+
+
+def _lookup(data, path):
+    """Follow a dotted path (user.tenant_id) through parsed JSON."""
+    for key in path.split('.'):
+        if isinstance(data, dict) and key in data:
+            data = data[key]
+        else:
+            return None
+    return data
+
+
+class CollectionRunner:
+    """
+    Execute a Postman collection over one pooled requests.Session.
+
+    Variables resolve Postman-style: values captured during the run win
+    over the environment, which wins over collection variables.
+    """
+
+    def __init__(self, requests_, variables, max_workers=8, timeout=10, captures=None):
+        """
+        Args:
+            requests_: PostmanRequest list from load_collection
+            variables: Merged collection + environment variables
+            max_workers: Concurrent requests per dependency level
+            timeout: Per-request timeout in seconds
+            captures: Extra {request name: {variable: json path}} captures for
+                values the collection scripts don't set themselves
+        """
+        self.requests = requests_
+        self.variables = dict(variables)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.captures = captures or {}
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def run(self):
+        """Run all requests level by level and return results keyed by name."""
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for level in dependency_levels(self.requests, self.captures):
+                snapshot = dict(self.variables)
+                for result in executor.map(lambda request: self.send(request, snapshot), level):
+                    results[result.name] = result
+                for request in level:
+                    self.capture(request, results[request.name])
+        return results
+
+    def send(self, request, variables=None):
+        """Send a single request and time it."""
+        variables = self.variables if variables is None else variables
+        url = resolve(request.url, variables)
+        if '://' not in url:
+            url = f'http://{url}'
+        headers = {key: resolve(value, variables) for key, value in request.headers}
+        body = resolve(request.body, variables).encode() if request.body else None
+
+        start = time.perf_counter()
+        try:
+            response = self.session.request(
+                request.method, url, headers=headers, data=body, timeout=self.timeout
+            )
+        except requests.RequestException as error:
+            latency_ms = (time.perf_counter() - start) * 1000
+            return RequestResult(request.name, request.method, url, None, latency_ms,
+                                 None, '', str(error), [])
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        # Only the collection's own captures are asserted by its test scripts
+        missing = [name for name, path in request.captures.items()
+                   if response.ok and _lookup(data, path) is None]
+        return RequestResult(request.name, request.method, url, response.status_code,
+                             latency_ms, data, response.text, None, missing)
+
+    def capture(self, request, result, variables=None):
+        """Store values the request's test script saves for later requests."""
+        variables = self.variables if variables is None else variables
+        if result.status is None or not 200 <= result.status < 300:
+            return
+        wanted = dict(request.captures, **self.captures.get(request.name, {}))
+        for name, path in wanted.items():
+            value = _lookup(result.json, path)
+            if value is not None:
+                variables[name] = value
+
+    def close(self):
+        self.session.close()
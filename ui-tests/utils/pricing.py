@@ -0,0 +1,132 @@
+"""
+NardPOS UI Automation - Cart Pricing Reference Model
+Vectorized re-implementation of the mock app's cart math (updateCart and
+handleCheckout) for checking thousands of randomized carts at once.
+
+A cart is a sequence of operations, mirroring the app's handlers:
+    ADD        addToCart(id)
+    INCREMENT  updateQuantity(id, 1)    - no-op unless the item is in the cart
+    DECREMENT  updateQuantity(id, -1)   - removes the item at quantity 0
+    REMOVE     removeFromCart(id)
+"""
+
+from collections import namedtuple
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+
+ADD, INCREMENT, DECREMENT, REMOVE = range(4)
+PAD = -1
+TAX_RATE = 0.10
+OPERATION_NAMES = {ADD: 'add', INCREMENT: '+1', DECREMENT: '-1', REMOVE: 'remove'}
+# Relative frequency of ADD, INCREMENT, DECREMENT, REMOVE in generated carts
+OPERATION_WEIGHTS = (0.55, 0.2, 0.15, 0.1)
+
+CartBatch = namedtuple('CartBatch', ['operations', 'products'])
+PriceMismatch = namedtuple('PriceMismatch', ['cart', 'steps', 'expected', 'rendered'])
+
+
+def generate_carts(count, product_count, max_operations=12, seed=None):
+    """
+    Build `count` random carts of 1..max_operations operations each.
+
+    Returns:
+        CartBatch of two (count, max_operations) int arrays: operation codes
+        (PAD after the cart's last operation) and catalog indexes
+    """
+    rng = np.random.default_rng(seed)
+    operations = rng.choice(4, size=(count, max_operations), p=OPERATION_WEIGHTS)
+    products = rng.integers(0, product_count, size=(count, max_operations))
+    lengths = rng.integers(1, max_operations + 1, size=count)
+    operations[np.arange(max_operations)[None, :] >= lengths[:, None]] = PAD
+    # Every cart starts with an add so the page renders a non-empty cart
+    operations[:, 0] = ADD
+    return CartBatch(operations, products)
+
+
+def expected_totals(batch, prices):
+    """
+    Compute subtotal, tax and total for every cart with float64 arithmetic
+    in the same order as the app's JavaScript.
+
+    Operations are replayed slot by slot (all carts at once per slot). The
+    subtotal is then accumulated in cart insertion order, because
+    cart.reduce() sums in that order and float addition is not associative.
+
+    Returns:
+        (subtotal, tax, total) float64 arrays of shape (count,)
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    count, slots = batch.operations.shape
+    rows = np.arange(count)
+    quantities = np.zeros((count, len(prices)), dtype=np.int64)
+    # Insertion position of each line item; re-adding a removed item appends it
+    positions = np.full((count, len(prices)), np.iinfo(np.int64).max, dtype=np.int64)
+
+    for slot in range(slots):
+        operation = batch.operations[:, slot]
+        product = batch.products[:, slot]
+        current = quantities[rows, product]
+        in_cart = current > 0
+        delta = np.where(operation == ADD, 1, 0)
+        delta = np.where((operation == INCREMENT) & in_cart, 1, delta)
+        delta = np.where((operation == DECREMENT) & in_cart, -1, delta)
+        updated = np.where(operation == REMOVE, 0, current + delta)
+        quantities[rows, product] = updated
+        added = (operation == ADD) & ~in_cart
+        positions[rows[added], product[added]] = slot
+
+    order = np.argsort(positions, axis=1, kind='stable')
+    line_totals = np.take_along_axis(prices[None, :] * quantities, order, axis=1)
+    subtotal = np.zeros(count, dtype=np.float64)
+    for column in range(line_totals.shape[1]):
+        # Absent items add 0.0, which leaves every float64 sum unchanged
+        subtotal = subtotal + line_totals[:, column]
+    tax = subtotal * TAX_RATE
+    return subtotal, tax, subtotal + tax
+
+
+def to_fixed(value, digits=2):
+    """
+    Format like JavaScript's Number.prototype.toFixed.
+
+    toFixed rounds the exact binary value of the double, with ties going
+    to the larger number, so 1.005 (really 1.00499999...) becomes '1.00'.
+    """
+    quantum = Decimal(1).scaleb(-digits)
+    return str(Decimal(float(value)).quantize(quantum, rounding=ROUND_HALF_UP))
+
+
+def expected_display(batch, prices):
+    """Expected #subtotal, #tax and #total texts for every cart."""
+    subtotal, tax, total = expected_totals(batch, prices)
+    return [(f"${to_fixed(s)}", f"${to_fixed(t)}", f"${to_fixed(g)}")
+            for s, t, g in zip(subtotal, tax, total)]
+
+
+def page_carts(batch, product_ids):
+    """Encode carts for the page as flat [op, id, op, id, ...] int lists."""
+    product_ids = np.asarray(product_ids)
+    carts = []
+    for operations, products in zip(batch.operations, batch.products):
+        used = operations != PAD
+        pairs = np.column_stack((operations[used], product_ids[products[used]]))
+        carts.append(pairs.ravel().tolist())
+    return carts
+
+
+def compare(batch, product_ids, expected, rendered):
+    """
+    Return a PriceMismatch for every cart whose rendered totals differ.
+
+    `steps` spells the cart out (e.g. ['add 3', '+1 3', 'remove 1']) so a
+    failure can be reproduced by hand.
+    """
+    mismatches = []
+    for index, (want, got) in enumerate(zip(expected, rendered)):
+        if tuple(got) != tuple(want):
+            operations = batch.operations[index]
+            steps = [f"{OPERATION_NAMES[op]} {product_ids[product]}"
+                     for op, product in zip(operations, batch.products[index]) if op != PAD]
+            mismatches.append(PriceMismatch(index, steps, tuple(want), tuple(got)))
+    return mismatches
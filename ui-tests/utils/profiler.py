@@ -0,0 +1,132 @@
+"""
+NardPOS UI Automation - WebDriver Command Profiler
+Counts and times every WebDriver wire command, grouped by command type and
+by the page-object method that issued it.
+"""
+
+import os
+import sys
+import time
+
+PAGES_DIR = os.sep + 'pages' + os.sep
+SELENIUM_DIR = os.sep + 'selenium' + os.sep
+
+
+def _caller_name():
+    """
+    Name the code responsible for the current command.
+
+    Prefers the outermost page-object method on the stack (the call the test
+    made, e.g. POSPage.add_product_to_cart); falls back to the first frame
+    outside Selenium and this module (a test or fixture).
+    """
+    frame = sys._getframe(2)
+    fallback = None
+    page_method = None
+    while frame is not None:
+        code = frame.f_code
+        filename = code.co_filename
+        if PAGES_DIR in filename:
+            page_method = getattr(code, 'co_qualname', code.co_name)
+        elif fallback is None and SELENIUM_DIR not in filename and filename != __file__:
+            fallback = getattr(code, 'co_qualname', code.co_name)
+        frame = frame.f_back
+    return page_method or fallback or '<unknown>'
+
+
+class CommandProfiler:
+    """
+    Wraps WebDriver.execute on one driver instance.
+
+    Every command WebElements send also goes through their parent driver's
+    execute(), so this single hook sees all wire traffic.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.enabled = False
+        self._execute = driver.execute
+        self.reset()
+        driver.execute = self._profiled_execute
+
+    @classmethod
+    def install(cls, driver):
+        """Return the driver's profiler, installing one on first use."""
+        profiler = getattr(driver, 'command_profiler', None)
+        if profiler is None:
+            profiler = cls(driver)
+            driver.command_profiler = profiler
+        return profiler
+
+    def reset(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.by_command = {}
+        self.by_caller = {}
+
+    def _profiled_execute(self, driver_command, params=None):
+        if not self.enabled:
+            return self._execute(driver_command, params)
+        caller = _caller_name()
+        start = time.perf_counter()
+        try:
+            return self._execute(driver_command, params)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.count += 1
+            self.total_ms += elapsed_ms
+            for table, key in ((self.by_command, driver_command), (self.by_caller, caller)):
+                entry = table.setdefault(key, [0, 0.0])
+                entry[0] += 1
+                entry[1] += elapsed_ms
+
+    def snapshot(self):
+        """Plain-data copy of the counters (safe to ship to the xdist controller)."""
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 2),
+            'by_command': {key: [count, round(ms, 2)] for key, (count, ms) in self.by_command.items()},
+            'by_caller': {key: [count, round(ms, 2)] for key, (count, ms) in self.by_caller.items()},
+        }
+
+
+def check_budget(snapshot, max_commands=None, max_ms=None):
+    """Return a failure message if the snapshot exceeds the budget, else None."""
+    problems = []
+    if max_commands is not None and snapshot['count'] > max_commands:
+        problems.append(f"{snapshot['count']} WebDriver commands > budget of {max_commands}")
+    if max_ms is not None and snapshot['total_ms'] > max_ms:
+        problems.append(f"{snapshot['total_ms']:.0f}ms in WebDriver commands > budget of {max_ms}ms")
+    if not problems:
+        return None
+    hottest = sorted(snapshot['by_caller'].items(), key=lambda item: -item[1][0])[:5]
+    lines = [f"  {caller}: {count} commands, {ms:.0f}ms" for caller, (count, ms) in hottest]
+    return "Command budget exceeded: " + '; '.join(problems) + "\nTop call sites:\n" + '\n'.join(lines)
+
+
+class CommandSummary:
+    """Aggregates per-test snapshots into a run-wide hot list."""
+
+    def __init__(self):
+        self.tests = 0
+        self.by_command = {}
+        self.by_caller = {}
+
+    def add(self, snapshot):
+        self.tests += 1
+        for source, target in ((snapshot['by_command'], self.by_command),
+                               (snapshot['by_caller'], self.by_caller)):
+            for key, (count, ms) in source.items():
+                entry = target.setdefault(key, [0, 0.0])
+                entry[0] += count
+                entry[1] += ms
+
+    def format(self, limit=10):
+        lines = []
+        for title, table in (('Hottest commands', self.by_command),
+                             ('Hottest call sites', self.by_caller)):
+            lines.append(f"{title}:")
+            ranked = sorted(table.items(), key=lambda item: -item[1][1])[:limit]
+            for key, (count, ms) in ranked:
+                lines.append(f"  {key:<50}{count:>8} cmds{ms:>10.0f} ms")
+        return '\n'.join(lines)
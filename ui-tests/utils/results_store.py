@@ -0,0 +1,266 @@
+"""
+NardPOS UI Automation - Results and Trend Store
+Keeps every run's outcomes, test and step durations and API latencies in a
+local SQLite file and flags slowdowns against a rolling baseline.
+
+CLI:
+    python -m utils.results_store runs
+    python -m utils.results_store trends --kind endpoint
+    python -m utils.results_store trends --kind step --filter add_product
+    python -m utils.results_store regressions
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+from collections import namedtuple
+from datetime import datetime
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'reports', 'results.sqlite')
+
+# Metric kinds: whole-test duration, page-object step total, API request latency
+KINDS = ('test', 'step', 'endpoint')
+SPARK_BLOCKS = '▁▂▃▄▅▆▇█'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    git_commit TEXT,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    duration_s REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS outcomes (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    kind TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value_ms REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS metrics_key ON metrics (kind, scope, name, run_id);
+"""
+
+Regression = namedtuple('Regression', [
+    'kind', 'scope', 'name', 'value_ms', 'baseline_ms', 'stdev_ms', 'z_score', 'samples',
+])
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class RunCollector:
+    """
+    Gathers one run's results from pytest reports (xdist controller side).
+
+    Reads the user_properties the suite already records: 'step_timings'
+    (TRACE_STEPS) and 'latency_ms' (API collection tests).
+    """
+
+    def __init__(self):
+        self.started = datetime.now()
+        self.outcomes = {}
+        self.durations = {}
+        self.metrics = []
+
+    def add_report(self, report):
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+        # A failed/skipped setup or teardown overrides a passed call
+        if report.when == 'call' or report.outcome != 'passed':
+            if self.outcomes.get(report.nodeid, 'passed') == 'passed':
+                self.outcomes[report.nodeid] = report.outcome
+        if report.when != 'call':
+            return
+        for name, value in report.user_properties:
+            if name == 'step_timings':
+                self.metrics.extend(('step', report.nodeid, step, ms) for step, ms in value.items())
+            elif name == 'latency_ms':
+                self.metrics.append(('endpoint', report.nodeid, 'latency', value))
+
+    def rows(self):
+        """All metric rows, including test durations of passed tests."""
+        tests = [('test', nodeid, 'duration', seconds * 1000)
+                 for nodeid, seconds in self.durations.items()
+                 if self.outcomes.get(nodeid) == 'passed']
+        return tests + self.metrics
+
+
+class ResultsStore:
+    """SQLite store of runs, outcomes and metrics."""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def ingest(self, collector):
+        """Store a finished run and return its id."""
+        counts = {outcome: list(collector.outcomes.values()).count(outcome)
+                  for outcome in ('passed', 'failed', 'skipped')}
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started_at, git_commit, passed, failed, skipped, duration_s) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (collector.started.isoformat(timespec='seconds'), _git_commit(),
+                 counts['passed'], counts['failed'], counts['skipped'],
+                 (datetime.now() - collector.started).total_seconds()),
+            )
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO outcomes (run_id, nodeid, outcome) VALUES (?, ?, ?)",
+                [(run_id, nodeid, outcome) for nodeid, outcome in collector.outcomes.items()],
+            )
+            self.connection.executemany(
+                "INSERT INTO metrics (run_id, kind, scope, name, value_ms) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, kind, scope, name, value) for kind, scope, name, value in collector.rows()],
+            )
+        return run_id
+
+    def latest_run_id(self):
+        row = self.connection.execute("SELECT MAX(id) FROM runs").fetchone()
+        return row[0]
+
+    def history(self, kind, scope, name, before_run, limit):
+        """Values of one metric from the `limit` runs before `before_run`, oldest first."""
+        rows = self.connection.execute(
+            "SELECT value_ms FROM metrics WHERE kind = ? AND scope = ? AND name = ? AND run_id < ? "
+            "ORDER BY run_id DESC LIMIT ?",
+            (kind, scope, name, before_run, limit),
+        ).fetchall()
+        return [value for value, in reversed(rows)]
+
+    def regressions(self, run_id, baseline_runs=10, min_samples=5, z_threshold=3.0,
+                    min_increase=0.2, min_delta_ms=5.0):
+        """
+        Metrics of `run_id` that are significantly slower than their baseline.
+
+        A value is flagged when it lies more than `z_threshold` standard
+        deviations above the mean of the previous `baseline_runs` values,
+        and is also at least `min_increase` (relative) and `min_delta_ms`
+        slower, so very stable metrics don't flag jitter.
+        """
+        flagged = []
+        rows = self.connection.execute(
+            "SELECT kind, scope, name, value_ms FROM metrics WHERE run_id = ?", (run_id,)
+        ).fetchall()
+        for kind, scope, name, value in rows:
+            baseline = self.history(kind, scope, name, run_id, baseline_runs)
+            if len(baseline) < min_samples:
+                continue
+            mean = statistics.fmean(baseline)
+            stdev = statistics.stdev(baseline)
+            delta = value - mean
+            if delta < min_delta_ms or delta < mean * min_increase:
+                continue
+            z_score = delta / stdev if stdev else float('inf')
+            if z_score > z_threshold:
+                flagged.append(Regression(kind, scope, name, value, mean, stdev, z_score, len(baseline)))
+        return sorted(flagged, key=lambda regression: -regression.z_score)
+
+    def trends(self, kind, runs=20, name_filter=None):
+        """
+        Last `runs` values of every metric of one kind.
+
+        Returns:
+            List of (scope, name, [values oldest first]) tuples
+        """
+        first_run = self.connection.execute(
+            "SELECT MIN(id) FROM (SELECT id FROM runs ORDER BY id DESC LIMIT ?)", (runs,)
+        ).fetchone()[0] or 0
+        series = {}
+        for scope, name, value in self.connection.execute(
+                "SELECT scope, name, value_ms FROM metrics WHERE kind = ? AND run_id >= ? "
+                "ORDER BY run_id", (kind, first_run)):
+            if name_filter and name_filter not in scope and name_filter not in name:
+                continue
+            series.setdefault((scope, name), []).append(value)
+        return [(scope, name, values) for (scope, name), values in sorted(series.items())]
+
+    def runs(self, limit=20):
+        return self.connection.execute(
+            "SELECT id, started_at, git_commit, passed, failed, skipped, duration_s FROM runs "
+            "ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+
+    def close(self):
+        self.connection.close()
+
+
+def sparkline(values):
+    low, high = min(values), max(values)
+    span = (high - low) or 1
+    return ''.join(SPARK_BLOCKS[int((value - low) / span * (len(SPARK_BLOCKS) - 1))] for value in values)
+
+
+def _label(kind, scope, name):
+    return scope if kind in ('test', 'endpoint') else f"{scope} :: {name}"
+
+
+def format_regressions(regressions):
+    lines = []
+    for regression in regressions:
+        z_score = 'inf' if regression.z_score == float('inf') else f"{regression.z_score:.1f}"
+        lines.append(
+            f"SLOWER [{regression.kind}] {_label(regression.kind, regression.scope, regression.name)}: "
+            f"{regression.value_ms:.1f}ms vs {regression.baseline_ms:.1f}±{regression.stdev_ms:.1f}ms "
+            f"over {regression.samples} runs (z={z_score})"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='NardPOS results and trend store')
+    parser.add_argument('--db', default=os.getenv('RESULTS_DB') or DEFAULT_DB_PATH)
+    commands = parser.add_subparsers(dest='command', required=True)
+    runs_parser = commands.add_parser('runs', help='List recent runs')
+    runs_parser.add_argument('--limit', type=int, default=20)
+    trends_parser = commands.add_parser('trends', help='Per-test, per-step or per-endpoint trends')
+    trends_parser.add_argument('--kind', choices=KINDS, default='test')
+    trends_parser.add_argument('--runs', type=int, default=20)
+    trends_parser.add_argument('--filter', help='Only keys containing this text')
+    regressions_parser = commands.add_parser('regressions', help='Slowdowns of a run vs its baseline')
+    regressions_parser.add_argument('--run', type=int, help='Run id (default: latest)')
+    regressions_parser.add_argument('--baseline-runs', type=int, default=10)
+    regressions_parser.add_argument('--z', type=float, default=3.0)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        parser.error(f"No results database at {args.db}")
+    store = ResultsStore(args.db)
+    try:
+        if args.command == 'runs':
+            print(f"{'Run':>5}  {'Started':<20}{'Commit':<10}{'Pass':>6}{'Fail':>6}{'Skip':>6}{'Time':>9}")
+            for run_id, started, commit, passed, failed, skipped, duration in store.runs(args.limit):
+                print(f"{run_id:>5}  {started:<20}{commit or '-':<10}{passed:>6}{failed:>6}"
+                      f"{skipped:>6}{duration:>8.1f}s")
+        elif args.command == 'trends':
+            for scope, name, values in store.trends(args.kind, args.runs, args.filter):
+                print(f"{sparkline(values)} {values[-1]:>9.1f}ms  (min {min(values):.1f}, "
+                      f"max {max(values):.1f})  {_label(args.kind, scope, name)}")
+        else:
+            run_id = args.run or store.latest_run_id()
+            regressions = store.regressions(run_id, args.baseline_runs, z_threshold=args.z)
+            print(format_regressions(regressions) or f"No significant slowdowns in run {run_id}")
+            return 1 if regressions else 0
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
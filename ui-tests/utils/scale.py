@@ -0,0 +1,92 @@
+"""
+NardPOS UI Automation - Scale Data Generators
+Deterministic catalogs and sales histories at store volume, shaped like the
+`products` and `salesHistory` arrays in mock-ui/index.html.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+# The hard-coded mock-ui catalog uses ids 1-8
+FIRST_GENERATED_ID = 9
+PAYMENT_METHODS = ('cash', 'card', 'mobile')
+
+_ICONS = ('🥤', '🍫', '🍪', '🥨', '🧃', '🍞', '🧀', '🍎', '🍌', '🥛', '☕', '🥪')
+_ADJECTIVES = ('Classic', 'Organic', 'Spicy', 'Salted', 'Fresh', 'Diet', 'Family', 'Mini',
+               'Roasted', 'Sparkling', 'Honey', 'Smoked')
+_NOUNS = ('Cola', 'Chips', 'Cookies', 'Crackers', 'Juice', 'Bread', 'Cheese', 'Nuts',
+          'Yogurt', 'Water', 'Coffee', 'Wrap', 'Granola', 'Tea')
+
+
+def generate_products(count, start_id=FIRST_GENERATED_ID, seed=0):
+    """
+    Build `count` catalog entries with unique ids and names.
+
+    Returns:
+        List of {id, name, price, icon} dicts, the shape renderProducts() reads
+    """
+    rng = random.Random(seed)
+    products = []
+    for product_id in range(start_id, start_id + count):
+        products.append({
+            'id': product_id,
+            'name': f"{rng.choice(_ADJECTIVES)} {rng.choice(_NOUNS)} #{product_id}",
+            'price': round(rng.randint(25, 5000) / 100, 2),
+            'icon': rng.choice(_ICONS),
+        })
+    return products
+
+
+def format_sale_date(moment):
+    """Format a datetime like the app's `new Date().toLocaleString()` (en-US)."""
+    hour = moment.hour % 12 or 12
+    suffix = 'AM' if moment.hour < 12 else 'PM'
+    return f"{moment.month}/{moment.day}/{moment.year}, {hour}:{moment:%M:%S} {suffix}"
+
+
+def sale_record(receipt_number, moment, items, total, payment='cash', status='Completed'):
+    """
+    Build one salesHistory entry.
+
+    Args:
+        receipt_number: Receipt shown in the history table
+        moment: datetime of the sale
+        items: List of (name, quantity) pairs
+        total: Sale total as a number
+        payment: 'cash', 'card' or 'mobile'
+        status: Status column text
+    """
+    return {
+        'receiptNumber': receipt_number,
+        'date': format_sale_date(moment),
+        'items': ', '.join(f"{name} x{quantity}" for name, quantity in items),
+        'itemCount': sum(quantity for _, quantity in items),
+        'total': f"{total:.2f}",
+        'payment': payment,
+        'status': status,
+    }
+
+
+def generate_sales(count, products, seed=0, newest=datetime(2025, 1, 1, 18, 0)):
+    """
+    Build `count` past sales, newest first like the app's salesHistory.
+
+    Receipts are unique (RCP-<date>-<sequence>) so lookups have exactly one
+    match; totals include the app's 10% tax.
+    """
+    rng = random.Random(seed)
+    sales = []
+    moment = newest
+    for sequence in range(count, 0, -1):
+        moment -= timedelta(seconds=rng.randint(30, 900))
+        lines = [(product['name'], rng.randint(1, 4), product['price'])
+                 for product in rng.sample(products, min(len(products), rng.randint(1, 4)))]
+        subtotal = sum(quantity * price for _, quantity, price in lines)
+        sales.append(sale_record(
+            f"RCP-{moment:%Y%m%d}-{sequence:06d}",
+            moment,
+            [(name, quantity) for name, quantity, _ in lines],
+            subtotal * 1.10,
+            rng.choice(PAYMENT_METHODS),
+        ))
+    return sales
@@ -0,0 +1,172 @@
+"""
+NardPOS UI Automation - Screenshot Pipeline
+Captures screenshots synchronously but encodes and writes them in the
+background, storing each unique image once under its content hash.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from .parallel import artifact_path, worker_id
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed for downscaling/re-encoding
+    Image = None
+
+FORMAT_EXTENSIONS = {'png': 'png', 'jpeg': 'jpg', 'webp': 'webp'}
+
+
+def take_png(driver, element=None):
+    """PNG bytes of the viewport, or of `element` (WebElement or locator)."""
+    if element is None:
+        return driver.get_screenshot_as_png()
+    if isinstance(element, tuple):
+        element = driver.find_element(*element)
+    return element.screenshot_as_png
+
+
+class ScreenshotWriter:
+    """
+    Background writer for test screenshots.
+
+    The browser still has to render the PNG while the test waits, but
+    hashing, optional Pillow downscaling/re-encoding and disk I/O all run
+    on a thread pool. With dedupe enabled, images are stored as
+    '<sha1>.<ext>' and a per-worker manifest maps test/step names to files,
+    so byte-identical captures are written only once.
+    """
+
+    def __init__(self, directory, scale=1.0, image_format='png', quality=85,
+                 dedupe=True, max_workers=2):
+        """
+        Args:
+            directory: Output directory for images and manifests
+            scale: Downscale factor applied with Pillow (1.0 keeps full size)
+            image_format: 'png', 'jpeg' or 'webp'
+            quality: Encoder quality for lossy formats
+            dedupe: Store images by content hash instead of by name
+            max_workers: Size of the background thread pool
+        """
+        if image_format not in FORMAT_EXTENSIONS:
+            raise ValueError(f"Unsupported screenshot format: {image_format}")
+        if Image is None:
+            # Without Pillow the browser's PNG is stored as-is
+            scale, image_format = 1.0, 'png'
+        self.directory = directory
+        self.scale = scale
+        self.image_format = image_format
+        self.quality = quality
+        self.dedupe = dedupe
+        self.max_workers = max_workers
+        self.manifest_path = os.path.join(directory, f"manifest-{worker_id()}.jsonl")
+        self._executor = None
+        self._futures = []
+        self._lock = threading.Lock()
+        self._written = set()
+
+    @property
+    def extension(self):
+        return FORMAT_EXTENSIONS[self.image_format]
+
+    def capture(self, driver, name, test_name='', element=None):
+        """
+        Capture the page (or a single element) and queue it for writing.
+
+        Args:
+            driver: WebDriver instance
+            name: Artifact name, usually '<test>_<step>'
+            test_name: Test nodeid recorded in the manifest
+            element: Optional WebElement or (By, value) locator to capture
+                instead of the full page
+
+        Returns:
+            Path the image will be written to
+        """
+        return self.submit(take_png(driver, element), name, test_name)
+
+    def submit(self, png, name, test_name=''):
+        """Queue raw PNG bytes for processing and return the target path."""
+        if self.dedupe:
+            digest = hashlib.sha1(png).hexdigest()
+            path = os.path.join(self.directory, f"{digest}.{self.extension}")
+        else:
+            digest = None
+            path = artifact_path(self.directory, name, self.extension)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='screenshot'
+                )
+            self._futures.append(
+                self._executor.submit(self._write, png, path, name, test_name, digest)
+            )
+        return path
+
+    def flush(self):
+        """Block until every queued screenshot is on disk."""
+        with self._lock:
+            futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self):
+        """Flush pending writes and stop the thread pool."""
+        self.flush()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _write(self, png, path, name, test_name, digest):
+        with self._lock:
+            duplicate = digest is not None and digest in self._written
+        if not duplicate and not os.path.exists(path):
+            data = self._encode(png)
+            # Write then rename so concurrent workers never see partial files
+            temp_path = f"{path}.{worker_id()}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, 'wb') as handle:
+                    handle.write(data)
+                os.replace(temp_path, path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        if digest is not None:
+            # Only once the file exists: a failed write must not make later
+            # identical captures skip it
+            with self._lock:
+                self._written.add(digest)
+        if self.dedupe:
+            entry = {
+                'name': name,
+                'test': test_name,
+                'file': os.path.basename(path),
+                'time': datetime.now().isoformat(timespec='milliseconds'),
+            }
+            with self._lock:
+                with open(self.manifest_path, 'a') as manifest:
+                    manifest.write(json.dumps(entry) + '\n')
+
+    def _encode(self, png):
+        """Downscale/re-encode with Pillow when configured, else keep the PNG."""
+        if Image is None or (self.scale == 1.0 and self.image_format == 'png'):
+            return png
+        image = Image.open(io.BytesIO(png))
+        if self.scale != 1.0:
+            size = (max(1, int(image.width * self.scale)), max(1, int(image.height * self.scale)))
+            image = image.resize(size, Image.LANCZOS)
+        output = io.BytesIO()
+        if self.image_format == 'png':
+            image.save(output, format='PNG', optimize=True)
+        else:
+            if image.mode in ('RGBA', 'P'):
+                image = image.convert('RGB')
+            image.save(output, format=self.image_format.upper(), quality=self.quality)
+        return output.getvalue()
@@ -0,0 +1,162 @@
+"""
+NardPOS UI Automation - Soak Testing
+Drives sale/history cycles through the page objects for a whole shift and
+samples browser memory, DOM size and per-operation latency as it goes.
+"""
+
+import csv
+import os
+import statistics
+import time
+from collections import namedtuple
+
+from pages.sales_history_page import SalesHistoryPage
+
+from .ui_metrics import supports_cdp
+
+SoakSample = namedtuple('SoakSample', [
+    'cycle', 'elapsed_s', 'heap_used_mb', 'dom_nodes', 'listeners', 'sale_ms', 'history_ms',
+])
+
+# Fallback for browsers without CDP: performance.memory is Chromium-only,
+# so Firefox reports heap as null and only DOM size is tracked
+MEMORY_SCRIPT = """
+var memory = window.performance && performance.memory;
+return [memory ? memory.usedJSHeapSize : null, document.getElementsByTagName('*').length];
+"""
+
+
+class MemorySampler:
+    """
+    Reads JS heap and DOM size from the browser.
+
+    On Chrome, a garbage collection runs first (HeapProfiler.collectGarbage)
+    so samples show retained memory rather than allocation noise, and
+    Performance.getMetrics supplies heap, node and listener counts.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.cdp = supports_cdp(driver)
+        if self.cdp:
+            driver.execute_cdp_cmd('Performance.enable', {})
+
+    def sample(self):
+        """Return (heap used in MB or None, DOM node count, event listener count or None)."""
+        if self.cdp:
+            self.driver.execute_cdp_cmd('HeapProfiler.collectGarbage', {})
+            metrics = {metric['name']: metric['value'] for metric in
+                       self.driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']}
+            return (metrics['JSHeapUsedSize'] / 2 ** 20, int(metrics['Nodes']),
+                    int(metrics['JSEventListeners']))
+        heap, nodes = self.driver.execute_script(MEMORY_SCRIPT)
+        return (heap / 2 ** 20 if heap is not None else None), nodes, None
+
+    def close(self):
+        if self.cdp:
+            self.driver.execute_cdp_cmd('Performance.disable', {})
+
+
+class SoakRecorder:
+    """Time series of SoakSample rows plus the latencies of every cycle."""
+
+    def __init__(self):
+        self.samples = []
+        self.sale_ms = []
+        self.history_ms = []
+        self.started = time.perf_counter()
+
+    def record_cycle(self, sale_ms, history_ms):
+        self.sale_ms.append(sale_ms)
+        self.history_ms.append(history_ms)
+
+    def add_sample(self, cycle, heap_used_mb, dom_nodes, listeners):
+        # Latency columns are the median of the cycles since the last sample
+        since = len(self.samples) and self.samples[-1].cycle
+        self.samples.append(SoakSample(
+            cycle,
+            round(time.perf_counter() - self.started, 2),
+            None if heap_used_mb is None else round(heap_used_mb, 3),
+            dom_nodes,
+            listeners,
+            round(statistics.median(self.sale_ms[since:cycle] or [0.0]), 2),
+            round(statistics.median(self.history_ms[since:cycle] or [0.0]), 2),
+        ))
+
+    def write_csv(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', newline='') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(SoakSample._fields)
+            writer.writerows(self.samples)
+        return path
+
+    def summary(self):
+        """Growth between the first and last samples and latency drift."""
+        first, last = self.samples[0], self.samples[-1]
+        cycles = max(last.cycle - first.cycle, 1)
+        heap_growth = None
+        if first.heap_used_mb is not None and last.heap_used_mb is not None:
+            heap_growth = round(last.heap_used_mb - first.heap_used_mb, 3)
+        return {
+            'cycles': last.cycle,
+            'heap_growth_mb': heap_growth,
+            'dom_nodes_per_cycle': round((last.dom_nodes - first.dom_nodes) / cycles, 2),
+            'sale_drift': round(_drift(self.sale_ms), 2),
+            'history_drift': round(_drift(self.history_ms), 2),
+        }
+
+    def check(self, max_heap_growth_mb=None, max_dom_nodes_per_cycle=None, max_latency_drift=None):
+        """Return a message for every threshold the run exceeded."""
+        summary = self.summary()
+        violations = []
+        heap_growth = summary['heap_growth_mb']
+        if max_heap_growth_mb is not None and heap_growth is not None and heap_growth > max_heap_growth_mb:
+            violations.append(f"JS heap grew {heap_growth:.1f}MB > {max_heap_growth_mb:g}MB")
+        if max_dom_nodes_per_cycle is not None and \
+                summary['dom_nodes_per_cycle'] > max_dom_nodes_per_cycle:
+            violations.append(f"DOM grew {summary['dom_nodes_per_cycle']:.1f} nodes/cycle "
+                              f"> {max_dom_nodes_per_cycle:g}")
+        if max_latency_drift is not None:
+            for name in ('sale_drift', 'history_drift'):
+                if summary[name] > max_latency_drift:
+                    violations.append(f"{name.replace('_', ' ')} x{summary[name]:.2f} "
+                                      f"> x{max_latency_drift:g}")
+        return violations
+
+
+def _drift(latencies):
+    """Median of the last tenth of cycles over the median of the first tenth."""
+    window = max(len(latencies) // 10, 1)
+    baseline = statistics.median(latencies[:window])
+    return statistics.median(latencies[-window:]) / baseline if baseline else 0.0
+
+
+def run_soak(pos_page, cycles, sample_every=50, product_ids=(1, 3), payment_method='cash'):
+    """
+    Run `cycles` sale + history cycles in the current session.
+
+    Each cycle completes a checkout through POSPage, opens Sales History
+    (re-rendering the whole table) and returns to the POS tab. Memory is
+    sampled before the first cycle and every `sample_every` cycles.
+
+    Returns:
+        SoakRecorder with the time series and per-cycle latencies
+    """
+    history_page = SalesHistoryPage(pos_page.driver)
+    sampler = MemorySampler(pos_page.driver)
+    recorder = SoakRecorder()
+    try:
+        recorder.add_sample(0, *sampler.sample())
+        for cycle in range(1, cycles + 1):
+            start = time.perf_counter()
+            pos_page.create_sale_with_products(product_ids, payment_method)
+            sold = time.perf_counter()
+            history_page.navigate_to_history()
+            recorder.record_cycle((sold - start) * 1000, (time.perf_counter() - sold) * 1000)
+            pos_page.click_pos_tab()
+            if cycle % sample_every == 0 or cycle == cycles:
+                recorder.add_sample(cycle, *sampler.sample())
+    finally:
+        sampler.close()
+    return recorder
@@ -0,0 +1,183 @@
+"""
+NardPOS UI Automation - Page Object Step Tracing
+Records nested, timed spans for page-object calls and exports them in
+Chrome trace-event format (open in chrome://tracing, Perfetto or speedscope).
+
+Tracing is off unless a Tracer is started; wrapped methods then cost one
+global lookup before calling straight through.
+"""
+
+import functools
+import html
+import inspect
+import json
+import os
+import threading
+import time
+
+_active_tracer = None
+
+
+class Tracer:
+    """Collects spans for one test."""
+
+    def __init__(self, name):
+        self.name = name
+        self.origin = time.perf_counter()
+        self.events = []
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def begin(self, name, args=None):
+        self._stack().append((name, time.perf_counter(), args))
+
+    def end(self):
+        name, start, args = self._stack().pop()
+        finished = time.perf_counter()
+        self.events.append({
+            'name': name,
+            'cat': name.split('.', 1)[0],
+            'ph': 'X',
+            'ts': round((start - self.origin) * 1e6, 1),
+            'dur': round((finished - start) * 1e6, 1),
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args or {},
+            'depth': len(self._stack()),
+        })
+
+    def span(self, name, **args):
+        """Context manager recording a span around a block of test code."""
+        return _Span(self, name, args)
+
+    def chrome_trace(self):
+        """Return the spans as a Chrome trace-event JSON object."""
+        events = [{key: value for key, value in event.items() if key != 'depth'}
+                  for event in sorted(self.events, key=lambda event: event['ts'])]
+        events.append({
+            'name': 'process_name', 'ph': 'M', 'pid': os.getpid(),
+            'args': {'name': self.name},
+        })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, path):
+        """Write the Chrome trace JSON to `path`."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as handle:
+            json.dump(self.chrome_trace(), handle)
+        return path
+
+    def step_summary(self):
+        """
+        Aggregate spans by name.
+
+        Returns:
+            List of dicts (step, calls, total_ms, max_ms, depth) ordered by
+            first occurrence
+        """
+        rows = {}
+        for event in sorted(self.events, key=lambda event: event['ts']):
+            row = rows.setdefault(event['name'], {
+                'step': event['name'], 'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                'depth': event['depth'],
+            })
+            duration_ms = event['dur'] / 1000
+            row['calls'] += 1
+            row['total_ms'] += duration_ms
+            row['max_ms'] = max(row['max_ms'], duration_ms)
+            row['depth'] = min(row['depth'], event['depth'])
+        return list(rows.values())
+
+    def step_table_html(self):
+        """Render the step summary as an HTML table for pytest-html."""
+        body = ''.join(
+            f"<tr><td style='padding-left:{8 + 16 * row['depth']}px'>{html.escape(row['step'])}</td>"
+            f"<td>{row['calls']}</td><td>{row['total_ms']:.1f}</td><td>{row['max_ms']:.1f}</td></tr>"
+            for row in self.step_summary()
+        )
+        return (
+            "<table class='step-timings'><thead><tr><th>Step</th><th>Calls</th>"
+            "<th>Total (ms)</th><th>Max (ms)</th></tr></thead>"
+            f"<tbody>{body}</tbody></table>"
+        )
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'args')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.tracer.begin(self.name, self.args)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.end()
+        return False
+
+
+def start(name):
+    """Start tracing page-object calls into a new Tracer."""
+    global _active_tracer
+    _active_tracer = Tracer(name)
+    return _active_tracer
+
+
+def stop():
+    """Stop tracing and return the finished Tracer (or None)."""
+    global _active_tracer
+    tracer, _active_tracer = _active_tracer, None
+    return tracer
+
+
+def active_tracer():
+    return _active_tracer
+
+
+def _describe_args(args, kwargs):
+    parts = [repr(arg) for arg in args] + [f"{key}={value!r}" for key, value in kwargs.items()]
+    text = ', '.join(parts)
+    return text if len(text) <= 120 else text[:117] + '...'
+
+
+def traced(name):
+    """Decorator recording a span named `name` whenever tracing is on."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _active_tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            # args[0] is the page object itself
+            tracer.begin(name, {'args': _describe_args(args[1:], kwargs)})
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.end()
+        wrapper.__traced__ = True
+        return wrapper
+    return decorator
+
+
+def instrument_class(cls):
+    """Wrap the public methods defined directly on `cls` with traced()."""
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith('_') or not callable(value) or isinstance(value, (staticmethod, classmethod, type)):
+            continue
+        if getattr(value, '__traced__', False):
+            continue
+        if inspect.isgeneratorfunction(value) or \
+                inspect.isgeneratorfunction(getattr(value, '__wrapped__', None)):
+            # Generators and @contextmanager helpers return immediately; the
+            # calls they make are traced on their own
+            continue
+        setattr(cls, attr, traced(f"{cls.__name__}.{attr}")(value))
+    return cls
@@ -0,0 +1,258 @@
+"""
+NardPOS UI Automation - Front-End Interaction Metrics
+Chrome-only instrumentation: in-page performance marks time each
+click-to-render interaction, and the DevTools protocol supplies layout,
+style and script durations for the whole test.
+"""
+
+import html
+
+from .loadgen import percentile
+
+# App functions whose calls are timed; each is a global in mock-ui/index.html
+TRACKED_FUNCTIONS = ('addToCart', 'handleCheckout', 'renderSalesHistory')
+
+# Performance.getMetrics values reported as deltas over the test (seconds)
+CDP_DURATIONS = ('LayoutDuration', 'RecalcStyleDuration', 'ScriptDuration', 'TaskDuration')
+
+# Runs before any page script (Page.addScriptToEvaluateOnNewDocument) and
+# wraps the tracked functions on DOMContentLoaded, ahead of the app's own
+# listener, so handlers bound by reference (checkoutBtn -> handleCheckout)
+# pick up the wrapped versions.
+#
+# Each call records:
+#   input_ms   click timestamp -> handler start (main-thread queueing)
+#   handler_ms synchronous handler time (state update + innerHTML rebuild)
+#   render_ms  click timestamp -> first task after the next frame, i.e.
+#              after style, layout and paint of the re-rendered DOM
+INSTRUMENT_SCRIPT = """
+(function () {
+    if (window.__nardposUiMetrics) {
+        return;
+    }
+    var state = window.__nardposUiMetrics = {interactions: [], longTasks: [], seq: 0};
+    var names = %s;
+
+    function wrap(name) {
+        var original = window[name];
+        if (typeof original !== 'function' || original.__nardposTimed) {
+            return;
+        }
+        var timed = function () {
+            var event = window.event;
+            var start = performance.now();
+            var clickAt = event && event.type === 'click' ? event.timeStamp : start;
+            var id = name + ':' + (++state.seq);
+            performance.mark('nardpos:' + id + ':start', {startTime: clickAt});
+            try {
+                return original.apply(this, arguments);
+            } finally {
+                var handlerEnd = performance.now();
+                requestAnimationFrame(function () {
+                    setTimeout(function () {
+                        var rendered = performance.now();
+                        performance.measure('nardpos:' + name, {start: clickAt, end: rendered});
+                        state.interactions.push({
+                            name: name,
+                            input_ms: start - clickAt,
+                            handler_ms: handlerEnd - start,
+                            render_ms: rendered - clickAt,
+                            dom_nodes: document.getElementsByTagName('*').length
+                        });
+                    }, 0);
+                });
+            }
+        };
+        timed.__nardposTimed = true;
+        window[name] = timed;
+    }
+
+    function wrapAll() {
+        names.forEach(wrap);
+    }
+
+    if ('PerformanceObserver' in window) {
+        try {
+            new PerformanceObserver(function (list) {
+                list.getEntries().forEach(function (entry) {
+                    state.longTasks.push({start_ms: entry.startTime, duration_ms: entry.duration});
+                });
+            }).observe({type: 'longtask', buffered: true});
+        } catch (error) {
+            // longtask entries unsupported; interactions are still recorded
+        }
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', wrapAll);
+    } else {
+        wrapAll();
+    }
+})();
+""" % ('[' + ', '.join(f"'{name}'" for name in TRACKED_FUNCTIONS) + ']')
+
+# Waits for in-flight render callbacks, then drains the recorded entries
+COLLECT_SCRIPT = """
+var done = arguments[arguments.length - 1];
+requestAnimationFrame(function () {
+    setTimeout(function () {
+        var state = window.__nardposUiMetrics;
+        if (!state) {
+            done({interactions: [], longTasks: []});
+            return;
+        }
+        var result = {interactions: state.interactions, longTasks: state.longTasks};
+        state.interactions = [];
+        state.longTasks = [];
+        done(result);
+    }, 0);
+});
+"""
+
+
+def supports_cdp(driver):
+    """True for Chromium drivers (Chrome, Edge), which expose execute_cdp_cmd."""
+    return hasattr(driver, 'execute_cdp_cmd')
+
+
+class UIMetrics:
+    """
+    Collects interaction timings and DevTools metrics for one test.
+
+    Install before the app is loaded: wrapped handlers are bound when the
+    page's DOMContentLoaded runs, so pages already open when start() is
+    called only get partial coverage.
+    """
+
+    def __init__(self, driver):
+        if not supports_cdp(driver):
+            raise RuntimeError("UI metrics need a Chromium browser with DevTools support")
+        self.driver = driver
+        self.interactions = []
+        self.long_tasks = []
+        self._script_id = None
+        self._baseline = {}
+        self._cdp = {}
+
+    def start(self):
+        """Inject the instrumentation into new documents and take a CDP baseline."""
+        self._script_id = self.driver.execute_cdp_cmd(
+            'Page.addScriptToEvaluateOnNewDocument', {'source': INSTRUMENT_SCRIPT}
+        )['identifier']
+        self.driver.execute_cdp_cmd('Performance.enable', {})
+        self._baseline = self._cdp_metrics()
+        return self
+
+    def collect(self):
+        """Pull recorded entries and CDP deltas since start(); safe to call repeatedly."""
+        try:
+            data = self.driver.execute_async_script(COLLECT_SCRIPT)
+        except Exception:
+            # e.g. the page navigated away mid-call; keep what we already have
+            data = {'interactions': [], 'longTasks': []}
+        self.interactions.extend(data['interactions'])
+        self.long_tasks.extend(data['longTasks'])
+        current = self._cdp_metrics()
+        self._cdp = {name: round((current.get(name, 0.0) - self._baseline.get(name, 0.0)) * 1000, 2)
+                     for name in CDP_DURATIONS}
+        return self.summary()
+
+    def stop(self):
+        """Remove the injected script so a reused browser starts clean."""
+        if self._script_id is not None:
+            self.driver.execute_cdp_cmd(
+                'Page.removeScriptToEvaluateOnNewDocument', {'identifier': self._script_id}
+            )
+            self._script_id = None
+        self.driver.execute_cdp_cmd('Performance.disable', {})
+
+    def _cdp_metrics(self):
+        metrics = self.driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']
+        return {metric['name']: metric['value'] for metric in metrics}
+
+    def summary(self):
+        """
+        Aggregate what has been collected so far.
+
+        Returns:
+            Dict with per-interaction count/p50/p95/max of render_ms plus mean
+            handler_ms, long task count/total, and CDP durations in ms
+        """
+        interactions = {}
+        for name in dict.fromkeys(entry['name'] for entry in self.interactions):
+            entries = [entry for entry in self.interactions if entry['name'] == name]
+            render = sorted(entry['render_ms'] for entry in entries)
+            interactions[name] = {
+                'count': len(entries),
+                'p50_ms': round(percentile(render, 50), 2),
+                'p95_ms': round(percentile(render, 95), 2),
+                'max_ms': round(render[-1], 2),
+                'handler_ms': round(sum(entry['handler_ms'] for entry in entries) / len(entries), 2),
+            }
+        return {
+            'interactions': interactions,
+            'long_tasks': len(self.long_tasks),
+            'long_task_ms': round(sum(task['duration_ms'] for task in self.long_tasks), 2),
+            'cdp_ms': dict(self._cdp),
+        }
+
+    def check_budget(self, interaction=None, max_ms=None, pct=95, max_long_tasks=None,
+                     max_layout_ms=None, max_script_ms=None):
+        """
+        Compare the collected metrics against limits.
+
+        Args:
+            interaction: Tracked function name, or None for every interaction
+            max_ms: Limit for the click-to-render percentile
+            pct: Percentile checked against max_ms
+            max_long_tasks: Allowed number of >50ms main-thread tasks
+            max_layout_ms: Limit for CDP LayoutDuration + RecalcStyleDuration
+            max_script_ms: Limit for CDP ScriptDuration
+
+        Returns:
+            List of violation messages (empty when within budget)
+        """
+        self.collect()
+        summary = self.summary()
+        violations = []
+        if max_ms is not None:
+            names = [interaction] if interaction else list(summary['interactions'])
+            for name in names:
+                render = sorted(entry['render_ms'] for entry in self.interactions
+                                if entry['name'] == name)
+                if not render:
+                    violations.append(f"{name}: no interactions recorded")
+                    continue
+                actual = percentile(render, pct)
+                if actual > max_ms:
+                    violations.append(f"{name}: p{pct:g} click-to-render {actual:.1f}ms > {max_ms:g}ms")
+        if max_long_tasks is not None and summary['long_tasks'] > max_long_tasks:
+            violations.append(f"{summary['long_tasks']} long tasks > {max_long_tasks}")
+        cdp = summary['cdp_ms']
+        layout_ms = cdp.get('LayoutDuration', 0.0) + cdp.get('RecalcStyleDuration', 0.0)
+        if max_layout_ms is not None and layout_ms > max_layout_ms:
+            violations.append(f"layout + style {layout_ms:.1f}ms > {max_layout_ms:g}ms")
+        if max_script_ms is not None and cdp.get('ScriptDuration', 0.0) > max_script_ms:
+            violations.append(f"script {cdp['ScriptDuration']:.1f}ms > {max_script_ms:g}ms")
+        return violations
+
+    def assert_budget(self, **limits):
+        """Raise AssertionError listing every limit check_budget() reports."""
+        violations = self.check_budget(**limits)
+        assert not violations, "UI performance budget exceeded:\n" + '\n'.join(violations)
+
+
+def summary_table_html(summary):
+    """Render a UIMetrics summary as an HTML table for pytest-html."""
+    rows = ''.join(
+        f"<tr><td>{html.escape(name)}</td><td>{row['count']}</td><td>{row['p50_ms']:.1f}</td>"
+        f"<td>{row['p95_ms']:.1f}</td><td>{row['max_ms']:.1f}</td><td>{row['handler_ms']:.1f}</td></tr>"
+        for name, row in summary['interactions'].items()
+    )
+    cdp = ', '.join(f"{name} {value:.1f}ms" for name, value in summary['cdp_ms'].items())
+    return (
+        "<table class='ui-metrics'><thead><tr><th>Interaction</th><th>Count</th>"
+        "<th>p50 (ms)</th><th>p95 (ms)</th><th>Max (ms)</th><th>Handler (ms)</th></tr></thead>"
+        f"<tbody>{rows}</tbody></table>"
+        f"<p>Long tasks: {summary['long_tasks']} ({summary['long_task_ms']:.1f}ms). {cdp}</p>"
+    )
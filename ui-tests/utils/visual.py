@@ -0,0 +1,279 @@
+"""
+NardPOS UI Automation - Visual Regression
+Compares screenshots against stored baselines with dynamic regions (receipt
+numbers, sale dates) masked out using page-object locators.
+
+Each comparison goes through three stages, cheapest first:
+    1. Digests of the PNG bytes and of the masked pixels vs the ones stored
+       with the baseline. Unchanged screens pass here without decoding the
+       baseline image (or, with nothing dynamic on screen, the capture).
+    2. Perceptual hash distance. Beyond `max_hash_distance` the capture is
+       reported as a different screen (wrong page, layout shift) instead of
+       as a count of changed blocks.
+    3. Block diff: per-pixel channel difference above `tolerance`, counted
+       per block so anti-aliasing noise in a few pixels doesn't fail a run.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from pages.base_page import locator_to_css
+
+# Page coordinates of every element matching the selectors, in screenshot
+# (device) pixels and relative to the captured element when one is given
+MASK_RECTS_SCRIPT = """
+var selectors = arguments[0], origin = arguments[1];
+var ratio = window.devicePixelRatio || 1;
+var base = origin ? origin.getBoundingClientRect() : {left: 0, top: 0};
+var rects = [];
+selectors.forEach(function (selector) {
+    document.querySelectorAll(selector).forEach(function (element) {
+        var rect = element.getBoundingClientRect();
+        if (!rect.width || !rect.height) return;
+        rects.push([
+            Math.floor((rect.left - base.left) * ratio), Math.floor((rect.top - base.top) * ratio),
+            Math.ceil((rect.right - base.left) * ratio), Math.ceil((rect.bottom - base.top) * ratio)
+        ]);
+    });
+});
+return rects;
+"""
+
+HASH_SIZE = 32
+HASH_BITS = 8
+# Orthonormal DCT-II basis for the 32x32 perceptual hash
+_DCT = np.cos(np.pi * (2 * np.arange(HASH_SIZE)[None, :] + 1) * np.arange(HASH_SIZE)[:, None]
+              / (2 * HASH_SIZE))
+
+VisualResult = namedtuple('VisualResult', [
+    'name', 'status', 'changed_blocks', 'hash_distance', 'diff_path', 'message',
+])
+# status: 'match', 'new', 'updated', 'mismatch'
+
+
+def mask_regions(driver, locators, element=None):
+    """
+    Bounding boxes (x0, y0, x1, y1) of every element matching `locators`.
+
+    Args:
+        element: WebElement or locator the screenshot was taken of; boxes
+            are then relative to it
+    """
+    if isinstance(element, tuple):
+        element = driver.find_element(*element)
+    selectors = list(dict.fromkeys(locator_to_css(locator) for locator in locators))
+    if not selectors:
+        return []
+    return [tuple(rect) for rect in driver.execute_script(MASK_RECTS_SCRIPT, selectors, element)]
+
+
+def decode(png):
+    """PNG bytes -> writable (height, width, 3) uint8 array."""
+    return np.array(Image.open(io.BytesIO(png)).convert('RGB'))
+
+
+def _region_slices(regions, padding=2):
+    for x0, y0, x1, y1 in regions:
+        yield slice(max(y0 - padding, 0), max(y1 + padding, 0)), slice(max(x0 - padding, 0), max(x1 + padding, 0))
+
+
+def region_mask(shape, regions):
+    """Boolean (height, width) array, True inside any (padded) region."""
+    mask = np.zeros(shape[:2], dtype=bool)
+    for rows, columns in _region_slices(regions):
+        mask[rows, columns] = True
+    return mask
+
+
+def black_out(pixels, regions):
+    """Zero the (padded) regions of `pixels` in place."""
+    for rows, columns in _region_slices(regions):
+        pixels[rows, columns] = 0
+    return pixels
+
+
+def digest(data):
+    """SHA-1 of PNG bytes or of a pixel array."""
+    if isinstance(data, np.ndarray):
+        data = np.ascontiguousarray(data).data
+    return hashlib.sha1(data).hexdigest()
+
+
+def perceptual_hash(pixels):
+    """64-bit DCT hash: low frequencies of a 32x32 grayscale thumbnail vs their median."""
+    gray = Image.fromarray(pixels).convert('L').resize((HASH_SIZE, HASH_SIZE), Image.BILINEAR)
+    coefficients = (_DCT @ np.asarray(gray, dtype=np.float64) @ _DCT.T)[:HASH_BITS, :HASH_BITS]
+    bits = (coefficients > np.median(coefficients.ravel()[1:])).ravel()
+    return int(''.join('1' if bit else '0' for bit in bits), 2)
+
+
+def hash_distance(first, second):
+    return bin(first ^ second).count('1')
+
+
+def block_diff(baseline, actual, tolerance=16, block=16):
+    """
+    Compare two masked images.
+
+    Returns:
+        (changed pixel mask of shape (height, width),
+         changed pixel count per block of shape (ceil(h/block), ceil(w/block)))
+    """
+    # max - min stays in uint8, avoiding a signed copy of both images
+    difference = np.maximum(baseline, actual)
+    difference -= np.minimum(baseline, actual)
+    over = difference > tolerance
+    changed = over[..., 0] | over[..., 1] | over[..., 2]
+    height, width = changed.shape
+    counts = np.add.reduceat(changed.view(np.uint8), np.arange(0, width, block), axis=1, dtype=np.uint16)
+    counts = np.add.reduceat(counts, np.arange(0, height, block), axis=0)
+    return changed, counts
+
+
+def diff_image(actual, changed, blocks, mask, block=16):
+    """
+    Washed-out copy of the capture with changed blocks tinted red, changed
+    pixels solid red and masked regions tinted blue.
+    """
+    height, width = changed.shape
+    image = (actual * 0.35 + 165).astype(np.uint8)
+    block_area = np.repeat(np.repeat(blocks, block, axis=0), block, axis=1)[:height, :width]
+    image[block_area] = image[block_area] // 2 + np.array([127, 0, 0], dtype=np.uint8)
+    image[mask] = image[mask] // 2 + np.array([0, 0, 127], dtype=np.uint8)
+    image[changed] = (255, 0, 0)
+    return image
+
+
+def _safe_name(name):
+    return re.sub(r'[^\w.-]+', '_', name).strip('_')
+
+
+class VisualComparator:
+    """
+    Compares captures against baselines stored as '<name>.png' plus a
+    '<name>.json' sidecar with the masked digest, perceptual hash and masks.
+    """
+
+    def __init__(self, baseline_dir, diff_dir, update=False, tolerance=16, block=16,
+                 min_block_pixels=4, max_changed_blocks=0, max_hash_distance=16):
+        """
+        Args:
+            baseline_dir: Where baselines are read and written
+            diff_dir: Where diff images of mismatches are written
+            update: Overwrite baselines with the new captures
+            tolerance: Largest per-channel difference still counted as equal
+            block: Block edge in pixels
+            min_block_pixels: Changed pixels for a block to count as changed
+            max_changed_blocks: Changed blocks tolerated before a mismatch
+            max_hash_distance: Perceptual hash bits (of 64) that may differ
+                before the capture is treated as a different screen
+        """
+        self.baseline_dir = baseline_dir
+        self.diff_dir = diff_dir
+        self.update = update
+        self.tolerance = tolerance
+        self.block = block
+        self.min_block_pixels = min_block_pixels
+        self.max_changed_blocks = max_changed_blocks
+        self.max_hash_distance = max_hash_distance
+
+    def baseline_path(self, name):
+        return os.path.join(self.baseline_dir, f"{_safe_name(name)}.png")
+
+    def _load_sidecar(self, path):
+        try:
+            with open(path[:-len('.png')] + '.json') as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def _save_baseline(self, path, png, masked, regions):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as handle:
+            handle.write(png)
+        sidecar = {
+            'png': digest(png),
+            'digest': digest(masked),
+            'phash': f"{perceptual_hash(masked):016x}",
+            'size': [masked.shape[1], masked.shape[0]],
+            'masks': [list(region) for region in regions],
+        }
+        with open(path[:-len('.png')] + '.json', 'w') as handle:
+            json.dump(sidecar, handle)
+
+    def compare(self, name, png, regions=()):
+        """
+        Compare one capture with its baseline.
+
+        Args:
+            name: Baseline name, usually '<test>_<step>'
+            png: Captured PNG bytes
+            regions: Boxes to ignore, from mask_regions()
+
+        Returns:
+            VisualResult
+        """
+        path = self.baseline_path(name)
+        sidecar = None if self.update else self._load_sidecar(path)
+        if sidecar is not None and sidecar['png'] == digest(png):
+            return VisualResult(name, 'match', 0, 0, None, '')
+
+        actual = black_out(decode(png), regions)
+        if sidecar is None:
+            self._save_baseline(path, png, actual, regions)
+            status = 'updated' if self.update else 'new'
+            return VisualResult(name, status, 0, 0, None, f"Baseline {status}: {path}")
+        if sidecar['digest'] == digest(actual):
+            return VisualResult(name, 'match', 0, 0, None, '')
+
+        with open(path, 'rb') as handle:
+            baseline = decode(handle.read())
+        if baseline.shape != actual.shape:
+            return VisualResult(
+                name, 'mismatch', None, None, None,
+                f"Size changed: baseline {baseline.shape[1]}x{baseline.shape[0]}, "
+                f"capture {actual.shape[1]}x{actual.shape[0]}",
+            )
+        # Either side's masks apply to both (e.g. a longer receipt number)
+        regions = list(regions) + [tuple(region) for region in sidecar['masks']]
+        black_out(actual, regions)
+        black_out(baseline, regions)
+        distance = hash_distance(perceptual_hash(actual), int(sidecar['phash'], 16))
+        changed, counts = block_diff(baseline, actual, self.tolerance, self.block)
+        blocks = counts >= self.min_block_pixels
+        changed_blocks = int(blocks.sum())
+
+        if distance <= self.max_hash_distance and changed_blocks <= self.max_changed_blocks:
+            return VisualResult(name, 'match', changed_blocks, distance, None, '')
+        mask = region_mask(actual.shape, regions)
+        diff_path = self._write_diff(name, diff_image(actual, changed, blocks, mask, self.block))
+        if distance > self.max_hash_distance:
+            message = f"Looks like a different screen (perceptual hash distance {distance}/64)"
+        else:
+            message = f"{changed_blocks} of {blocks.size} blocks changed ({int(changed.sum())} pixels)"
+        return VisualResult(name, 'mismatch', changed_blocks, distance, diff_path, message)
+
+    def compare_many(self, captures, max_workers=None):
+        """
+        Compare many captures concurrently; PNG decoding and the numpy
+        stages release the GIL, so threads scale across cores.
+
+        Args:
+            captures: Iterable of (name, png, regions)
+        """
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            return list(executor.map(lambda capture: self.compare(*capture), captures))
+
+    def _write_diff(self, name, image):
+        os.makedirs(self.diff_dir, exist_ok=True)
+        path = os.path.join(self.diff_dir, f"{_safe_name(name)}-diff.png")
+        Image.fromarray(image).save(path, format='PNG', compress_level=1)
+        return path
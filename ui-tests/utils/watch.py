@@ -0,0 +1,372 @@
+"""
+NardPOS UI Automation - Watch Mode
+Keeps one interpreter and one browser warm while page objects are edited.
+On every save, only the changed modules (and the modules importing them)
+are re-imported and only the tests that reach the changed code are rerun.
+
+Run from ui-tests/ with:
+    python -m utils.watch                          # all test modules
+    python -m utils.watch test_nardpos_e2e.py -m smoke
+    python -m utils.watch -- --html=reports/watch.html
+
+Affected tests are found by comparing the AST of every top-level function,
+class attribute and method before and after the save. A changed name marks
+everything that references it (methods, fixtures, other page objects) as
+changed too, until the tests reached that way are known. Changes to pytest
+hooks or module-level code in conftest.py rerun the whole selection.
+"""
+
+import argparse
+import ast
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WATCH_PATTERNS = ('pages/*.py', 'utils/*.py', 'conftest.py', 'test_*.py')
+# Module-level statements that define no name (e.g. `if __name__ == ...`)
+MODULE_CODE = '<module>'
+
+Symbol = namedtuple('Symbol', ['name', 'nodeid', 'dump', 'refs'])
+
+
+def module_name(path):
+    """Dotted module name of a watched file, e.g. pages/pos_page.py -> pages.pos_page."""
+    relative = os.path.relpath(path, ROOT)[:-len('.py')]
+    return relative.replace(os.sep, '.').replace('.__init__', '')
+
+
+def _references(node):
+    """Names, attributes, arguments and identifier-like strings used in `node`."""
+    refs = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name):
+            refs.add(child.id)
+        elif isinstance(child, ast.Attribute):
+            refs.add(child.attr)
+        elif isinstance(child, ast.arg):
+            refs.add(child.arg)
+        elif isinstance(child, ast.Constant) and isinstance(child.value, str) and \
+                child.value.isidentifier():
+            # request.getfixturevalue('nardpos_server'), usefixtures(...)
+            refs.add(child.value)
+    return refs
+
+
+def _defined_names(node):
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return [node.name]
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        return [(alias.asname or alias.name).split('.')[0] for alias in node.names]
+    targets = node.targets if isinstance(node, ast.Assign) else \
+        [node.target] if isinstance(node, (ast.AnnAssign, ast.AugAssign)) else []
+    names = [child.id for target in targets for child in ast.walk(target) if isinstance(child, ast.Name)]
+    return names or [MODULE_CODE]
+
+
+def parse_symbols(path):
+    """
+    Split a module into comparable symbols.
+
+    Returns:
+        List of Symbol; test functions and methods carry their pytest nodeid
+    """
+    with open(path, encoding='utf-8') as handle:
+        tree = ast.parse(handle.read(), path)
+    relative = os.path.relpath(path, ROOT)
+    is_test_module = os.path.basename(path).startswith('test_')
+    module_ref = f"{relative}:{MODULE_CODE}"
+    symbols = []
+
+    def add(node, name, nodeid=None, extra_refs=()):
+        if name == MODULE_CODE:
+            name = module_ref
+        refs = _references(node) | set(extra_refs)
+        if nodeid is not None:
+            refs.add(module_ref)
+        symbols.append(Symbol(name, nodeid, ast.dump(node), refs))
+
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            for name in _defined_names(node):
+                nodeid = f"{relative}::{name}" if is_test_module and name.startswith('test') else None
+                add(node, name, nodeid)
+            continue
+        header = ast.ClassDef(node.name, node.bases, node.keywords, [], node.decorator_list)
+        add(header, node.name)
+        for item in node.body:
+            for name in _defined_names(item):
+                if name.startswith('__') and name.endswith('__'):
+                    # A changed constructor affects every user of the class
+                    name = node.name
+                nodeid = None
+                if is_test_module and node.name.startswith('Test') and name.startswith('test'):
+                    nodeid = f"{relative}::{node.name}::{name}"
+                add(item, name, nodeid, extra_refs=(node.name,))
+    return symbols
+
+
+def changed_names(old, new):
+    """Names whose definition was added, removed or edited."""
+    before = {(symbol.name, symbol.dump) for symbol in old}
+    after = {(symbol.name, symbol.dump) for symbol in new}
+    return {name for name, _ in before ^ after}
+
+
+def affected_tests(symbols_by_path, imports_by_path, changes):
+    """
+    Nodeids of the tests that reach any changed name.
+
+    A name only propagates to modules that can see the module defining it:
+    the module itself, the watched modules importing it (directly or not),
+    and test modules, which reach page objects through conftest fixtures.
+    Page objects are passed around freely, so importing one page module
+    makes all of them visible.
+
+    Args:
+        changes: Dict of path -> changed names
+
+    Returns:
+        Sorted nodeids, or None when every test is affected
+    """
+    conftest = os.path.join(ROOT, 'conftest.py')
+    if any(name.startswith('pytest_') or name == f"conftest.py:{MODULE_CODE}"
+           for name in changes.get(conftest, ())):
+        return None
+    by_module = {module_name(path): path for path in symbols_by_path}
+    visible = {}
+    for path in symbols_by_path:
+        pending = [path] + ([conftest] if os.path.basename(path).startswith('test_') else [])
+        seen = set()
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            pending.extend(by_module[name] for name in imports_by_path.get(current, ())
+                           if name in by_module)
+        if any(module_name(path).startswith('pages.') for path in seen):
+            seen.update(path for name, path in by_module.items() if name.startswith('pages.'))
+        visible[path] = seen
+
+    # name -> paths it was (re)defined in as changed or reached code
+    affected = {}
+    for path, names in changes.items():
+        for name in names:
+            affected.setdefault(name, set()).add(path)
+
+    def reaches(path, symbol):
+        return any(visible[path] & affected[name] for name in symbol.refs if name in affected)
+
+    grown = True
+    while grown:
+        grown = False
+        for path, symbols in symbols_by_path.items():
+            for symbol in symbols:
+                if symbol.nodeid is None and path not in affected.get(symbol.name, ()) and \
+                        reaches(path, symbol):
+                    affected.setdefault(symbol.name, set()).add(path)
+                    grown = True
+    return sorted({symbol.nodeid for path, symbols in symbols_by_path.items() for symbol in symbols
+                   if symbol.nodeid is not None and
+                   (path in affected.get(symbol.name, ()) or reaches(path, symbol))})
+
+
+def local_imports(path):
+    """Watched modules imported by the module at `path`."""
+    with open(path, encoding='utf-8') as handle:
+        tree = ast.parse(handle.read(), path)
+    package = module_name(path)
+    if os.path.basename(path) != '__init__.py':
+        # module_name() already drops '.__init__', so only modules strip their own name
+        package = package.rpartition('.')[0]
+    imported = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imported.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ''
+            if node.level:
+                base = '.'.join(filter(None, [package.rsplit('.', node.level - 1)[0], node.module]))
+            imported.add(base)
+            imported.update(f"{base}.{alias.name}" for alias in node.names)
+    return imported
+
+
+class WatchSession:
+    """
+    Pytest plugin shared by every run of the watch loop.
+
+    conftest.py hands out these browsers and temp directory instead of its own
+    session-scoped ones, so they outlive each pytest.main() call.
+    """
+
+    def __init__(self):
+        self.temp_dir = tempfile.mkdtemp(prefix='nardpos-watch-')
+        # Filled by conftest's browser_sessions fixture, one per browser name
+        self.sessions = {}
+
+    def pytest_configure(self, config):
+        config.nardpos_watch = self
+
+    def close(self):
+        for session in self.sessions.values():
+            session.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+class Watcher:
+    """Polls the watched files and reruns the affected tests on change."""
+
+    def __init__(self, paths=None, pytest_args=(), interval=0.2):
+        self.paths = [os.path.relpath(os.path.abspath(path), ROOT) for path in paths or []]
+        self.pytest_args = list(pytest_args)
+        self.interval = interval
+        self.plugin = WatchSession()
+        self.mtimes = {}
+        self.symbols = {}
+        self.imports = {}
+        for path in self.watched_files():
+            self._scan(path)
+
+    def watched_files(self):
+        files = set()
+        for pattern in WATCH_PATTERNS:
+            files.update(glob.glob(os.path.join(ROOT, pattern)))
+        files.discard(os.path.abspath(__file__))
+        return sorted(files)
+
+    def _scan(self, path):
+        self.mtimes[path] = os.stat(path).st_mtime_ns
+        self.symbols[path] = parse_symbols(path)
+        self.imports[path] = local_imports(path)
+
+    def poll(self):
+        """Return {path: changed names} for files saved since the last poll."""
+        current = self.watched_files()
+        changes = {}
+        for path in set(self.mtimes) - set(current):
+            changes[path] = {symbol.name for symbol in self.symbols.pop(path)}
+            del self.mtimes[path], self.imports[path]
+        for path in current:
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                continue
+            if self.mtimes.get(path) == mtime:
+                continue
+            old = self.symbols.get(path, [])
+            try:
+                self._scan(path)
+            except SyntaxError as error:
+                self.mtimes[path] = mtime
+                print(f"[watch] {os.path.relpath(path, ROOT)}: {error}")
+                continue
+            names = changed_names(old, self.symbols[path])
+            if names:
+                changes[path] = names
+        return changes
+
+    def unload(self, changed_paths):
+        """Drop changed modules and every watched module importing them from sys.modules."""
+        stale = {module_name(path) for path in changed_paths}
+        grown = True
+        while grown:
+            grown = False
+            for path, imported in self.imports.items():
+                name = module_name(path)
+                if name not in stale and imported & stale:
+                    stale.add(name)
+                    grown = True
+        # conftest.py holds per-run state (durations, results), so it is always re-executed
+        stale.add('conftest')
+        for name in stale:
+            sys.modules.pop(name, None)
+        return stale
+
+    def selection(self, nodeids=None):
+        """pytest arguments for `nodeids` (None = everything) within the watched paths."""
+        if nodeids is None:
+            return self.pytest_args + (self.paths or [])
+        if self.paths:
+            nodeids = [nodeid for nodeid in nodeids
+                       if any(nodeid == path or nodeid.startswith(path.rstrip(os.sep) + '::')
+                              or nodeid.startswith(path.rstrip(os.sep) + os.sep) for path in self.paths)]
+        return self.pytest_args + nodeids if nodeids else None
+
+    def run(self, args):
+        start = time.perf_counter()
+        exit_code = pytest.main(args, plugins=[self.plugin])
+        print(f"[watch] finished in {time.perf_counter() - start:.2f}s (exit {int(exit_code)}); "
+              f"waiting for changes...")
+
+    def loop(self, initial_run=True):
+        if initial_run:
+            self.run(self.selection())
+        else:
+            print("[watch] waiting for changes...")
+        while True:
+            time.sleep(self.interval)
+            changes = self.poll()
+            if not changes:
+                continue
+            names = set().union(*changes.values())
+            nodeids = affected_tests(self.symbols, self.imports, changes)
+            args = self.selection(nodeids)
+            print(f"[watch] changed: {', '.join(os.path.relpath(path, ROOT) for path in changes)} "
+                  f"({', '.join(sorted(names)[:8])}{', ...' if len(names) > 8 else ''})")
+            if args is None:
+                print("[watch] no tests reach the changed code")
+                continue
+            self.unload(changes)
+            self.run(args)
+
+    def close(self):
+        self.plugin.close()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Everything after `--` goes to pytest untouched
+    extra = []
+    if '--' in argv:
+        index = argv.index('--')
+        argv, extra = argv[:index], argv[index + 1:]
+    parser = argparse.ArgumentParser(description='Rerun affected NardPOS tests on save')
+    parser.add_argument('paths', nargs='*', help='Test modules to watch (default: all)')
+    parser.add_argument('-k', help='pytest -k expression')
+    parser.add_argument('-m', help='pytest -m marker expression')
+    parser.add_argument('--interval', type=float, default=0.2, help='Polling interval in seconds')
+    parser.add_argument('--no-initial-run', action='store_true',
+                        help="Don't run the selection once at startup")
+    args = parser.parse_args(argv)
+
+    pytest_args = ['-q', '-p', 'no:xdist']
+    if args.k:
+        pytest_args += ['-k', args.k]
+    if args.m:
+        pytest_args += ['-m', args.m]
+    # Partial reruns would clutter the results history
+    os.environ.setdefault('RESULTS_STORE', 'false')
+    os.chdir(ROOT)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    watcher = Watcher(args.paths, pytest_args + extra, args.interval)
+    try:
+        watcher.loop(initial_run=not args.no_initial_run)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+if __name__ == '__main__':
+    main()